@@ -2,13 +2,33 @@
 
 from __future__ import annotations
 
+import logging
+import threading
 import time
+from array import array
+from contextlib import ExitStack
+from dataclasses import dataclass, replace
+from functools import wraps
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 try:
-    import smbus2 as smbus
+    from smbus2 import i2c_msg
 except ImportError:  # pragma: no cover
-    import smbus  # type: ignore[no-redef]
+    i2c_msg = None
 
+from lib.device_lock import DeviceLock
+from lib.i2c_bus import open_shared_bus
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if TYPE_CHECKING:
+    from lib.i2c_bus import I2cBatch
+    from lib.pins import EdgeSource
+
+logger = logging.getLogger(__name__)
 
 ADS1115_IIC_ADDRESS0 = 0x48
 ADS1115_IIC_ADDRESS1 = 0x49
@@ -72,6 +92,19 @@ ADS1115_GAIN_TO_COEFFICIENT = {
     ADS1115_REG_CONFIG_PGA_0_256V: 0.0078125,
 }
 
+# 自动量程使用的增益阶梯，从最宽量程到最窄量程。
+ADS1115_GAIN_LADDER = (
+    ADS1115_REG_CONFIG_PGA_6_144V,
+    ADS1115_REG_CONFIG_PGA_4_096V,
+    ADS1115_REG_CONFIG_PGA_2_048V,
+    ADS1115_REG_CONFIG_PGA_1_024V,
+    ADS1115_REG_CONFIG_PGA_0_512V,
+    ADS1115_REG_CONFIG_PGA_0_256V,
+)
+# 原始值绝对值达到该值即视为削顶；选增益时只用满量程的这一比例，留出信号波动的余量。
+ADS1115_AUTORANGE_CLIP_RAW = 32000
+ADS1115_AUTORANGE_HEADROOM = 0.8
+
 ADS1115_SINGLE_MUX_MAP = {
     0: ADS1115_REG_CONFIG_MUX_SINGLE_0,
     1: ADS1115_REG_CONFIG_MUX_SINGLE_1,
@@ -86,7 +119,338 @@ ADS1115_DIFFERENTIAL_MUX_MAP = {
     3: ADS1115_REG_CONFIG_MUX_DIFF_2_3,
 }
 
-ADS1115_CONVERSION_DELAY_S = 0.1
+# 差分输入对 `(AINp, AINn)` 到差分通道编号的映射。
+ADS1115_DIFFERENTIAL_PAIRS = {
+    (0, 1): 0,
+    (0, 3): 1,
+    (1, 3): 2,
+    (2, 3): 3,
+}
+
+ADS1115_DATA_RATE_TO_SPS = {
+    ADS1115_REG_CONFIG_DR_8SPS: 8,
+    ADS1115_REG_CONFIG_DR_16SPS: 16,
+    ADS1115_REG_CONFIG_DR_32SPS: 32,
+    ADS1115_REG_CONFIG_DR_64SPS: 64,
+    ADS1115_REG_CONFIG_DR_128SPS: 128,
+    ADS1115_REG_CONFIG_DR_250SPS: 250,
+    ADS1115_REG_CONFIG_DR_475SPS: 475,
+    ADS1115_REG_CONFIG_DR_860SPS: 860,
+}
+
+ADS1115_DEFAULT_DATA_RATE = ADS1115_REG_CONFIG_DR_128SPS
+
+# 内部振荡器误差约 ±10%，按标称周期放大后作为一次转换的等待时间。
+ADS1115_OSC_TOLERANCE = 1.1
+
+# 轮询 OS 位时两次读取之间的间隔，以及在最长转换时间之外额外容忍的 I2C 延迟。
+ADS1115_POLL_INTERVAL_S = 0.0002
+ADS1115_POLL_TIMEOUT_MARGIN_S = 0.005
+
+# 阈值寄存器的上电默认值；Hi 最高位为 1、Lo 最高位为 0 时 ALERT/RDY 引脚切换为转换就绪信号。
+ADS1115_DEFAULT_LO_THRESH = 0x8000
+ADS1115_DEFAULT_HI_THRESH = 0x7FFF
+ADS1115_RDY_LO_THRESH = 0x0000
+ADS1115_RDY_HI_THRESH = 0x8000
+
+ADS1115_RAW_MIN = -32768
+ADS1115_RAW_MAX = 32767
+
+ADS1115_COMPARATOR_QUEUE_MAP = {
+    1: ADS1115_REG_CONFIG_CQUE_1CONV,
+    2: ADS1115_REG_CONFIG_CQUE_2CONV,
+    4: ADS1115_REG_CONFIG_CQUE_4CONV,
+}
+
+ADS1115_STREAM_BUFFER_SIZE = 256
+
+# 块读取归约的默认参数：截尾比例（两端各去掉的比例）和 MAD 判定离群的阈值（按正态分布换算后的倍数）。
+ADS1115_TRIM_PROPORTION = 0.1
+ADS1115_MAD_THRESHOLD = 3.5
+ADS1115_MAD_SCALE = 1.4826
+
+
+def fit_gain(voltage_mv: float) -> int:
+    """返回能容纳该电压（留出余量）的最窄量程增益，超出所有量程时返回最宽量程。"""
+    for gain in reversed(ADS1115_GAIN_LADDER):
+        if abs(voltage_mv) <= ADS1115_RAW_MAX * ADS1115_GAIN_TO_COEFFICIENT[gain] * ADS1115_AUTORANGE_HEADROOM:
+            return gain
+    return ADS1115_GAIN_LADDER[0]
+
+
+def differential_channel(positive: int, negative: int) -> Tuple[int, int]:
+    """按输入对查差分通道编号，返回 `(差分通道编号, 符号)`。
+
+    芯片只支持 `ADS1115_DIFFERENTIAL_PAIRS` 中的四种组合；输入对反向时返回符号 -1，
+    读数乘以符号即为 `positive - negative`。
+    """
+    if (positive, negative) in ADS1115_DIFFERENTIAL_PAIRS:
+        return ADS1115_DIFFERENTIAL_PAIRS[(positive, negative)], 1
+    if (negative, positive) in ADS1115_DIFFERENTIAL_PAIRS:
+        return ADS1115_DIFFERENTIAL_PAIRS[(negative, positive)], -1
+    raise ValueError("ADS1115 has no differential mux for AIN%s-AIN%s" % (positive, negative))
+
+
+def conversion_period_s(data_rate: int) -> float:
+    """返回指定数据率下一次转换的最长耗时（秒），已计入振荡器误差。"""
+    if data_rate not in ADS1115_DATA_RATE_TO_SPS:
+        raise ValueError("data_rate must be one of ADS1115_REG_CONFIG_DR_* constants")
+    return ADS1115_OSC_TOLERANCE / ADS1115_DATA_RATE_TO_SPS[data_rate]
+
+
+@dataclass(frozen=True)
+class AdsProfile:
+    """一次读取使用的采集参数组合。
+
+    `samples > 1` 时连续转换多次取平均；`continuous=True` 时芯片停留在该通道的连续转换模式，
+    配置不变的后续读取直接取转换寄存器，不再写配置寄存器。
+    """
+
+    data_rate: int
+    gain: int
+    samples: int = 1
+    continuous: bool = False
+
+    def __post_init__(self) -> None:
+        if self.data_rate not in ADS1115_DATA_RATE_TO_SPS:
+            raise ValueError("data_rate must be one of ADS1115_REG_CONFIG_DR_* constants")
+        if self.gain not in ADS1115_GAIN_TO_COEFFICIENT:
+            raise ValueError("gain must be one of ADS1115_REG_CONFIG_PGA_* constants")
+        if not isinstance(self.samples, int) or self.samples <= 0:
+            raise ValueError("samples must be a positive integer")
+
+    @property
+    def coefficient(self) -> float:
+        """该配置下原始值到毫伏的换算系数。"""
+        return ADS1115_GAIN_TO_COEFFICIENT[self.gain]
+
+
+ADS1115_PROFILES = {
+    # 液位轮询：最快数据率、最宽量程，连续模式下重复读取不再写配置。
+    "level-fast": AdsProfile(
+        data_rate=ADS1115_REG_CONFIG_DR_860SPS,
+        gain=ADS1115_REG_CONFIG_PGA_6_144V,
+        continuous=True,
+    ),
+    # 消解读数：最低数据率、2.048 V 量程，16 次平均。
+    "digest-precise": AdsProfile(
+        data_rate=ADS1115_REG_CONFIG_DR_8SPS,
+        gain=ADS1115_REG_CONFIG_PGA_2_048V,
+        samples=16,
+    ),
+}
+
+
+@dataclass(frozen=True)
+class AdsFrame:
+    """一次通道扫描得到的同步帧。
+
+    `channels`、`timestamps_ns`、`raw`、`coefficients` 一一对应，时间戳为每个通道转换完成的时刻（ns），
+    `coefficients` 是各通道采集时使用的增益换算系数。
+    """
+
+    channels: Tuple[int, ...]
+    timestamps_ns: Tuple[int, ...]
+    raw: Tuple[int, ...]
+    coefficients: Tuple[float, ...]
+
+    def raw_of(self, channel: int) -> int:
+        """取指定通道的原始值。"""
+        return self.raw[self.channels.index(channel)]
+
+    def voltage_mv(self, channel: int) -> int:
+        """取指定通道的电压（mV）。"""
+        index = self.channels.index(channel)
+        return int(float(self.raw[index]) * self.coefficients[index])
+
+    def voltages_mv(self) -> Dict[int, int]:
+        """按通道返回整帧电压（mV）。"""
+        return {
+            channel: int(float(raw) * coefficient)
+            for channel, raw, coefficient in zip(self.channels, self.raw, self.coefficients)
+        }
+
+    @property
+    def span_ns(self) -> int:
+        """帧内第一个与最后一个通道之间的时间差。"""
+        return self.timestamps_ns[-1] - self.timestamps_ns[0]
+
+
+class AdsSampleRing:
+    """固定容量的采样环形缓冲区。
+
+    每个元素是 `(monotonic_ns 时间戳, 有符号 16 位原始值)`，同时记下该采样的换算系数，
+    采样期间自动量程改了增益也能换算正确。写满后覆盖最旧数据。
+    存储预先分配，写入时不产生新的对象，可在采样线程和读取线程之间共享。
+    """
+
+    def __init__(self, capacity: int = ADS1115_STREAM_BUFFER_SIZE) -> None:
+        if not isinstance(capacity, int):
+            raise TypeError("capacity must be an integer")
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+
+        self.capacity = capacity
+        self._timestamps = array("q", [0]) * capacity
+        self._values = array("h", [0]) * capacity
+        self._coefficients = array("d", [0.0]) * capacity
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp_ns: int, raw: int, coefficient: float = 1.0) -> None:
+        """写入一个采样点，`coefficient` 是该采样原始值到毫伏的换算系数。"""
+        with self._lock:
+            self._timestamps[self._next] = timestamp_ns
+            self._values[self._next] = raw
+            self._coefficients[self._next] = coefficient
+            self._next = (self._next + 1) % self.capacity
+            if self._count < self.capacity:
+                self._count += 1
+
+    def clear(self) -> None:
+        """清空缓冲区。"""
+        with self._lock:
+            self._next = 0
+            self._count = 0
+
+    def latest(self) -> Optional[Tuple[int, int]]:
+        """返回最新一个采样点，缓冲区为空时返回 None。"""
+        entry = self.latest_entry()
+        return None if entry is None else entry[:2]
+
+    def last(self, n: int) -> List[Tuple[int, int]]:
+        """按时间先后返回最近 n 个采样点，不足 n 个时返回全部。"""
+        return [entry[:2] for entry in self.last_entries(n)]
+
+    def latest_entry(self) -> Optional[Tuple[int, int, float]]:
+        """返回最新一个 `(时间戳, 原始值, 换算系数)`，缓冲区为空时返回 None。"""
+        with self._lock:
+            if self._count == 0:
+                return None
+            index = (self._next - 1) % self.capacity
+            return self._timestamps[index], self._values[index], self._coefficients[index]
+
+    def last_entries(self, n: int) -> List[Tuple[int, int, float]]:
+        """按时间先后返回最近 n 个 `(时间戳, 原始值, 换算系数)`，不足 n 个时返回全部。"""
+        if not isinstance(n, int):
+            raise TypeError("n must be an integer")
+        if n < 0:
+            raise ValueError("n must be >= 0")
+
+        with self._lock:
+            n = min(n, self._count)
+            start = self._next - n
+            return [
+                (
+                    self._timestamps[index % self.capacity],
+                    self._values[index % self.capacity],
+                    self._coefficients[index % self.capacity],
+                )
+                for index in range(start, self._next)
+            ]
+
+
+def _block_values(block):
+    """把块缓冲区整理成可归约的数值序列：有 numpy 时返回 float64 数组，否则返回列表。"""
+    if len(block) == 0:
+        raise ValueError("block cannot be empty")
+    if np is not None:
+        return np.asarray(block, dtype=np.float64)
+    return [float(value) for value in block]
+
+
+def block_mean_mv(block, coefficient: float) -> float:
+    """块内原始值求平均，返回毫伏（浮点，保留 LSB 以下的分辨率）。"""
+    values = _block_values(block)
+    if np is not None:
+        return float(values.mean()) * coefficient
+    return sum(values) / len(values) * coefficient
+
+
+def _median(values) -> float:
+    if np is not None:
+        return float(np.median(values))
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2.0
+
+
+def block_median_mv(block, coefficient: float) -> float:
+    """块内原始值取中位数，返回毫伏。"""
+    return _median(_block_values(block)) * coefficient
+
+
+def block_trimmed_mean_mv(block, coefficient: float, proportion: float = ADS1115_TRIM_PROPORTION) -> float:
+    """两端各去掉 `proportion` 比例的极值后求平均，返回毫伏。至少各去掉一个点（样本数大于 2 时）。"""
+    if proportion < 0 or proportion >= 0.5:
+        raise ValueError("proportion must be in range [0, 0.5)")
+    values = _block_values(block)
+    count = len(values)
+    cut = int(count * proportion)
+    if cut == 0 and proportion > 0 and count > 2:
+        cut = 1
+    if np is not None:
+        ordered = np.sort(values)
+        return float(ordered[cut:count - cut].mean()) * coefficient
+    ordered = sorted(values)[cut:count - cut]
+    return sum(ordered) / len(ordered) * coefficient
+
+
+def block_mad_mean_mv(block, coefficient: float, threshold: float = ADS1115_MAD_THRESHOLD) -> float:
+    """按中位数绝对偏差（MAD）剔除离群点后求平均，返回毫伏。
+
+    偏离中位数超过 `threshold × 1.4826 × MAD` 的点视为离群；MAD 为 0 时只保留等于中位数的点。
+    """
+    values = _block_values(block)
+    center = _median(values)
+    if np is not None:
+        deviation = np.abs(values - center)
+        limit = threshold * ADS1115_MAD_SCALE * float(np.median(deviation))
+        kept = values[deviation <= limit]
+        return float(kept.mean()) * coefficient
+    deviation = [abs(value - center) for value in values]
+    limit = threshold * ADS1115_MAD_SCALE * _median(deviation)
+    kept = [value for value, dev in zip(values, deviation) if dev <= limit]
+    return sum(kept) / len(kept) * coefficient
+
+
+def _check_block_buffer(out, n: int) -> None:
+    """校验块缓冲区是 int16 类型且容量足够。"""
+    if isinstance(out, array):
+        if out.typecode != "h":
+            raise TypeError("array buffer must use typecode 'h'")
+    elif np is not None and isinstance(out, np.ndarray):
+        if out.dtype != np.int16 or out.ndim != 1:
+            raise TypeError("numpy buffer must be a 1-D int16 array")
+    else:
+        raise TypeError("out must be array('h') or a numpy int16 array")
+    if len(out) < n:
+        raise ValueError("out buffer is shorter than n")
+
+
+ADS1115_BLOCK_REDUCERS = {
+    "mean": block_mean_mv,
+    "median": block_median_mv,
+    "trimmed": block_trimmed_mean_mv,
+    "mad": block_mad_mean_mv,
+}
+
+
+def _locked(method):
+    """在设备锁内执行驱动方法，一次读数包含的多个 I2C 事务不会被其它线程打断。"""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class ADS1115:
@@ -95,8 +459,12 @@ class ADS1115:
     提供单端和差分采样，并将原始 ADC 值换算为毫伏。
     """
 
-    def __init__(self, i2c_bus: int = ADS1115_DEFAULT_BUS, addr: int = ADS1115_DEFAULT_ADDR):
-        """初始化 ADS1115 设备并打开指定 I2C 总线。"""
+    def __init__(self, i2c_bus: int = ADS1115_DEFAULT_BUS, addr: int = ADS1115_DEFAULT_ADDR, bus=None):
+        """初始化 ADS1115 设备并打开指定 I2C 总线。
+
+        传入 `bus`（SMBus 兼容对象，例如 `PacedBus`）时直接使用，`close()` 也不会关闭它；
+        不传时从共享注册表取该总线号的句柄，同一总线上的多片芯片共用一个文件描述符，`close()` 释放一次引用。
+        """
         if not isinstance(i2c_bus, int):
             raise TypeError("i2c_bus must be an integer")
         if i2c_bus < 0:
@@ -108,12 +476,42 @@ class ADS1115:
 
         self.i2c_bus_num = i2c_bus
         self.addr = addr
-        self.bus = smbus.SMBus(self.i2c_bus_num)
+        self._owns_bus = bus is None
+        self.bus = open_shared_bus(self.i2c_bus_num) if bus is None else bus
+        # 配置、通道和缓存状态与多事务读数共用一把可重入的设备锁，多个线程可共用同一驱动对象。
+        self._lock = DeviceLock("ADS1115 %d-0x%02X" % (i2c_bus, addr))
         self.gain = ADS1115_REG_CONFIG_PGA_2_048V
         self.coefficient = ADS1115_GAIN_TO_COEFFICIENT[self.gain]
         self.channel = 0
+        self.data_rate = ADS1115_DEFAULT_DATA_RATE
+        self.last_poll_count = 0
+        self.last_conversion_s = 0.0
+        self.last_conversion_ns: Optional[int] = None
+        self._ready_source: Optional["EdgeSource"] = None
+        self._comparator_armed = False
+        self._last_mux: Optional[int] = None
+        self._channel_profiles: Dict[int, AdsProfile] = {}
+        self._autorange_gains: Dict[int, int] = {}
+        # 差分通道的编号与单端通道重叠，采集配置和自动量程增益单独存放。
+        self._diff_profiles: Dict[int, AdsProfile] = {}
+        self._diff_autorange_gains: Dict[int, int] = {}
+        self.autorange_retries = 0
+        self.last_block_coefficient = self.coefficient
+        self._config_cache: Optional[Tuple[int, int]] = None
+        # 最后一次写配置寄存器的时刻；配置相同但刚写入时，第一个采样仍需等满两个转换周期。
+        self._config_written_at = 0.0
+        self.config_writes_skipped = 0
+        # 配置寄存器写入（即启动或改变转换）的累计次数，流水线扫描据此判断帧间是否有别的转换插进来。
+        self._config_writes = 0
+        self.sweep_restarts = 0
         self._closed = False
 
+        self._stream_thread: Optional[threading.Thread] = None
+        self._stream_stop = threading.Event()
+        self._stream_buffers: dict[int, AdsSampleRing] = {}
+        self._stream_error: Optional[BaseException] = None
+        self._stream_data_rate: Optional[int] = None
+
     def __enter__(self) -> "ADS1115":
         return self
 
@@ -134,37 +532,251 @@ class ADS1115:
             raw -= 65536
         return raw
 
-    def _build_config(self, channel: int, *, differential: bool) -> list[int]:
-        """按通道和采样模式拼出配置寄存器的两个字节。"""
+    def _ensure_idle(self) -> None:
+        """连续采样或比较器布防期间芯片处于连续转换模式，禁止单次转换。"""
+        if self.is_streaming:
+            raise RuntimeError("ADS1115 is streaming, call stop_streaming() first or use read_latest_*()")
+        if self._comparator_armed:
+            raise RuntimeError("ADS1115 comparator is armed, call disarm_comparator() first")
+
+    def _write_config(self, config: List[int]) -> None:
+        """写配置寄存器，并记住最后写入的值，供连续模式判断能否省掉重复写入。"""
+        self._ensure_open()
+        self.bus.write_i2c_block_data(self.addr, ADS1115_REG_POINTER_CONFIG, config)
+        self._config_writes += 1
+        self._config_cache = (config[0], config[1])
+        self._config_written_at = time.monotonic()
+
+    def _write_register(self, register: int, value: int) -> None:
+        """按大端顺序写入一个 16 位寄存器。"""
+        self._ensure_open()
+        self.bus.write_i2c_block_data(self.addr, register, [(value >> 8) & 0xFF, value & 0xFF])
+
+    def _build_config(
+        self,
+        channel: int,
+        *,
+        differential: bool,
+        continuous: bool = False,
+        data_rate: Optional[int] = None,
+        gain: Optional[int] = None,
+    ) -> list[int]:
+        """按通道和采样模式拼出配置寄存器的两个字节。
+
+        单次模式会置位 OS 位立即启动一次转换；连续模式下 OS 位无意义，写入即开始循环转换。
+        `data_rate` / `gain` 不传时使用当前实例的设置。
+        """
+        if data_rate is None:
+            data_rate = self.data_rate
+        if gain is None:
+            gain = self.gain
         mux_map = ADS1115_DIFFERENTIAL_MUX_MAP if differential else ADS1115_SINGLE_MUX_MAP
-        return [
-            ADS1115_REG_CONFIG_OS_SINGLE | mux_map[channel] | self.gain | ADS1115_REG_CONFIG_MODE_SINGLE,
-            ADS1115_REG_CONFIG_DR_128SPS | ADS1115_REG_CONFIG_CQUE_NONE,
-        ]
+        if continuous:
+            high = mux_map[channel] | gain | ADS1115_REG_CONFIG_MODE_CONTIN
+        else:
+            high = ADS1115_REG_CONFIG_OS_SINGLE | mux_map[channel] | gain | ADS1115_REG_CONFIG_MODE_SINGLE
+        # 使用 ALERT/RDY 就绪信号时比较器队列不能禁用，否则引脚保持高阻。
+        comparator = ADS1115_REG_CONFIG_CQUE_1CONV if self._ready_source is not None else ADS1115_REG_CONFIG_CQUE_NONE
+        return [high, data_rate | comparator]
 
-    def _start_conversion(self, channel: int, *, differential: bool) -> None:
+    def _start_conversion(
+        self,
+        channel: int,
+        *,
+        differential: bool,
+        profile: Optional[AdsProfile] = None,
+    ) -> None:
         """写入配置寄存器并等待一次转换完成。"""
+        started = self._begin_conversion(channel, differential=differential, profile=profile)
+        self._finish_conversion(channel, started, differential=differential, profile=profile)
+
+    def _begin_conversion(
+        self,
+        channel: int,
+        *,
+        differential: bool,
+        profile: Optional[AdsProfile] = None,
+    ) -> float:
+        """只写配置寄存器启动一次单次转换，返回启动时刻，不等待。"""
         self._ensure_open()
-        config = self._build_config(channel, differential=differential)
-        self.bus.write_i2c_block_data(self.addr, ADS1115_REG_POINTER_CONFIG, config)
-        time.sleep(ADS1115_CONVERSION_DELAY_S)
+        if profile is None:
+            config = self._build_config(channel, differential=differential)
+        else:
+            config = self._build_config(
+                channel,
+                differential=differential,
+                data_rate=profile.data_rate,
+                gain=profile.gain,
+            )
+        if self._ready_source is not None:
+            # 先丢掉残留事件，保证等到的是本次转换结束的下降沿。
+            self._ready_source.clear()
+        started = time.monotonic()
+        self._last_mux = None
+        self._write_config(config)
+        return started
 
-    def _read_channel_raw(self, channel: int, *, differential: bool) -> int:
-        """统一封装通道选择、启动转换和读取原始值。"""
+    def _finish_conversion(
+        self,
+        channel: int,
+        started: float,
+        *,
+        differential: bool,
+        profile: Optional[AdsProfile] = None,
+    ) -> None:
+        """等待 `_begin_conversion()` 启动的转换完成。"""
+        data_rate = self.data_rate if profile is None else profile.data_rate
+        if self._ready_source is not None:
+            self._wait_ready_edge(started, data_rate)
+        else:
+            self._wait_conversion(started, data_rate)
+        mux_map = ADS1115_DIFFERENTIAL_MUX_MAP if differential else ADS1115_SINGLE_MUX_MAP
+        self._last_mux = mux_map[channel]
+
+    def _wait_ready_edge(self, started: float, data_rate: int) -> None:
+        """等待 ALERT/RDY 引脚的转换完成下降沿，整个等待过程不产生 I2C 传输。"""
+        timeout_s = conversion_period_s(data_rate) + ADS1115_POLL_TIMEOUT_MARGIN_S
+        timestamp_ns = self._ready_source.wait_edge(timeout_s)
+        if timestamp_ns is None:
+            raise TimeoutError("ADS1115 ALERT/RDY edge not seen within %.4f s" % timeout_s)
+        self.last_poll_count = 0
+        self.last_conversion_ns = timestamp_ns
+        self.last_conversion_s = time.monotonic() - started
+
+    def _wait_conversion(self, started: float, data_rate: int) -> None:
+        """轮询配置寄存器的 OS 位，直到本次单次转换完成。
+
+        先睡过最快振荡器下的转换时间，避免无意义的 I2C 轮询；
+        超过最长转换时间加上 I2C 余量仍未完成则视为超时。
+        """
+        nominal_s = 1.0 / ADS1115_DATA_RATE_TO_SPS[data_rate]
+        deadline = started + conversion_period_s(data_rate) + ADS1115_POLL_TIMEOUT_MARGIN_S
+        time.sleep(max(0.0, started + nominal_s / ADS1115_OSC_TOLERANCE - time.monotonic()))
+
+        polls = 0
+        while True:
+            polls += 1
+            config = self.bus.read_i2c_block_data(self.addr, ADS1115_REG_POINTER_CONFIG, 2)
+            if config[0] & ADS1115_REG_CONFIG_OS_SINGLE:
+                break
+            if time.monotonic() >= deadline:
+                self.last_poll_count = polls
+                raise TimeoutError("ADS1115 conversion did not complete within %.4f s" % (deadline - started))
+            time.sleep(ADS1115_POLL_INTERVAL_S)
+
+        self.last_poll_count = polls
+        self.last_conversion_ns = time.monotonic_ns()
+        self.last_conversion_s = time.monotonic() - started
+
+    def _profile_for(self, channel: int, *, differential: bool) -> AdsProfile:
+        """取通道（单端或差分）绑定的采集配置；未绑定时按实例当前增益和数据率临时组装。"""
+        profiles = self._diff_profiles if differential else self._channel_profiles
+        gains = self._diff_autorange_gains if differential else self._autorange_gains
+        if channel in profiles:
+            profile = profiles[channel]
+        else:
+            profile = AdsProfile(data_rate=self.data_rate, gain=self.gain)
+        if channel in gains:
+            # 自动量程通道沿用上次记住的增益，其余参数仍取采集配置。
+            profile = replace(profile, gain=gains[channel])
+        return profile
+
+    def _autorange_observe(self, channel: int, peak_raw: int, coefficient: float, *, differential: bool = False) -> bool:
+        """根据一次读取结果更新自动量程增益。
+
+        读数削顶且还有更宽量程时切到最宽量程并返回 True，调用方应重读一次；
+        否则按本次电压选出下次读取的增益（不额外转换），返回 False。
+        """
+        gains = self._diff_autorange_gains if differential else self._autorange_gains
+        if channel not in gains:
+            return False
+        if abs(peak_raw) >= ADS1115_AUTORANGE_CLIP_RAW and gains[channel] != ADS1115_GAIN_LADDER[0]:
+            gains[channel] = ADS1115_GAIN_LADDER[0]
+            self.autorange_retries += 1
+            return True
+        gains[channel] = fit_gain(peak_raw * coefficient)
+        return False
+
+    def _read_channel(self, channel: int, *, differential: bool) -> Tuple[int, float]:
+        """统一封装通道选择、启动转换和读取原始值，返回 `(raw, 换算系数)`。
+
+        按通道绑定的采集配置决定增益、数据率、平均次数和单次/连续模式。
+        """
+        self._ensure_idle()
         channel = self.set_channel(channel)
-        self._start_conversion(channel, differential=differential)
-        return self._read_conversion()
+        while True:
+            profile = self._profile_for(channel, differential=differential)
+            if profile.continuous:
+                values = self._read_continuous(channel, profile, differential=differential)
+            else:
+                values = []
+                for _ in range(profile.samples):
+                    self._start_conversion(channel, differential=differential, profile=profile)
+                    values.append(self._read_conversion())
+            peak_raw = max(values, key=abs)
+            if not self._autorange_observe(channel, peak_raw, profile.coefficient, differential=differential):
+                break
+        raw = values[0] if len(values) == 1 else int(round(sum(values) / len(values)))
+        return raw, profile.coefficient
+
+    def _read_continuous(self, channel: int, profile: AdsProfile, *, differential: bool = False) -> List[int]:
+        """连续模式读取：配置未变时直接取转换寄存器，变了才重写配置并丢弃切换期间的转换。"""
+        config = self._build_config(
+            channel,
+            differential=differential,
+            continuous=True,
+            data_rate=profile.data_rate,
+            gain=profile.gain,
+        )
+        period_s = conversion_period_s(profile.data_rate)
+        if self._config_cache == (config[0], config[1]):
+            self.config_writes_skipped += 1
+            delay = self._config_written_at + 2 * period_s - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        else:
+            self._write_config(config)
+            self._last_mux = None
+            time.sleep(2 * period_s)
+
+        values = [self._read_conversion()]
+        for _ in range(profile.samples - 1):
+            time.sleep(period_s)
+            values.append(self._read_conversion())
+        self.last_poll_count = 0
+        self.last_conversion_ns = time.monotonic_ns()
+        return values
+
+    def _read_channel_raw(self, channel: int, *, differential: bool) -> int:
+        """读取原始值，不关心换算系数。"""
+        return self._read_channel(channel, differential=differential)[0]
+
+    def _raw_to_voltage_mv(self, raw_value: int, coefficient: Optional[float] = None) -> int:
+        """把原始值换算为毫伏，默认使用当前增益的换算系数。"""
+        if coefficient is None:
+            coefficient = self.coefficient
+        return int(float(raw_value) * coefficient)
 
-    def _raw_to_voltage_mv(self, raw_value: int) -> int:
-        """根据当前增益把原始值换算为毫伏。"""
-        return int(float(raw_value) * self.coefficient)
+    def voltage_to_raw(self, voltage_mv: float, channel: Optional[int] = None) -> int:
+        """把毫伏换算为原始值，超出量程时截断到 16 位有符号范围。
 
+        传入 `channel` 时按该通道绑定采集配置的增益换算，否则按当前增益。
+        """
+        coefficient = self.coefficient
+        if channel is not None:
+            coefficient = self._profile_for(self._check_channel(channel), differential=False).coefficient
+        raw_value = int(round(float(voltage_mv) / coefficient))
+        return max(ADS1115_RAW_MIN, min(ADS1115_RAW_MAX, raw_value))
+
+    @_locked
     def ping(self) -> bool:
         """尝试读取设备，成功则说明 I2C 通信正常。"""
         self._ensure_open()
+        self._ensure_idle()
         self.bus.read_i2c_block_data(self.addr, ADS1115_REG_POINTER_CONVERT, 2)
         return True
 
+    @_locked
     def set_address(self, addr: int) -> None:
         """更新当前设备地址，不重新打开总线。"""
         if not isinstance(addr, int):
@@ -173,6 +785,7 @@ class ADS1115:
             raise ValueError("addr must be in range 0x03~0x77")
         self.addr = addr
 
+    @_locked
     def set_gain(self, gain: int) -> None:
         """设置 PGA 增益，同时更新原始值到毫伏的换算系数。"""
         if not isinstance(gain, int):
@@ -182,40 +795,970 @@ class ADS1115:
         self.gain = gain
         self.coefficient = ADS1115_GAIN_TO_COEFFICIENT[self.gain]
 
-    def set_channel(self, channel: int) -> int:
-        """设置当前通道编号，范围为 0~3。"""
+    @_locked
+    def set_data_rate(self, data_rate: int) -> None:
+        """设置单次转换使用的数据率，转换等待时间随之变化。"""
+        if not isinstance(data_rate, int):
+            raise TypeError("data_rate must be an integer")
+        if data_rate not in ADS1115_DATA_RATE_TO_SPS:
+            raise ValueError("data_rate must be one of ADS1115_REG_CONFIG_DR_* constants")
+        self.data_rate = data_rate
+
+    @property
+    def ready_pin_enabled(self) -> bool:
+        """是否通过 ALERT/RDY 引脚等待转换完成。"""
+        return self._ready_source is not None
+
+    @_locked
+    def enable_ready_pin(self, edge_source: "EdgeSource") -> None:
+        """把 ALERT/RDY 配置为转换就绪输出，并改用边沿事件等待转换完成。
+
+        阈值寄存器写成 Hi=0x8000、Lo=0x0000 后，每次转换结束引脚都会输出一个低电平脉冲。
+        `edge_source` 可以是 `GpiodEdgeSource`，也可以是任何实现 `EdgeSource` 接口的替身；
+        驱动关闭时会一并关闭它。
+
+        参数:
+            edge_source: 接在 ALERT/RDY 上的下降沿事件来源
+        """
+        if edge_source is None:
+            raise ValueError("edge_source is required")
+        self._ensure_idle()
+        self._write_register(ADS1115_REG_POINTER_LOWTHRESH, ADS1115_RDY_LO_THRESH)
+        self._write_register(ADS1115_REG_POINTER_HITHRESH, ADS1115_RDY_HI_THRESH)
+        self._ready_source = edge_source
+
+    @_locked
+    def disable_ready_pin(self) -> None:
+        """恢复阈值寄存器默认值，回到轮询 OS 位的等待方式。不会关闭边沿来源。"""
+        if self._ready_source is None:
+            return
+        self._ensure_idle()
+        self._write_register(ADS1115_REG_POINTER_LOWTHRESH, ADS1115_DEFAULT_LO_THRESH)
+        self._write_register(ADS1115_REG_POINTER_HITHRESH, ADS1115_DEFAULT_HI_THRESH)
+        self._ready_source = None
+
+    @property
+    def comparator_armed(self) -> bool:
+        """窗口比较器是否处于布防状态。"""
+        return self._comparator_armed
+
+    @_locked
+    def arm_comparator(
+        self,
+        channel: int,
+        high_raw: int,
+        low_raw: int = ADS1115_RAW_MIN,
+        *,
+        data_rate: Optional[int] = None,
+        consecutive: int = 1,
+    ) -> None:
+        """在指定单端通道上布防锁存式窗口比较器，芯片切到连续转换模式。
+
+        转换结果高于 `high_raw` 或低于 `low_raw` 连续 `consecutive` 次后 ALERT/RDY 拉低并保持，
+        直到读取转换寄存器或撤防。需要先 `enable_ready_pin()`，触发沿由同一个边沿来源送达。
+
+        参数:
+            channel: 单端通道 `0~3`
+            high_raw: 上阈值（原始值），按通道绑定采集配置的增益换算，可用 `voltage_to_raw(mv, channel)` 得到
+            low_raw: 下阈值（原始值），默认取最小值，即只判断上穿
+            data_rate: 比较期间的连续转换数据率，默认使用当前数据率
+            consecutive: 触发所需的连续超限次数，只能是 1、2、4
+        """
+        if self._ready_source is None:
+            raise RuntimeError("ALERT/RDY edge source is required, call enable_ready_pin() first")
+        self._ensure_idle()
+        channel = self.set_channel(channel)
+        for name, value in (("high_raw", high_raw), ("low_raw", low_raw)):
+            if not isinstance(value, int):
+                raise TypeError("%s must be an integer" % name)
+            if value < ADS1115_RAW_MIN or value > ADS1115_RAW_MAX:
+                raise ValueError("%s must be in range -32768~32767" % name)
+        if low_raw >= high_raw:
+            raise ValueError("low_raw must be < high_raw")
+        if consecutive not in ADS1115_COMPARATOR_QUEUE_MAP:
+            raise ValueError("consecutive must be 1, 2 or 4")
+        if data_rate is None:
+            data_rate = self.data_rate
+        if data_rate not in ADS1115_DATA_RATE_TO_SPS:
+            raise ValueError("data_rate must be one of ADS1115_REG_CONFIG_DR_* constants")
+
+        self._write_register(ADS1115_REG_POINTER_LOWTHRESH, low_raw & 0xFFFF)
+        self._write_register(ADS1115_REG_POINTER_HITHRESH, high_raw & 0xFFFF)
+        self._ready_source.clear()
+        self._last_mux = None
+        gain = self._profile_for(channel, differential=False).gain
+        config = [
+            ADS1115_SINGLE_MUX_MAP[channel] | gain | ADS1115_REG_CONFIG_MODE_CONTIN,
+            data_rate
+            | ADS1115_REG_CONFIG_CMODE_WINDOW
+            | ADS1115_REG_CONFIG_CPOL_ACTVLOW
+            | ADS1115_REG_CONFIG_CLAT_LATCH
+            | ADS1115_COMPARATOR_QUEUE_MAP[consecutive],
+        ]
+        self._write_config(config)
+        self._comparator_armed = True
+
+    def wait_comparator(self, timeout_s: float) -> Optional[int]:
+        """等待比较器触发，返回内核边沿时间戳（ns），超时返回 None。"""
+        if not self._comparator_armed:
+            raise RuntimeError("ADS1115 comparator is not armed")
+        return self._ready_source.wait_edge(timeout_s)
+
+    @_locked
+    def read_comparator_raw(self) -> int:
+        """比较器布防期间读取最新转换结果，同时清除锁存的 ALERT。"""
+        if not self._comparator_armed:
+            raise RuntimeError("ADS1115 comparator is not armed")
+        return self._read_conversion()
+
+    @_locked
+    def disarm_comparator(self) -> None:
+        """撤防比较器：芯片掉电回到单次模式，阈值寄存器恢复为转换就绪信号。重复调用安全。"""
+        if not self._comparator_armed:
+            return
+        try:
+            config = self._build_config(self.channel, differential=False)
+            config[0] &= ~ADS1115_REG_CONFIG_OS_SINGLE
+            config[1] = (config[1] & ~0x1F) | ADS1115_REG_CONFIG_CQUE_NONE
+            self._write_config(config)
+            self._read_conversion()
+            self._write_register(ADS1115_REG_POINTER_LOWTHRESH, ADS1115_RDY_LO_THRESH)
+            self._write_register(ADS1115_REG_POINTER_HITHRESH, ADS1115_RDY_HI_THRESH)
+        finally:
+            self._comparator_armed = False
+
+    @_locked
+    def set_channel_profile(
+        self,
+        channel: int,
+        profile: Union[str, AdsProfile, None],
+        *,
+        differential: bool = False,
+    ) -> None:
+        """给通道绑定采集配置，之后该通道的读取按配置自动切换增益、数据率和平均次数。
+
+        参数:
+            channel: 通道 `0~3`，差分时含义同 `read_differential_raw()`
+            profile: `ADS1115_PROFILES` 中的名称、`AdsProfile` 实例，或 None 解除绑定
+            differential: True 时绑定到差分通道，与同编号的单端通道互不影响
+        """
+        channel = self._check_channel(channel)
+        profiles = self._diff_profiles if differential else self._channel_profiles
+        if profile is None:
+            profiles.pop(channel, None)
+            return
+        if isinstance(profile, str):
+            if profile not in ADS1115_PROFILES:
+                raise ValueError("unknown ADS1115 profile: %s" % profile)
+            profile = ADS1115_PROFILES[profile]
+        if not isinstance(profile, AdsProfile):
+            raise TypeError("profile must be a profile name, an AdsProfile or None")
+        profiles[channel] = profile
+
+    def get_channel_profile(self, channel: int, *, differential: bool = False) -> Optional[AdsProfile]:
+        """返回通道绑定的采集配置，未绑定时返回 None。"""
+        profiles = self._diff_profiles if differential else self._channel_profiles
+        return profiles.get(self._check_channel(channel))
+
+    @_locked
+    def set_autorange(self, channel: int, enabled: bool = True, *, differential: bool = False) -> None:
+        """开启或关闭通道的自动量程，`differential=True` 时作用于差分通道。
+
+        开启后从最宽量程开始，每次读取按结果选出下次使用的最窄不削顶增益并记住，
+        稳态下不产生额外转换；读数削顶时切回最宽量程重读一次。增益覆盖采集配置中的 `gain`。
+        """
+        channel = self._check_channel(channel)
+        gains = self._diff_autorange_gains if differential else self._autorange_gains
+        if enabled:
+            gains.setdefault(channel, ADS1115_GAIN_LADDER[0])
+        else:
+            gains.pop(channel, None)
+
+    def autorange_gain(self, channel: int, *, differential: bool = False) -> Optional[int]:
+        """返回自动量程通道记住的增益，未开启时返回 None。"""
+        gains = self._diff_autorange_gains if differential else self._autorange_gains
+        return gains.get(self._check_channel(channel))
+
+    def _check_channel(self, channel: int) -> int:
+        """校验通道编号，范围为 0~3。"""
         if not isinstance(channel, int):
             raise TypeError("channel must be an integer")
         if channel not in ADS1115_SINGLE_MUX_MAP:
             raise ValueError("channel must be in range 0~3")
-        self.channel = channel
+        return channel
+
+    @_locked
+    def set_channel(self, channel: int) -> int:
+        """设置当前通道编号，范围为 0~3。"""
+        self.channel = self._check_channel(channel)
         return self.channel
 
+    @_locked
     def read_raw(self, channel: int) -> int:
         """读取单端通道的原始 ADC 值。"""
         return self._read_channel_raw(channel, differential=False)
 
+    @_locked
     def read_voltage(self, channel: int) -> int:
         """读取单端通道电压，返回毫伏。"""
-        raw_value = self._read_channel_raw(channel, differential=False)
-        return self._raw_to_voltage_mv(raw_value)
+        raw_value, coefficient = self._read_channel(channel, differential=False)
+        return self._raw_to_voltage_mv(raw_value, coefficient)
 
+    @_locked
     def read_differential_raw(self, channel: int) -> int:
         """读取差分通道的原始 ADC 值。"""
         return self._read_channel_raw(channel, differential=True)
 
+    @_locked
     def read_differential_voltage(self, channel: int) -> int:
         """读取差分通道电压，返回毫伏。"""
-        raw_value = self._read_channel_raw(channel, differential=True)
-        return self._raw_to_voltage_mv(raw_value)
+        raw_value, coefficient = self._read_channel(channel, differential=True)
+        return self._raw_to_voltage_mv(raw_value, coefficient)
+
+    def channel_coefficient(self, channel: int) -> float:
+        """返回单端通道读取时使用的换算系数（mV/LSB），绑定了采集配置时取配置的增益。"""
+        return self._profile_for(self._check_channel(channel), differential=False).coefficient
+
+    @_locked
+    def queue_start(self, batch: "I2cBatch", channel: int, *, differential: bool = False) -> bool:
+        """把通道按其采集配置进入连续转换的配置写入追加到批量事务里，不等待。
+
+        与 `read_block()` / `read_average_mv()` 写入的配置完全相同，批次执行后紧接着的块读取命中配置缓存，
+        不再单独写配置，只等满切换后的两个转换周期。配置已是目标值时不追加，返回 False。
+
+        参数:
+            batch: `I2cBatch`，由调用方执行
+            channel: 通道编号 `0~3`，差分时含义同 `read_differential_raw()`
+            differential: True 时按差分通道配置
+        """
+        self._ensure_open()
+        self._ensure_idle()
+        channel = self._check_channel(channel)
+        profile = self._profile_for(channel, differential=differential)
+        config = self._build_config(
+            channel,
+            differential=differential,
+            continuous=True,
+            data_rate=profile.data_rate,
+            gain=profile.gain,
+        )
+        if self._config_cache == (config[0], config[1]):
+            return False
+        batch.write(self.addr, ADS1115_REG_POINTER_CONFIG, config)
+        batch.hold(self._lock)
+
+        def written() -> None:
+            with self._lock:
+                self._config_writes += 1
+                self._config_cache = (config[0], config[1])
+                self._config_written_at = time.monotonic()
+                self._last_mux = None
+
+        batch.on_done(written)
+        return True
+
+    @_locked
+    def read_block(self, channel: int, n: int, out=None, *, differential: bool = False):
+        """连续转换模式下读取一个通道的 n 个原始值，写入预分配的 int16 缓冲区。
+
+        按通道的数据率和增益连续转换，采样间隔为一个转换周期，每个采样一次 I2C 读取；
+        写入过程中不为单个采样创建新对象，缓冲区可在多次调用之间复用。
+        通道绑定的不是连续模式配置时，读完后芯片回到掉电的单次模式。
+        自动量程通道的块内出现削顶时切到最宽量程重读一次；本块使用的换算系数记在 `last_block_coefficient`。
+
+        参数:
+            channel: 通道编号 `0~3`，差分时含义同 `read_differential_raw()`
+            n: 采样个数
+            out: `array('h')` 或 numpy `int16` 数组，长度不小于 n；None 时新建 `array('h')`
+            differential: True 时读取差分通道，按差分通道的采集配置和自动量程
+
+        返回:
+            写入了采样的缓冲区（即 `out`），前 n 个元素有效
+        """
+        if not isinstance(n, int) or n <= 0:
+            raise ValueError("n must be a positive integer")
+        if out is None:
+            out = array("h", [0]) * n
+        else:
+            _check_block_buffer(out, n)
+        self._ensure_idle()
+        channel = self.set_channel(channel)
+        while True:
+            profile = self._profile_for(channel, differential=differential)
+            self._fill_block(channel, n, out, differential=differential, profile=profile)
+            peak_raw = max((out[index] for index in range(n)), key=abs)
+            if not self._autorange_observe(channel, int(peak_raw), profile.coefficient, differential=differential):
+                break
+        self.last_block_coefficient = profile.coefficient
+        return out
+
+    def _fill_block(self, channel: int, n: int, out, *, differential: bool, profile: AdsProfile) -> None:
+        """按给定采集配置连续转换，把 n 个原始值写入 `out`。"""
+        config = self._build_config(
+            channel,
+            differential=differential,
+            continuous=True,
+            data_rate=profile.data_rate,
+            gain=profile.gain,
+        )
+        period_s = conversion_period_s(profile.data_rate)
+
+        if self._config_cache == (config[0], config[1]):
+            self.config_writes_skipped += 1
+            next_deadline = max(time.monotonic(), self._config_written_at + 2 * period_s)
+        else:
+            self._write_config(config)
+            self._last_mux = None
+            # 切换 MUX 时正在进行的那次转换结果不可靠，等满两个周期再读第一个采样。
+            next_deadline = time.monotonic() + 2 * period_s
+        try:
+            for index in range(n):
+                delay = next_deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                out[index] = self._read_conversion()
+                next_deadline += period_s
+        finally:
+            if not profile.continuous:
+                config = self._build_config(
+                    channel,
+                    differential=differential,
+                    data_rate=profile.data_rate,
+                    gain=profile.gain,
+                )
+                config[0] &= ~ADS1115_REG_CONFIG_OS_SINGLE
+                self._write_config(config)
+        self.last_poll_count = 0
+        self.last_conversion_ns = time.monotonic_ns()
+
+    @_locked
+    def read_average_mv(
+        self,
+        channel: int,
+        n: int,
+        *,
+        method: str = "trimmed",
+        out=None,
+        differential: bool = False,
+    ) -> float:
+        """块读取 n 个采样并归约为一个电压（mV，浮点）。
+
+        参数:
+            channel: 单端通道 `0~3`
+            n: 采样个数
+            method: `ADS1115_BLOCK_REDUCERS` 中的名称：mean、median、trimmed、mad
+            out: 可复用的块缓冲区，含义同 `read_block()`
+            differential: True 时读取差分通道
+        """
+        if method not in ADS1115_BLOCK_REDUCERS:
+            raise ValueError("method must be one of %s" % ", ".join(ADS1115_BLOCK_REDUCERS))
+        block = self.read_block(channel, n, out, differential=differential)
+        if len(block) != n:
+            block = block[:n]
+        return ADS1115_BLOCK_REDUCERS[method](block, self.last_block_coefficient)
+
+    @_locked
+    def read_interleaved_average_mv(
+        self,
+        entries: Iterable[Tuple[int, bool]],
+        n: int,
+        *,
+        method: str = "trimmed",
+        discard: int = 1,
+        out=None,
+    ) -> Tuple[float, ...]:
+        """几个通道交替转换 n 轮，每个通道的 n 个采样分别归约为一个电压（mV，浮点）。
+
+        与逐通道 `read_average_mv()` 不同，各通道的采样交错落在同一个时间窗内，
+        测量/参比这类相对读数受到的漂移相同。每轮每个通道单次转换一次，增益和数据率取通道的采集配置；
+        MUX 切换后丢弃 `discard` 次转换。自动量程通道块内削顶时切到最宽量程，整块重读一次。
+
+        参数:
+            entries: `(通道, 是否差分)` 列表，差分通道含义同 `read_differential_raw()`，不能重复
+            n: 每个通道的采样个数
+            method: `ADS1115_BLOCK_REDUCERS` 中的名称
+            discard: MUX 切换后丢弃的转换次数
+            out: 可复用的块缓冲区序列，与 `entries` 一一对应，要求同 `read_block()`；None 时新建
+
+        返回:
+            按 `entries` 顺序的电压
+        """
+        entries = tuple((self._check_channel(channel), bool(differential)) for channel, differential in entries)
+        if not entries:
+            raise ValueError("entries cannot be empty")
+        if len(set(entries)) != len(entries):
+            raise ValueError("entries must not contain duplicates")
+        if not isinstance(n, int) or n <= 0:
+            raise ValueError("n must be a positive integer")
+        if method not in ADS1115_BLOCK_REDUCERS:
+            raise ValueError("method must be one of %s" % ", ".join(ADS1115_BLOCK_REDUCERS))
+        if not isinstance(discard, int) or discard < 0:
+            raise ValueError("discard must be a non-negative integer")
+        if out is None:
+            out = [array("h", [0]) * n for _ in entries]
+        elif len(out) != len(entries):
+            raise ValueError("out must provide one buffer per entry")
+        for block in out:
+            _check_block_buffer(block, n)
+        self._ensure_idle()
+
+        while True:
+            profiles = [self._profile_for(channel, differential=differential) for channel, differential in entries]
+            for index in range(n):
+                for (channel, differential), profile, block in zip(entries, profiles, out):
+                    block[index] = self._convert_after_mux(channel, discard, profile, differential=differential)
+            retry = False
+            for (channel, differential), profile, block in zip(entries, profiles, out):
+                peak_raw = max((block[index] for index in range(n)), key=abs)
+                observed = self._autorange_observe(channel, int(peak_raw), profile.coefficient, differential=differential)
+                retry = observed or retry
+            if not retry:
+                break
+        reducer = ADS1115_BLOCK_REDUCERS[method]
+        return tuple(
+            reducer(block if len(block) == n else block[:n], profile.coefficient)
+            for block, profile in zip(out, profiles)
+        )
+
+    def scan(
+        self,
+        channels: Iterable[int],
+        *,
+        frames: Optional[int] = None,
+        discard: Union[int, Dict[int, int]] = 1,
+    ) -> Iterator[AdsFrame]:
+        """按扫描列表循环转换，逐帧产出每个通道一个带时间戳的值。
+
+        每次转换都按通道的数据率等待完成（OS 位或 ALERT/RDY），不做额外延时。
+        绑定了采集配置的通道使用配置中的增益和数据率，每个扫描位置只转换一次。
+        MUX 切换后的前 `discard` 次转换会被丢弃，可按通道传入字典单独配置；
+        扫描列表只有一个通道时 MUX 不再切换，后续帧不会重复丢弃。
+        每帧在设备锁内完成，产出帧时不持锁；帧之间其它线程切换了 MUX 时，下一帧按 MUX 变化重新丢弃。
+
+        参数:
+            channels: 单端通道列表，范围 `0~3`，不能重复
+            frames: 产出的帧数，None 表示一直扫描直到调用方停止迭代
+            discard: MUX 切换后丢弃的转换次数，`int` 或 `{channel: count}`
+        """
+        scan_channels = tuple(self.set_channel(channel) for channel in channels)
+        if not scan_channels:
+            raise ValueError("channels cannot be empty")
+        if len(set(scan_channels)) != len(scan_channels):
+            raise ValueError("channels must not contain duplicates")
+        if frames is not None and (not isinstance(frames, int) or frames < 0):
+            raise ValueError("frames must be a non-negative integer or None")
+        discard_counts = self._normalize_discard(scan_channels, discard)
+
+        produced = 0
+        while frames is None or produced < frames:
+            timestamps: List[int] = []
+            values: List[int] = []
+            # 生成器里不能用 @_locked：锁只包住一帧的转换，yield 之前释放。
+            with self._lock:
+                profiles = [self._profile_for(channel, differential=False) for channel in scan_channels]
+                for channel, profile in zip(scan_channels, profiles):
+                    values.append(self._convert_after_mux(channel, discard_counts[channel], profile))
+                    timestamps.append(self.last_conversion_ns)
+                coefficients = tuple(profile.coefficient for profile in profiles)
+                # 扫描不重读，自动量程通道的增益调整从下一帧生效。
+                for channel, raw, coefficient in zip(scan_channels, values, coefficients):
+                    self._autorange_observe(channel, raw, coefficient)
+            yield AdsFrame(scan_channels, tuple(timestamps), tuple(values), coefficients)
+            produced += 1
+
+    @_locked
+    def read_frame(self, channels: Iterable[int], *, discard: Union[int, Dict[int, int]] = 1) -> AdsFrame:
+        """扫描一帧并返回，参数含义同 `scan()`。"""
+        return next(self.scan(channels, frames=1, discard=discard))
+
+    def sweep(self, channels: Iterable[int], *, frames: Optional[int] = None) -> Iterator[AdsFrame]:
+        """流水线方式扫描通道列表，逐帧产出 `AdsFrame`。
+
+        单次模式下转换寄存器要等下一次转换结束才会更新，因此“启动通道 N+1”和“读取通道 N 的结果”
+        可以合并成一次 I2C_RDWR 调用：写配置寄存器 -> 指针指回转换寄存器 -> 读 2 字节。
+        每个采样只需一次总线往返（外加等待转换完成），比逐个 `read_raw()` 少一半。
+        流水线跨帧连续进行，结果按启动顺序归属到对应通道。需要 smbus2。
+        每帧在设备锁内完成，产出帧时释放锁；重新拿到锁后若发现期间有其它转换写过配置寄存器，
+        转换寄存器里已不是待读通道的结果，先重新启动该通道再继续流水线（计入 `sweep_restarts`），不会把别人的结果归到本通道。
+
+        参数:
+            channels: 单端通道列表，范围 `0~3`，不能重复
+            frames: 产出的帧数，None 表示一直扫描直到调用方停止迭代
+        """
+        if i2c_msg is None:
+            raise RuntimeError("pipelined sweep requires smbus2 i2c_rdwr support")
+        sweep_channels = tuple(self.set_channel(channel) for channel in channels)
+        if not sweep_channels:
+            raise ValueError("channels cannot be empty")
+        if len(set(sweep_channels)) != len(sweep_channels):
+            raise ValueError("channels must not contain duplicates")
+        if frames is not None and (not isinstance(frames, int) or frames < 0):
+            raise ValueError("frames must be a non-negative integer or None")
+        if frames == 0:
+            return
+        self._ensure_idle()
+
+        total = None if frames is None else frames * len(sweep_channels)
+        profiles = [self._profile_for(channel, differential=False) for channel in sweep_channels]
+        coefficients = tuple(profile.coefficient for profile in profiles)
+        timestamps: List[int] = []
+        values: List[int] = []
+
+        # 每帧的转换在设备锁内完成，产出帧时暂时释放，调用方处理帧期间其它线程可以使用芯片。
+        self._lock.acquire()
+        try:
+            # 先单独启动第一个通道，此后每次调用都是“启动下一个 + 读取上一个”。
+            self._start_conversion(sweep_channels[0], differential=False, profile=profiles[0])
+            pending_ns = self.last_conversion_ns
+            index = 1
+            while total is None or index <= total:
+                if total is None or index < total:
+                    position = index % len(sweep_channels)
+                    raw = self._start_and_read_previous(sweep_channels[position], profiles[position])
+                else:
+                    raw = self._read_conversion()
+                timestamps.append(pending_ns)
+                values.append(raw)
+                if len(values) == len(sweep_channels):
+                    frame = AdsFrame(sweep_channels, tuple(timestamps), tuple(values), coefficients)
+                    config_writes = self._config_writes
+                    self._lock.release()
+                    try:
+                        yield frame
+                    finally:
+                        self._lock.acquire()
+                    timestamps, values = [], []
+                    if (total is None or index < total) and self._config_writes != config_writes:
+                        # 产出帧期间其它线程转换过，待读通道重新转换一次。
+                        self._ensure_idle()
+                        position = index % len(sweep_channels)
+                        self._start_conversion(sweep_channels[position], differential=False, profile=profiles[position])
+                        self.sweep_restarts += 1
+                if total is not None and index == total:
+                    break
+                pending_ns = self.last_conversion_ns
+                index += 1
+        finally:
+            self._lock.release()
+
+    def _start_and_read_previous(self, channel: int, profile: AdsProfile) -> int:
+        """一次 I2C_RDWR：启动 `channel` 的单次转换，同时读回上一次转换结果，并等待本次转换完成。"""
+        self._ensure_open()
+        config = self._build_config(channel, differential=False, data_rate=profile.data_rate, gain=profile.gain)
+        start = i2c_msg.write(self.addr, [ADS1115_REG_POINTER_CONFIG] + config)
+        pointer = i2c_msg.write(self.addr, [ADS1115_REG_POINTER_CONVERT])
+        result = i2c_msg.read(self.addr, 2)
+        if self._ready_source is not None:
+            self._ready_source.clear()
+        started = time.monotonic()
+        self._last_mux = None
+        self.bus.i2c_rdwr(start, pointer, result)
+        self._config_writes += 1
+        self._config_cache = (config[0], config[1])
+        data = list(result)
+        raw = (data[0] << 8) | data[1]
+        if raw > 32767:
+            raw -= 65536
+
+        if self._ready_source is not None:
+            self._wait_ready_edge(started, profile.data_rate)
+        else:
+            self._wait_conversion(started, profile.data_rate)
+        self._last_mux = config[0] & 0x70
+        return raw
+
+    def _normalize_discard(self, channels: Tuple[int, ...], discard: Union[int, Dict[int, int]]) -> Dict[int, int]:
+        """把丢弃配置展开成 `{channel: count}`。"""
+        if isinstance(discard, int):
+            counts = {channel: discard for channel in channels}
+        elif isinstance(discard, dict):
+            counts = {channel: discard.get(channel, 0) for channel in channels}
+        else:
+            raise TypeError("discard must be an int or a dict[int, int]")
+        if any(not isinstance(count, int) or count < 0 for count in counts.values()):
+            raise ValueError("discard counts must be non-negative integers")
+        return counts
+
+    def _convert_after_mux(self, channel: int, discard: int, profile: AdsProfile, *, differential: bool = False) -> int:
+        """转换一次通道；若 MUX 与上一次转换不同，先丢弃 `discard` 次结果。"""
+        self._ensure_idle()
+        mux_map = ADS1115_DIFFERENTIAL_MUX_MAP if differential else ADS1115_SINGLE_MUX_MAP
+        if self._last_mux != mux_map[channel]:
+            for _ in range(discard):
+                self._start_conversion(channel, differential=differential, profile=profile)
+        self._start_conversion(channel, differential=differential, profile=profile)
+        return self._read_conversion()
+
+    @property
+    def is_streaming(self) -> bool:
+        """后台连续采样线程是否正在运行。"""
+        return self._stream_thread is not None and self._stream_thread.is_alive()
+
+    @_locked
+    def start_streaming(
+        self,
+        channels: Iterable[int],
+        *,
+        data_rate: Optional[int] = None,
+        buffer_size: int = ADS1115_STREAM_BUFFER_SIZE,
+    ) -> None:
+        """启动后台采样线程，持续把各通道的采样写入环形缓冲区。
+
+        每个采样都对应一次已确认完成的转换，增益和数据率取通道绑定的采集配置，自动量程照常生效：
+        单通道且启用了 ALERT/RDY 时芯片停留在连续转换模式，每个就绪下降沿读一次；
+        否则轮转 `channels` 做单次转换，按 OS 位（或就绪沿）确认完成后再读取，不按定时器盲读。
+
+        参数:
+            channels: 单端通道列表，范围 `0~3`
+            data_rate: `ADS1115_REG_CONFIG_DR_*` 常量；不传时使用各通道采集配置的数据率
+            buffer_size: 每个通道环形缓冲区的容量
+        """
+        self._ensure_open()
+        self._ensure_idle()
+        stream_channels = [self.set_channel(channel) for channel in channels]
+        if not stream_channels:
+            raise ValueError("channels cannot be empty")
+        if len(set(stream_channels)) != len(stream_channels):
+            raise ValueError("channels must not contain duplicates")
+        if data_rate is not None and data_rate not in ADS1115_DATA_RATE_TO_SPS:
+            raise ValueError("data_rate must be one of ADS1115_REG_CONFIG_DR_* constants")
+
+        self._stream_data_rate = data_rate
+        self._stream_buffers = {channel: AdsSampleRing(buffer_size) for channel in stream_channels}
+        self._last_mux = None
+        self._stream_error = None
+        self._stream_stop.clear()
+        self._stream_thread = threading.Thread(
+            target=self._stream_loop,
+            args=(stream_channels,),
+            name="ads1115-sampler",
+            daemon=True,
+        )
+        self._stream_thread.start()
+
+    def _stream_profile(self, channel: int) -> AdsProfile:
+        """连续采样使用的采集配置：通道配置（含自动量程增益），`start_streaming` 指定了数据率时覆盖之。"""
+        profile = self._profile_for(channel, differential=False)
+        if self._stream_data_rate is not None:
+            profile = replace(profile, data_rate=self._stream_data_rate)
+        return profile
+
+    def _stream_loop(self, channels: List[int]) -> None:
+        """后台采样线程主体。"""
+        try:
+            if len(channels) == 1 and self._ready_source is not None:
+                self._stream_continuous(channels[0])
+            else:
+                self._stream_single_shot(channels)
+        except Exception as exc:
+            self._stream_error = exc
+            logger.exception("ADS1115 sampler stopped on bus=%s addr=0x%02X", self.i2c_bus_num, self.addr)
+        finally:
+            try:
+                # 写回单次模式且不置 OS 位，芯片在当前转换结束后进入掉电状态。
+                with self._lock:
+                    config = self._build_config(channels[0], differential=False)
+                    config[0] &= ~ADS1115_REG_CONFIG_OS_SINGLE
+                    self._write_config(config)
+            except Exception:
+                logger.exception("Failed to power down ADS1115 after streaming")
+
+    def _stream_continuous(self, channel: int) -> None:
+        """单通道连续转换：每个 ALERT/RDY 下降沿对应一次新转换，读到的值和时间戳都来自这次转换。"""
+        buffer = self._stream_buffers[channel]
+        skip = 0
+        while not self._stream_stop.is_set():
+            with self._lock:
+                profile = self._stream_profile(channel)
+                config = self._build_config(
+                    channel,
+                    differential=False,
+                    continuous=True,
+                    data_rate=profile.data_rate,
+                    gain=profile.gain,
+                )
+                if self._config_cache != (config[0], config[1]):
+                    # 新配置写入时正在进行的转换按旧配置开始，丢掉写入后的第一个就绪沿。
+                    self._ready_source.clear()
+                    self._write_config(config)
+                    skip = 1
+
+            timeout_s = conversion_period_s(profile.data_rate) + ADS1115_POLL_TIMEOUT_MARGIN_S
+            timestamp_ns = self._ready_source.wait_edge(timeout_s)
+            if timestamp_ns is None:
+                raise TimeoutError("ADS1115 ALERT/RDY edge not seen within %.4f s" % timeout_s)
+            if skip:
+                skip -= 1
+                continue
+
+            with self._lock:
+                raw = self._read_conversion()
+                self._autorange_observe(channel, raw, profile.coefficient)
+            buffer.append(timestamp_ns, raw, profile.coefficient)
+
+    def _stream_single_shot(self, channels: List[int]) -> None:
+        """轮转各通道做单次转换，确认完成后再读取；单次转换在写入 MUX 之后才开始，不需要丢弃。"""
+        while not self._stream_stop.is_set():
+            for channel in channels:
+                with self._lock:
+                    profile = self._stream_profile(channel)
+                    self._start_conversion(channel, differential=False, profile=profile)
+                    raw = self._read_conversion()
+                    timestamp_ns = self.last_conversion_ns
+                    self._autorange_observe(channel, raw, profile.coefficient)
+                self._stream_buffers[channel].append(timestamp_ns, raw, profile.coefficient)
+                if self._stream_stop.is_set():
+                    return
+
+    def stop_streaming(self) -> None:
+        """停止后台采样线程，芯片回到单次转换模式。重复调用安全。"""
+        thread = self._stream_thread
+        if thread is None:
+            return
+        self._stream_stop.set()
+        thread.join()
+        self._stream_thread = None
+
+    def _stream_buffer(self, channel: int) -> AdsSampleRing:
+        """取指定通道的环形缓冲区，采样线程异常退出时把异常抛给调用方。"""
+        if self._stream_error is not None:
+            raise RuntimeError("ADS1115 sampler failed") from self._stream_error
+        buffer = self._stream_buffers.get(channel)
+        if buffer is None:
+            raise ValueError("channel %s is not being streamed" % channel)
+        return buffer
+
+    def read_latest_raw(self, channel: int) -> Optional[int]:
+        """返回连续采样中该通道最新的原始值，不阻塞；尚无数据时返回 None。"""
+        sample = self._stream_buffer(channel).latest()
+        return None if sample is None else sample[1]
+
+    def read_latest_voltage(self, channel: int) -> Optional[int]:
+        """返回连续采样中该通道最新的电压（mV），不阻塞；尚无数据时返回 None。"""
+        entry = self._stream_buffer(channel).latest_entry()
+        return None if entry is None else self._raw_to_voltage_mv(entry[1], entry[2])
+
+    def read_recent_samples(self, channel: int, n: int) -> List[Tuple[int, int]]:
+        """返回连续采样中该通道最近 n 个 `(monotonic_ns, raw)`，按时间先后排列。"""
+        return self._stream_buffer(channel).last(n)
+
+    def read_recent_voltages(self, channel: int, n: int) -> List[int]:
+        """返回连续采样中该通道最近 n 个电压（mV），按时间先后排列。"""
+        return [
+            self._raw_to_voltage_mv(raw, coefficient)
+            for _, raw, coefficient in self._stream_buffer(channel).last_entries(n)
+        ]
+
+    def read_fresh_voltages(self, channel: int, n: int, *, timeout_s: Optional[float] = None) -> List[float]:
+        """等待采样线程在调用之后为该通道新采到 n 个采样，返回它们的电压（mV，浮点），按时间先后排列。
+
+        与 `read_recent_voltages()` 不同，返回的采样全部晚于调用时刻，适合代替一次单次读取。
+        `timeout_s` 不传时按各通道轮转一遍的最长时间估算。
+        """
+        if not isinstance(n, int) or n <= 0:
+            raise ValueError("n must be a positive integer")
+        since_ns = time.monotonic_ns()
+        if timeout_s is None:
+            period_s = max(conversion_period_s(self._stream_profile(ch).data_rate) for ch in self._stream_buffers)
+            timeout_s = (n + 1) * len(self._stream_buffers) * period_s + ADS1115_POLL_TIMEOUT_MARGIN_S
+        deadline = time.monotonic() + timeout_s
+        while True:
+            entries = self._stream_buffer(channel).last_entries(n)
+            if len(entries) == n and entries[0][0] > since_ns:
+                return [float(raw) * coefficient for _, raw, coefficient in entries]
+            if not self.is_streaming:
+                raise RuntimeError("ADS1115 is not streaming")
+            if time.monotonic() >= deadline:
+                raise TimeoutError("ADS1115 stream produced no fresh samples within %.4f s" % timeout_s)
+            time.sleep(ADS1115_POLL_INTERVAL_S)
 
     def close(self) -> None:
-        """关闭 I2C 句柄，重复调用安全。"""
+        """释放 I2C 总线句柄，重复调用安全。"""
         if self._closed:
             return
 
+        self.stop_streaming()
+        try:
+            self.disarm_comparator()
+        except Exception:
+            logger.exception("Failed to disarm ADS1115 comparator")
+
+        try:
+            if self._ready_source is not None:
+                self._ready_source.close()
+        except Exception:
+            logger.exception("Failed to close ADS1115 ALERT/RDY edge source")
+        finally:
+            self._ready_source = None
+
         try:
-            self.bus.close()
+            if self._owns_bus:
+                self.bus.close()
         finally:
             self.bus = None
             self._closed = True
+
+
+AdsChannel = Tuple[str, int]
+
+
+class ADS1115Group:
+    """同一总线上多片 ADS1115 的并行采样组。
+
+    每片芯片用逻辑名称登记，通道用 `(名称, 通道号)` 表示，例如 `("meter", 0)`。
+    每一轮先对所有芯片背靠背启动转换，只等待一次转换时间，再依次取回结果；
+    同一芯片上的多个通道分到不同轮次。多个逻辑名称指向同一地址时共用同一个驱动实例。
+    """
+
+    def __init__(self, chips: Dict[str, ADS1115]) -> None:
+        """用已经打开的驱动实例创建采样组。
+
+        参数:
+            chips: 逻辑名称到 `ADS1115` 实例的映射，最多 4 个不同实例（0x48~0x4B）
+        """
+        if not isinstance(chips, dict) or not chips:
+            raise ValueError("chips must be a non-empty dict")
+        if not all(isinstance(name, str) and name for name in chips):
+            raise TypeError("chip names must be non-empty strings")
+        unique = {id(chip): chip for chip in chips.values()}
+        if len(unique) > 4:
+            raise ValueError("at most 4 ADS1115 chips can share one bus")
+
+        self._chips = dict(chips)
+        self._devices = list(unique.values())
+        self._closed = False
+
+    @classmethod
+    def open(cls, i2c_bus: int, addresses: Dict[str, int], bus=None) -> "ADS1115Group":
+        """按 `{逻辑名称: 地址}` 打开各芯片，相同地址只打开一次；`bus` 含义同 `ADS1115`。"""
+        by_addr: Dict[int, ADS1115] = {}
+        chips: Dict[str, ADS1115] = {}
+        try:
+            for name, addr in addresses.items():
+                if addr not in by_addr:
+                    by_addr[addr] = ADS1115(i2c_bus=i2c_bus, addr=addr, bus=bus)
+                chips[name] = by_addr[addr]
+        except Exception:
+            for chip in by_addr.values():
+                chip.close()
+            raise
+        return cls(chips)
+
+    def __enter__(self) -> "ADS1115Group":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def names(self) -> List[str]:
+        """已登记的逻辑名称。"""
+        return list(self._chips)
+
+    @property
+    def devices(self) -> List[ADS1115]:
+        """去重后的芯片实例。"""
+        return list(self._devices)
+
+    def chip(self, name: str) -> ADS1115:
+        """按逻辑名称取芯片实例。"""
+        if name not in self._chips:
+            raise KeyError("unknown ADS1115 chip name: %s" % name)
+        return self._chips[name]
+
+    def read_raw(self, channels: Iterable[AdsChannel]) -> Dict[AdsChannel, int]:
+        """并行读取一组逻辑通道的原始值。
+
+        参数:
+            channels: `(名称, 通道号)` 列表
+
+        返回:
+            dict: `(名称, 通道号)` 到原始值的映射
+        """
+        return {alias: raw for alias, (raw, _) in self._read_rounds(channels).items()}
+
+    def _read_rounds(self, channels: Iterable[AdsChannel]) -> Dict[AdsChannel, Tuple[int, float]]:
+        """按轮次并行转换，返回 `(名称, 通道号)` 到 `(原始值, 换算系数)` 的映射。"""
+        if self._closed:
+            raise RuntimeError("ADS1115Group is closed")
+
+        # 按物理芯片分组，同一芯片（以及同一物理通道）只排一次。
+        queues: Dict[int, List[int]] = {}
+        aliases: Dict[Tuple[int, int], List[AdsChannel]] = {}
+        for name, channel in channels:
+            chip = self.chip(name)
+            channel = chip.set_channel(channel)
+            key = (id(chip), channel)
+            if key not in aliases:
+                aliases[key] = []
+                queues.setdefault(id(chip), []).append(channel)
+            aliases[key].append((name, channel))
+
+        devices = {id(chip): chip for chip in self._devices}
+        results: Dict[AdsChannel, Tuple[int, float]] = {}
+        with ExitStack() as stack:
+            # 各芯片按地址顺序加锁，与其它同时持有多把 ADS1115 锁的代码保持一致的顺序。
+            for chip in sorted((devices[chip_id] for chip_id in queues), key=lambda chip: chip.addr):
+                stack.enter_context(chip._lock)
+            self._convert_rounds(queues, aliases, devices, results)
+        return results
+
+    def _convert_rounds(
+        self,
+        queues: Dict[int, List[int]],
+        aliases: Dict[Tuple[int, int], List[AdsChannel]],
+        devices: Dict[int, ADS1115],
+        results: Dict[AdsChannel, Tuple[int, float]],
+    ) -> None:
+        """逐轮启动各芯片的下一个通道并读取结果，写入 `results`。调用方已持有全部芯片的设备锁。
+
+        与单通道读取一样遵守采集配置的平均次数和模式：单次模式的通道每轮做 `samples` 次并行转换，
+        连续模式的通道按 `_read_continuous()` 读取；多次采样取平均，自动量程按绝对值最大的一次更新。
+        """
+        while any(queues.values()):
+            round_items = [(devices[chip_id], queue.pop(0)) for chip_id, queue in queues.items() if queue]
+            for chip, _ in round_items:
+                chip._ensure_idle()
+            profiles = [chip._profile_for(channel, differential=False) for chip, channel in round_items]
+            values: List[List[int]] = [[] for _ in round_items]
+            for (chip, channel), profile, samples in zip(round_items, profiles, values):
+                if profile.continuous:
+                    samples.extend(chip._read_continuous(channel, profile))
+            single = [index for index, profile in enumerate(profiles) if not profile.continuous]
+            # 平均次数不同的芯片一起转换，次数少的先退出后续轮次。
+            for sample_index in range(max((profiles[index].samples for index in single), default=0)):
+                pending = [index for index in single if profiles[index].samples > sample_index]
+                started = [
+                    round_items[index][0]._begin_conversion(
+                        round_items[index][1], differential=False, profile=profiles[index]
+                    )
+                    for index in pending
+                ]
+                for index, started_at in zip(pending, started):
+                    chip, channel = round_items[index]
+                    chip._finish_conversion(channel, started_at, differential=False, profile=profiles[index])
+                for index in pending:
+                    values[index].append(round_items[index][0]._read_conversion())
+            for (chip, channel), profile, samples in zip(round_items, profiles, values):
+                chip._autorange_observe(channel, max(samples, key=abs), profile.coefficient)
+                raw = samples[0] if len(samples) == 1 else int(round(sum(samples) / len(samples)))
+                for alias in aliases[(id(chip), channel)]:
+                    results[alias] = (raw, profile.coefficient)
+
+    def read_voltages(self, channels: Iterable[AdsChannel]) -> Dict[AdsChannel, int]:
+        """并行读取一组逻辑通道的电压（mV），按各通道实际使用的增益换算。"""
+        return {
+            (name, channel): self.chip(name)._raw_to_voltage_mv(raw, coefficient)
+            for (name, channel), (raw, coefficient) in self._read_rounds(channels).items()
+        }
+
+    def close(self) -> None:
+        """关闭组内全部芯片，重复调用安全。"""
+        if self._closed:
+            return
+        self._closed = True
+        for chip in self._devices:
+            try:
+                chip.close()
+            except Exception:
+                logger.exception("Failed to close ADS1115 addr=0x%02X", chip.addr)
@@ -6,6 +6,8 @@ import math
 import time
 from typing import TYPE_CHECKING, List
 
+from lib.device_lock import DeviceLock
+
 if TYPE_CHECKING:
     from lib.SoftSPI import SoftSPI
 
@@ -146,6 +148,8 @@ class MAX31865:
         self.wires = wires
         self.filter_frequency = filter_frequency
         self._closed = False
+        # 一次测温是“写配置 -> 等待 -> 读结果”多次 SPI 事务，加热控制和监控线程共用时需整体互斥。
+        self._lock = DeviceLock("MAX31865")
 
         self._configure()
 
@@ -165,21 +169,23 @@ class MAX31865:
 
     def _spi_read(self, command: List[int]) -> List[int]:
         """执行一次 SPI 读事务。"""
-        self._ensure_open()
-        self.spi.cs_low()
-        try:
-            return self.spi.transfer(command)
-        finally:
-            self.spi.cs_high()
+        with self._lock:
+            self._ensure_open()
+            self.spi.cs_low()
+            try:
+                return self.spi.transfer(command)
+            finally:
+                self.spi.cs_high()
 
     def _spi_write(self, command: List[int]) -> None:
         """执行一次 SPI 写事务。"""
-        self._ensure_open()
-        self.spi.cs_low()
-        try:
-            self.spi.transfer(command)
-        finally:
-            self.spi.cs_high()
+        with self._lock:
+            self._ensure_open()
+            self.spi.cs_low()
+            try:
+                self.spi.transfer(command)
+            finally:
+                self.spi.cs_high()
 
     def _configure(self) -> None:
         """写入基础配置，并清除历史故障标志。"""
@@ -198,8 +204,9 @@ class MAX31865:
 
     def read_raw_rtd(self) -> int:
         """读取 RTD 原始 15 位 ADC 结果。"""
-        self._start_one_shot_conversion()
-        data = self.read_registers(MAX31865_RTD_MSB_REG, 2)
+        with self._lock:
+            self._start_one_shot_conversion()
+            data = self.read_registers(MAX31865_RTD_MSB_REG, 2)
         return ((data[0] << 8) | data[1]) >> 1
 
     def read_resistance(self) -> float:
@@ -214,8 +221,9 @@ class MAX31865:
 
     def clear_faults(self) -> None:
         """清除故障状态位。"""
-        config = self.read_register(MAX31865_CONFIG_REG)
-        self.write_register(MAX31865_CONFIG_REG, config | MAX31865_CONFIG_FAULT_CLEAR)
+        with self._lock:
+            config = self.read_register(MAX31865_CONFIG_REG)
+            self.write_register(MAX31865_CONFIG_REG, config | MAX31865_CONFIG_FAULT_CLEAR)
 
     def read_register(self, reg_addr: int) -> int:
         """读取单个寄存器。"""
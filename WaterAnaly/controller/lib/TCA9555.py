@@ -3,9 +3,16 @@
 from __future__ import annotations
 
 import logging
-from typing import List, Literal, Union
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Literal, Optional, Tuple, Union
 
-import smbus2
+from lib.device_lock import DeviceLock
+from lib.i2c_bus import open_shared_bus
+
+if TYPE_CHECKING:
+    from lib.i2c_bus import I2cBatch
+    from lib.pins import EdgeSource
 
 
 logger = logging.getLogger(__name__)
@@ -23,23 +30,51 @@ TCA9555_REG_POLARITY_PORT1 = 0x05
 TCA9555_REG_CONFIG_PORT0 = 0x06
 TCA9555_REG_CONFIG_PORT1 = 0x07
 
+TCA9555_SCRUB_DEFAULT_INTERVAL_S = 1.0
+
+# 输出、极性、方向寄存器只保存状态，后写完全覆盖前写，总线属主可以合并相邻写入。
+TCA9555_COALESCE_REGISTERS = (
+    TCA9555_REG_OUTPUT_PORT0,
+    TCA9555_REG_OUTPUT_PORT1,
+    TCA9555_REG_POLARITY_PORT0,
+    TCA9555_REG_POLARITY_PORT1,
+    TCA9555_REG_CONFIG_PORT0,
+    TCA9555_REG_CONFIG_PORT1,
+)
+
+# 提交顺序：先输出、再极性、最后方向，引脚切到输出时已经是目标电平。
+TCA9555_COMMIT_ORDER = (TCA9555_REG_OUTPUT_PORT0, TCA9555_REG_POLARITY_PORT0, TCA9555_REG_CONFIG_PORT0)
+
+# 每个线程当前打开的输出帧栈，TCA9555 写入时据此决定暂存还是立即写总线。
+_frame_local = threading.local()
+
+# 输入监视线程等待 INT 边沿的单次超时，只决定 stop() 的响应速度，空闲时不产生 I2C 传输。
+TCA9555_WATCH_WAIT_S = 0.2
+
 TCA9555_PinArg = Union[int, List[int]]
 TCA9555_Mode = Literal["input", "output"]
 TCA9555_ReadSource = Literal["input", "output"]
+TCA9555_WatchEdge = Literal["rising", "falling", "both"]
+# 回调参数：(引脚号, 新电平, 内核边沿时间戳 ns)
+TCA9555_InputCallback = Callable[[int, bool, int], None]
 
 
 class TCA9555:
     """TCA9555 I2C GPIO 扩展芯片驱动。
 
     提供 16 路扩展 IO 的方向配置、输出写入、输入读取和极性反转能力。
+    `config_state` / `output_state` / `polarity_state` 是寄存器的影子副本，读-改-写一律以影子为准，
+    不再回读硬件；`scrub()` 或后台校验线程负责发现并修复硬件与影子不一致。
     """
 
-    def __init__(self, i2c_bus: int = TCA9555_DEFAULT_I2C_BUS, addr: int = TCA9555_DEFAULT_ADDR):
+    def __init__(self, i2c_bus: int = TCA9555_DEFAULT_I2C_BUS, addr: int = TCA9555_DEFAULT_ADDR, bus=None):
         """打开 I2C 总线，并缓存配置/输出/极性寄存器状态。
 
         参数:
             i2c_bus: I2C 总线号，必须为非负整数
             addr: 设备 I2C 地址，必须位于 7 位地址合法范围内
+            bus: 可选的 SMBus 兼容对象（例如 `PacedBus`），传入时直接使用，`close()` 也不会关闭它；
+                不传时从共享注册表取该总线号的句柄，`close()` 释放一次引用
         """
         if not isinstance(i2c_bus, int):
             raise TypeError("i2c_bus must be an integer")
@@ -52,8 +87,17 @@ class TCA9555:
 
         self.i2c_bus_num = i2c_bus
         self.addr = addr
-        self.bus = smbus2.SMBus(self.i2c_bus_num)
+        self._owns_bus = bus is None
+        self.bus = open_shared_bus(self.i2c_bus_num) if bus is None else bus
         self._closed = False
+        # I2C 事务计数，每次读/写调用（无论单字节还是寄存器对）计一次。
+        self.read_transactions = 0
+        self.write_transactions = 0
+        # 影子寄存器与总线访问共用一把可重入的设备锁，后台校验线程与调用方线程互斥。
+        self._lock = DeviceLock("TCA9555 %d-0x%02X" % (i2c_bus, addr))
+        self._scrub_thread: Optional[threading.Thread] = None
+        self._scrub_stop = threading.Event()
+        self.scrub_repairs = 0
 
         self.config_state = self._read_register_pair(TCA9555_REG_CONFIG_PORT0)
         self.output_state = self._read_register_pair(TCA9555_REG_OUTPUT_PORT0)
@@ -84,6 +128,7 @@ class TCA9555:
     def _read_byte(self, register: int) -> int:
         """读取单个寄存器字节。"""
         self._ensure_open()
+        self.read_transactions += 1
         try:
             return self.bus.read_byte_data(self.addr, register)
         except Exception:
@@ -93,6 +138,7 @@ class TCA9555:
     def _write_byte(self, register: int, value: int) -> None:
         """写入单个寄存器字节。"""
         self._ensure_open()
+        self.write_transactions += 1
         try:
             self.bus.write_byte_data(self.addr, register, value & 0xFF)
         except Exception:
@@ -100,15 +146,33 @@ class TCA9555:
             raise
 
     def _read_register_pair(self, start_register: int) -> int:
-        """连续读取两个寄存器并拼成 16 位值。"""
-        low = self._read_byte(start_register)
-        high = self._read_byte(start_register + 1)
+        """一次块读取寄存器对（端口 0、端口 1）并拼成 16 位值。
+
+        芯片在同一寄存器对内自动切换指针，读完端口 0 后紧接着返回端口 1，一次事务即可取回整个字。
+        """
+        self._ensure_open()
+        self.read_transactions += 1
+        try:
+            low, high = self.bus.read_i2c_block_data(self.addr, start_register, 2)
+        except Exception:
+            logger.exception("Failed to read TCA9555 register pair 0x%02X", start_register)
+            raise
         return low | (high << 8)
 
     def _write_register_pair(self, start_register: int, value: int) -> None:
-        """将 16 位值拆分后写入两个连续寄存器。"""
-        self._write_byte(start_register, value & 0xFF)
-        self._write_byte(start_register + 1, (value >> 8) & 0xFF)
+        """一次块写入寄存器对，端口 0 在前、端口 1 在后。"""
+        self._ensure_open()
+        self.write_transactions += 1
+        try:
+            self.bus.write_i2c_block_data(self.addr, start_register, [value & 0xFF, (value >> 8) & 0xFF])
+        except Exception:
+            logger.exception("Failed to write TCA9555 register pair 0x%02X = 0x%04X", start_register, value & 0xFFFF)
+            raise
+
+    def reset_counters(self) -> None:
+        """清零 I2C 事务计数。"""
+        self.read_transactions = 0
+        self.write_transactions = 0
 
     def _normalize_pins(self, pins: TCA9555_PinArg) -> List[int]:
         """规范化单个或多个引脚参数，并去重。"""
@@ -158,19 +222,94 @@ class TCA9555:
             mask |= 1 << pin
         return mask
 
-    def _apply_mask(self, register: int, current_value: int, mask: int, enabled: bool) -> int:
-        """按掩码更新寄存器缓存，并只写入发生变化的字节。"""
-        new_value = (current_value | mask) if enabled else (current_value & ~mask)
+    def _shadow(self, register: int) -> int:
+        """取寄存器对的影子值。"""
+        if register == TCA9555_REG_OUTPUT_PORT0:
+            return self.output_state
+        if register == TCA9555_REG_CONFIG_PORT0:
+            return self.config_state
+        return self.polarity_state
+
+    def _store_shadow(self, register: int, value: int) -> None:
+        """更新寄存器对的影子值。"""
+        if register == TCA9555_REG_OUTPUT_PORT0:
+            self.output_state = value
+        elif register == TCA9555_REG_CONFIG_PORT0:
+            self.config_state = value
+        else:
+            self.polarity_state = value
+
+    def _staged(self, register: int) -> int:
+        """当前线程视角的寄存器值：输出帧中有暂存值时取暂存值，否则取影子。"""
+        frame = _current_frame()
+        if frame is not None:
+            staged = frame._staged_value(self, register)
+            if staged is not None:
+                return staged
+        return self._shadow(register)
+
+    def _commit_register(self, register: int, new_value: int) -> None:
+        """把寄存器对写成 `new_value`，只写入发生变化的部分：单个字节变化写一个字节，两个都变化写一次寄存器对。"""
+        current_value = self._shadow(register)
         if new_value == current_value:
-            return current_value
+            return
 
         changed_low = (current_value & 0x00FF) != (new_value & 0x00FF)
         changed_high = (current_value & 0xFF00) != (new_value & 0xFF00)
 
-        if changed_low:
+        if changed_low and changed_high:
+            self._write_register_pair(register, new_value)
+        elif changed_low:
             self._write_byte(register, new_value & 0xFF)
-        if changed_high:
+        else:
             self._write_byte(register + 1, (new_value >> 8) & 0xFF)
+        self._store_shadow(register, new_value)
+
+    def _queue_register(self, batch: "I2cBatch", register: int, new_value: int) -> None:
+        """与 `_commit_register()` 相同的最小写入，但追加到批量事务里，影子在这次写入发出后更新。
+
+        写入值按当前影子算出，入批时就让批次拿住本芯片的设备锁直到执行结束，
+        期间其它线程改不了这对寄存器，回调写回影子的完整字不会推翻别人的修改。
+        """
+        key = (id(self), register)
+        current_value = batch.pending(key, self._shadow(register))
+        if new_value == current_value:
+            return
+
+        changed_low = (current_value & 0x00FF) != (new_value & 0x00FF)
+        changed_high = (current_value & 0xFF00) != (new_value & 0xFF00)
+
+        self._ensure_open()
+        if changed_low and changed_high:
+            batch.write(self.addr, register, [new_value & 0xFF, (new_value >> 8) & 0xFF])
+        elif changed_low:
+            batch.write(self.addr, register, [new_value & 0xFF])
+        else:
+            batch.write(self.addr, register + 1, [(new_value >> 8) & 0xFF])
+        batch.set_pending(key, new_value)
+        batch.hold(self._lock)
+
+        def store() -> None:
+            with self._lock:
+                self._store_shadow(register, new_value)
+
+        batch.on_done(store)
+
+    def _set_register(self, register: int, new_value: int) -> None:
+        """设置寄存器对的目标值；当前线程有打开的输出帧时只暂存，帧退出时统一提交。"""
+        frame = _current_frame()
+        if frame is not None:
+            frame._stage(self, register, new_value)
+            return
+        with self._lock:
+            self._commit_register(register, new_value)
+
+    def _apply_mask(self, register: int, mask: int, enabled: bool) -> int:
+        """按掩码置位或清零寄存器对，返回新的目标值。"""
+        with self._lock:
+            current_value = self._staged(register)
+            new_value = (current_value | mask) if enabled else (current_value & ~mask)
+            self._set_register(register, new_value)
         return new_value
 
     def _resolve_source_register(self, source: TCA9555_ReadSource) -> int:
@@ -196,8 +335,8 @@ class TCA9555:
         normalized_pins = self._normalize_pins(pins)
         mask = self._build_mask(normalized_pins)
         use_input_mode = self._normalize_mode(mode) == 1
-        self.config_state = self._apply_mask(TCA9555_REG_CONFIG_PORT0, self.config_state, mask, use_input_mode)
-        logger.debug("Set mode %s for pins %s -> config=0x%04X", mode, normalized_pins, self.config_state)
+        config = self._apply_mask(TCA9555_REG_CONFIG_PORT0, mask, use_input_mode)
+        logger.debug("Set mode %s for pins %s -> config=0x%04X", mode, normalized_pins, config)
 
     def write(self, pins: TCA9555_PinArg, value: Union[bool, int]) -> None:
         """向指定引脚写入逻辑电平。
@@ -209,8 +348,8 @@ class TCA9555:
         normalized_pins = self._normalize_pins(pins)
         mask = self._build_mask(normalized_pins)
         state = self._normalize_bool_value(value)
-        self.output_state = self._apply_mask(TCA9555_REG_OUTPUT_PORT0, self.output_state, mask, state)
-        logger.debug("Write %s to pins %s -> output=0x%04X", state, normalized_pins, self.output_state)
+        output = self._apply_mask(TCA9555_REG_OUTPUT_PORT0, mask, state)
+        logger.debug("Write %s to pins %s -> output=0x%04X", state, normalized_pins, output)
 
     def read(self, pins: TCA9555_PinArg, source: TCA9555_ReadSource = "input") -> Union[bool, List[bool]]:
         """读取指定引脚状态。
@@ -241,16 +380,15 @@ class TCA9555:
         if value < 0 or value > 0xFF:
             raise ValueError("value must be in range 0x00~0xFF")
 
-        if port == 0:
-            if (self.output_state & 0x00FF) != value:
-                self._write_byte(TCA9555_REG_OUTPUT_PORT0, value)
-            self.output_state = (self.output_state & 0xFF00) | value
-        else:
-            if ((self.output_state >> 8) & 0xFF) != value:
-                self._write_byte(TCA9555_REG_OUTPUT_PORT1, value)
-            self.output_state = (self.output_state & 0x00FF) | (value << 8)
+        with self._lock:
+            current = self._staged(TCA9555_REG_OUTPUT_PORT0)
+            if port == 0:
+                output = (current & 0xFF00) | value
+            else:
+                output = (current & 0x00FF) | (value << 8)
+            self._set_register(TCA9555_REG_OUTPUT_PORT0, output)
 
-        logger.debug("Write port %s = 0x%02X -> output=0x%04X", port, value, self.output_state)
+        logger.debug("Write port %s = 0x%02X -> output=0x%04X", port, value, output)
 
     def read_port(self, port: int, source: TCA9555_ReadSource = "input") -> int:
         """读取单个 8 位端口值。
@@ -265,7 +403,8 @@ class TCA9555:
         if port not in (0, 1):
             raise ValueError("port must be 0 or 1")
         base_register = self._resolve_source_register(source)
-        return self._read_byte(base_register + port)
+        with self._lock:
+            return self._read_byte(base_register + port)
 
     def write_word(self, value: int) -> None:
         """一次性写入全部 16 位输出值。
@@ -278,10 +417,8 @@ class TCA9555:
         if value < 0 or value > 0xFFFF:
             raise ValueError("value must be in range 0x0000~0xFFFF")
 
-        if value != self.output_state:
-            self._write_register_pair(TCA9555_REG_OUTPUT_PORT0, value)
-        self.output_state = value
-        logger.debug("Write word 0x%04X", self.output_state)
+        self._set_register(TCA9555_REG_OUTPUT_PORT0, value)
+        logger.debug("Write word 0x%04X", value)
 
     def read_word(self, source: TCA9555_ReadSource = "input") -> int:
         """一次性读取全部 16 位端口值。
@@ -292,7 +429,12 @@ class TCA9555:
         返回:
             int: 16 位端口值
         """
-        return self._read_register_pair(self._resolve_source_register(source))
+        with self._lock:
+            return self._read_register_pair(self._resolve_source_register(source))
+
+    def output_word(self) -> int:
+        """返回当前线程视角的 16 位输出值：输出帧中有暂存写入时为暂存值，否则为影子输出寄存器。不产生 I2C 传输。"""
+        return self._staged(TCA9555_REG_OUTPUT_PORT0)
 
     def set_polarity(self, pins: TCA9555_PinArg, inverted: Union[bool, int]) -> None:
         """设置指定引脚输入极性是否反相。
@@ -304,19 +446,334 @@ class TCA9555:
         normalized_pins = self._normalize_pins(pins)
         mask = self._build_mask(normalized_pins)
         invert = self._normalize_bool_value(inverted)
-        self.polarity_state = self._apply_mask(TCA9555_REG_POLARITY_PORT0, self.polarity_state, mask, invert)
-        logger.debug("Set polarity inverted=%s for pins %s -> polarity=0x%04X", invert, normalized_pins, self.polarity_state)
+        polarity = self._apply_mask(TCA9555_REG_POLARITY_PORT0, mask, invert)
+        logger.debug("Set polarity inverted=%s for pins %s -> polarity=0x%04X", invert, normalized_pins, polarity)
+
+    def scrub(self) -> int:
+        """回读输出、配置寄存器并与影子比较，不一致时按影子重写。
+
+        先修输出再修方向，芯片复位后（全部回到输入）重新切回输出时引脚直接是影子电平。
+
+        返回:
+            int: 本次修复的寄存器对数量
+        """
+        repaired = 0
+        with self._lock:
+            for register, name in ((TCA9555_REG_OUTPUT_PORT0, "output"), (TCA9555_REG_CONFIG_PORT0, "config")):
+                expected = self.output_state if name == "output" else self.config_state
+                actual = self._read_register_pair(register)
+                if actual == expected:
+                    continue
+                logger.warning(
+                    "TCA9555 addr=0x%02X %s register diverged: hardware=0x%04X shadow=0x%04X, rewriting",
+                    self.addr,
+                    name,
+                    actual,
+                    expected,
+                )
+                self._write_register_pair(register, expected)
+                repaired += 1
+        self.scrub_repairs += repaired
+        return repaired
+
+    @property
+    def is_scrubbing(self) -> bool:
+        """后台校验线程是否正在运行。"""
+        return self._scrub_thread is not None and self._scrub_thread.is_alive()
+
+    def start_scrub(self, interval_s: float = TCA9555_SCRUB_DEFAULT_INTERVAL_S) -> None:
+        """启动低频后台校验线程，每隔 `interval_s` 秒执行一次 `scrub()`。
+
+        硬件状态被意外改写（I2C 干扰、芯片复位）后最迟一个周期内恢复。重复调用时先停掉旧线程。
+        """
+        if not isinstance(interval_s, (int, float)) or interval_s <= 0:
+            raise ValueError("interval_s must be > 0")
+        self._ensure_open()
+        self.stop_scrub()
+        self._scrub_stop.clear()
+        self._scrub_thread = threading.Thread(
+            target=self._scrub_loop,
+            args=(float(interval_s),),
+            name="tca9555-scrub-0x%02X" % self.addr,
+            daemon=True,
+        )
+        self._scrub_thread.start()
+
+    def _scrub_loop(self, interval_s: float) -> None:
+        """后台校验线程主体，单次失败只记录日志，下个周期继续。"""
+        while not self._scrub_stop.wait(interval_s):
+            try:
+                self.scrub()
+            except Exception:
+                logger.exception("TCA9555 scrub failed on bus=%s addr=0x%02X", self.i2c_bus_num, self.addr)
+
+    def stop_scrub(self) -> None:
+        """停止后台校验线程，重复调用安全。"""
+        thread = self._scrub_thread
+        if thread is None:
+            return
+        self._scrub_stop.set()
+        thread.join()
+        self._scrub_thread = None
 
     def close(self) -> None:
-        """关闭底层 I2C 总线句柄。"""
+        """释放共享总线句柄，后台校验线程会先停止。注入的外部总线不会被关闭。"""
         if self._closed:
             return
 
+        self.stop_scrub()
         try:
-            self.bus.close()
+            if self._owns_bus:
+                self.bus.close()
         except Exception:
             logger.exception("Failed to close I2C bus for TCA9555")
             raise
         finally:
             self.bus = None
             self._closed = True
+
+
+def _current_frame() -> Optional["OutputFrame"]:
+    """返回当前线程最外层打开的输出帧，没有时返回 None。"""
+    stack = getattr(_frame_local, "stack", None)
+    return stack[0] if stack else None
+
+
+class OutputFrame:
+    """输出帧：把一段代码里对任意 TCA9555 / Tca9555Pin 的写入暂存起来，退出时按芯片合并提交。
+
+    帧内的 `write()`、`write_port()`、`write_word()`、`set_mode()`、`set_polarity()` 只修改暂存值，
+    退出 `with` 时每片芯片的每个寄存器对最多一次写入（只有一个端口变化时写一个字节），
+    顺序为输出、极性、方向。暂存按线程隔离，嵌套的帧并入最外层一起提交；
+    帧内抛出异常时丢弃暂存写入，硬件和影子寄存器都保持进入帧之前的状态。
+
+    用法:
+        with OutputFrame() as frame:
+            light_pin.write(True)
+            amp_pin.write(False)
+        print(frame.transactions, frame.elapsed_s)
+    """
+
+    def __init__(self, batch: Optional["I2cBatch"] = None) -> None:
+        """创建输出帧。
+
+        参数:
+            batch: 可选的 `I2cBatch`；传入时提交不直接写总线，而是把写入追加到批量事务里，
+                由调用方 `batch.execute()` 与其它芯片的读写一起发出。嵌套帧以最外层的 batch 为准
+        """
+        self._batch = batch
+        self._pending: Dict[int, Tuple[TCA9555, Dict[int, int]]] = {}
+        self.devices = 0
+        self.transactions = 0
+        self.elapsed_s = 0.0
+
+    def __enter__(self) -> "OutputFrame":
+        stack = getattr(_frame_local, "stack", None)
+        if stack is None:
+            stack = _frame_local.stack = []
+        stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        stack = _frame_local.stack
+        stack.pop()
+        if stack:
+            return
+        if exc_type is not None:
+            self._pending.clear()
+            return
+        self.commit()
+
+    def _stage(self, device: TCA9555, register: int, value: int) -> None:
+        """暂存某片芯片某个寄存器对的目标值。"""
+        self._pending.setdefault(id(device), (device, {}))[1][register] = value
+
+    def _staged_value(self, device: TCA9555, register: int) -> Optional[int]:
+        """取暂存值，没有暂存时返回 None。"""
+        entry = self._pending.get(id(device))
+        if entry is None:
+            return None
+        return entry[1].get(register)
+
+    def commit(self) -> None:
+        """把暂存写入提交到各芯片，并记录本帧的芯片数、I2C 写事务数和耗时。
+
+        带 batch 的帧只把写入追加到批量事务，`transactions` 记为追加的消息条数。
+        """
+        started = time.monotonic()
+        transactions = 0
+        batch = self._batch
+        for device, registers in self._pending.values():
+            with device._lock:
+                before = device.write_transactions
+                queued = len(batch) if batch is not None else 0
+                for register in TCA9555_COMMIT_ORDER:
+                    if register in registers:
+                        if batch is not None:
+                            device._queue_register(batch, register, registers[register])
+                        else:
+                            device._commit_register(register, registers[register])
+                transactions += device.write_transactions - before
+                if batch is not None:
+                    transactions += len(batch) - queued
+        self.devices = len(self._pending)
+        self.transactions = transactions
+        self.elapsed_s = time.monotonic() - started
+        self._pending.clear()
+        logger.debug(
+            "Output frame committed: devices=%s transactions=%s elapsed=%.3f ms",
+            self.devices,
+            self.transactions,
+            self.elapsed_s * 1000.0,
+        )
+
+
+class TcaInputWatcher:
+    """基于 INT 引脚边沿事件的 TCA9555 输入变化通知。
+
+    TCA9555 的 INT 为开漏低有效输出，任一输入引脚电平与上次读取不同时拉低，读取输入寄存器后释放。
+    后台线程只在 INT 下降沿到来时读取一次输入寄存器，比较出变化的引脚，按引脚分发回调；
+    没有输入变化时不产生任何 I2C 传输。
+
+    用法:
+        watcher = TcaInputWatcher(io, GpiodEdgeSource(("/dev/gpiochip3", 7), edge="falling"))
+        watcher.watch(12, lambda pin, value, ts: print(pin, value, ts))
+        watcher.start()
+    """
+
+    def __init__(self, device: TCA9555, edge_source: "EdgeSource") -> None:
+        """创建输入监视器。
+
+        参数:
+            device: 已打开的 TCA9555 设备
+            edge_source: INT 引脚的边沿来源，需按下降沿申请
+        """
+        if device is None:
+            raise ValueError("device is required")
+        if edge_source is None:
+            raise ValueError("edge_source is required")
+        self._device = device
+        self._edge_source = edge_source
+        self._callbacks: Dict[int, List[Tuple[TCA9555_WatchEdge, TCA9555_InputCallback]]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._closed = False
+        self.last_word: Optional[int] = None
+        self.last_change_ns: Dict[int, int] = {}
+        self.edges = 0
+        self.reads = 0
+
+    def __enter__(self) -> "TcaInputWatcher":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def watch(self, pin: int, callback: TCA9555_InputCallback, edge: TCA9555_WatchEdge = "both") -> None:
+        """登记某个输入引脚的变化回调，同一引脚可登记多个。
+
+        参数:
+            pin: 引脚号 `0..15`，必须已配置为输入
+            callback: `callback(pin, value, timestamp_ns)`，在监视线程中调用，应尽快返回
+            edge: `"rising"`、`"falling"` 或 `"both"`，按引脚物理电平判断
+        """
+        if not isinstance(pin, int) or pin < 0 or pin > 15:
+            raise ValueError("pin must be an integer in range 0..15")
+        if not (self._device.config_state >> pin) & 1:
+            raise ValueError("pin %s is not configured as input" % pin)
+        if edge not in ("rising", "falling", "both"):
+            raise ValueError("edge must be 'rising', 'falling' or 'both'")
+        if not callable(callback):
+            raise TypeError("callback must be callable")
+        with self._lock:
+            self._callbacks.setdefault(pin, []).append((edge, callback))
+
+    def unwatch(self, pin: int) -> None:
+        """移除某个引脚的全部回调。"""
+        with self._lock:
+            self._callbacks.pop(pin, None)
+
+    def value(self, pin: int) -> Optional[bool]:
+        """返回最近一次读取到的引脚电平，不产生 I2C 传输；尚未读取过时返回 None。"""
+        if self.last_word is None:
+            return None
+        return bool((self.last_word >> pin) & 1)
+
+    @property
+    def is_running(self) -> bool:
+        """监视线程是否正在运行。"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """读取一次输入寄存器作为基准（同时释放 INT），然后启动监视线程。"""
+        if self._closed:
+            raise RuntimeError("TcaInputWatcher is closed")
+        if self.is_running:
+            return
+        self._edge_source.clear()
+        self.last_word = self._device.read_word(source="input")
+        self.reads += 1
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch_loop,
+            name="tca9555-int-0x%02X" % self._device.addr,
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _watch_loop(self) -> None:
+        """监视线程主体：等边沿 -> 读一次输入 -> 分发变化。"""
+        while not self._stop.is_set():
+            try:
+                timestamp_ns = self._edge_source.wait_edge(TCA9555_WATCH_WAIT_S)
+                if timestamp_ns is None:
+                    continue
+                self.edges += 1
+                word = self._device.read_word(source="input")
+                self.reads += 1
+                self._dispatch(word, timestamp_ns)
+            except Exception:
+                if self._stop.is_set():
+                    return
+                logger.exception("TCA9555 input watch failed on addr=0x%02X", self._device.addr)
+                self._stop.wait(TCA9555_WATCH_WAIT_S)
+
+    def _dispatch(self, word: int, timestamp_ns: int) -> None:
+        """比较新旧输入字，对变化的已登记引脚调用回调。"""
+        previous = self.last_word if self.last_word is not None else word
+        self.last_word = word
+        changed = previous ^ word
+        if not changed:
+            return
+        with self._lock:
+            targets = [(pin, list(entries)) for pin, entries in self._callbacks.items() if (changed >> pin) & 1]
+        for pin, entries in targets:
+            value = bool((word >> pin) & 1)
+            self.last_change_ns[pin] = timestamp_ns
+            for edge, callback in entries:
+                if edge == "rising" and not value:
+                    continue
+                if edge == "falling" and value:
+                    continue
+                try:
+                    callback(pin, value, timestamp_ns)
+                except Exception:
+                    logger.exception("TCA9555 input callback failed for pin %s", pin)
+
+    def stop(self) -> None:
+        """停止监视线程，重复调用安全。"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join()
+        self._thread = None
+
+    def close(self) -> None:
+        """停止监视线程并关闭边沿来源，不会关闭 TCA9555 设备。重复调用安全。"""
+        if self._closed:
+            return
+        self._closed = True
+        self.stop()
+        self._edge_source.close()
@@ -0,0 +1,238 @@
+"""经内核 gpio-pca953x 驱动访问 TCA9555 的后端。"""
+
+from __future__ import annotations
+
+import glob
+import logging
+import os
+import threading
+from typing import List, Optional
+
+import gpiod
+
+from lib.device_lock import DeviceLock
+from lib.TCA9555 import (
+    TCA9555,
+    TCA9555_REG_CONFIG_PORT0,
+    TCA9555_REG_INPUT_PORT0,
+    TCA9555_REG_OUTPUT_PORT0,
+    TCA9555_SCRUB_DEFAULT_INTERVAL_S,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+TCA9555_KERNEL_LINES = 16
+TCA9555_KERNEL_CONSUMER = "tca9555"
+
+
+def find_pca953x_chip(i2c_bus: int, addr: int) -> str:
+    """根据 I2C 总线号和地址找到 gpio-pca953x 驱动注册的 gpiochip 字符设备。
+
+    驱动绑定后 `/sys/bus/i2c/devices/<bus>-<addr>/` 下会出现 `gpiochipN` 目录，对应 `/dev/gpiochipN`。
+
+    返回:
+        str: 例如 `"/dev/gpiochip3"`
+    """
+    device_dir = "/sys/bus/i2c/devices/%d-%04x" % (i2c_bus, addr)
+    chips = sorted(glob.glob(os.path.join(device_dir, "gpiochip[0-9]*")))
+    if not chips:
+        raise FileNotFoundError(
+            "no gpiochip found for i2c device %d-%04x; is the gpio-pca953x driver bound?" % (i2c_bus, addr)
+        )
+    return "/dev/" + os.path.basename(chips[0])
+
+
+class KernelTCA9555(TCA9555):
+    """经内核 gpio-pca953x 驱动和 libgpiod 访问 TCA9555。
+
+    接口与 `TCA9555` 相同，可直接用于 `Tca9555Pin`、`OutputFrame`、`TcaInputWatcher`；
+    只替换寄存器读写这一层：输出寄存器对写入变成对全部输出 line 的一次 `set_values()` ioctl，
+    内核驱动负责寄存器缓存、I2C 加锁和总线访问，多个阀同时切换仍是一次调用。
+
+    与直接写寄存器的差异:
+        - 方向变化需要重新申请 line（一次 release + 一次 request），只在初始化和改方向时发生
+        - 内核驱动不开放极性寄存器，`set_polarity()` 在读取输入时由软件反相
+        - 打开时不回读输出寄存器，输出 line 一律以低电平申请；`init_hardware` 随后也会把全部输出置低
+        - 内核自己缓存寄存器，`scrub()` 不做回读，直接返回 0
+    """
+
+    def __init__(
+        self,
+        i2c_bus: int = 1,
+        addr: int = 0x20,
+        chip: Optional[str] = None,
+        consumer: str = TCA9555_KERNEL_CONSUMER,
+    ) -> None:
+        """打开扩展芯片对应的 gpiochip，并按内核当前的方向申请全部 16 条 line。
+
+        参数:
+            i2c_bus: I2C 总线号，仅用于查找 gpiochip 和日志
+            addr: 设备 I2C 地址，仅用于查找 gpiochip 和日志
+            chip: gpiochip 路径或名称，None 时按 `find_pca953x_chip()` 查找
+            consumer: libgpiod consumer 名称
+        """
+        if not isinstance(i2c_bus, int):
+            raise TypeError("i2c_bus must be an integer")
+        if i2c_bus < 0:
+            raise ValueError("i2c_bus must be >= 0")
+        if not isinstance(addr, int):
+            raise TypeError("addr must be an integer")
+        if addr < 0x03 or addr > 0x77:
+            raise ValueError("addr must be in range 0x03~0x77")
+        if not isinstance(consumer, str) or not consumer:
+            raise ValueError("consumer must be a non-empty string")
+
+        self.i2c_bus_num = i2c_bus
+        self.addr = addr
+        self.chip_path = chip if chip is not None else find_pca953x_chip(i2c_bus, addr)
+        self._consumer = consumer
+        self._owns_bus = True
+        self.bus = gpiod.Chip(self.chip_path)
+        self._closed = False
+        # 这里的事务计数是 gpiod ioctl 次数，与 `TCA9555` 的 I2C 事务计数同口径比较。
+        self.read_transactions = 0
+        self.write_transactions = 0
+        self._lock = DeviceLock("KernelTCA9555 %d-0x%02X" % (i2c_bus, addr))
+        self._scrub_thread: Optional[threading.Thread] = None
+        self._scrub_stop = threading.Event()
+        self.scrub_repairs = 0
+
+        num_lines = self.bus.num_lines()
+        if num_lines != TCA9555_KERNEL_LINES:
+            self.bus.close()
+            raise ValueError("%s has %s lines, expected %s" % (self.chip_path, num_lines, TCA9555_KERNEL_LINES))
+
+        config = 0
+        for offset in range(TCA9555_KERNEL_LINES):
+            if self.bus.get_line(offset).direction() == gpiod.Line.DIRECTION_INPUT:
+                config |= 1 << offset
+        self.config_state = config
+        self.output_state = 0
+        self.polarity_state = 0
+        self._output_offsets: List[int] = []
+        self._input_offsets: List[int] = []
+        self._output_lines = None
+        self._input_lines = None
+        self._request_lines()
+
+        logger.debug(
+            "KernelTCA9555 initialized on %s (bus=%s addr=0x%02X) config=0x%04X",
+            self.chip_path,
+            self.i2c_bus_num,
+            self.addr,
+            self.config_state,
+        )
+
+    def _release_lines(self) -> None:
+        """释放当前申请的输入/输出 line。"""
+        for lines in (self._output_lines, self._input_lines):
+            if lines is not None:
+                lines.release()
+        self._output_lines = None
+        self._input_lines = None
+
+    def _request_lines(self) -> None:
+        """按 `config_state` 把 line 分成输出和输入两组批量申请，输出初值取 `output_state`。"""
+        self._release_lines()
+        self._output_offsets = [pin for pin in range(TCA9555_KERNEL_LINES) if not self.config_state & (1 << pin)]
+        self._input_offsets = [pin for pin in range(TCA9555_KERNEL_LINES) if self.config_state & (1 << pin)]
+        if self._output_offsets:
+            self._output_lines = self.bus.get_lines(self._output_offsets)
+            self._output_lines.request(
+                consumer=self._consumer,
+                type=gpiod.LINE_REQ_DIR_OUT,
+                default_vals=[(self.output_state >> pin) & 1 for pin in self._output_offsets],
+            )
+        if self._input_offsets:
+            self._input_lines = self.bus.get_lines(self._input_offsets)
+            self._input_lines.request(consumer=self._consumer, type=gpiod.LINE_REQ_DIR_IN)
+
+    def _ensure_open(self) -> None:
+        """确保设备尚未关闭。"""
+        if self._closed or self.bus is None:
+            raise RuntimeError("KernelTCA9555 device is closed")
+
+    def _read_pins(self) -> int:
+        """读取全部 16 个引脚的物理电平，输出 line 读到的是引脚实际电平。"""
+        word = 0
+        for offsets, lines in ((self._output_offsets, self._output_lines), (self._input_offsets, self._input_lines)):
+            if lines is None:
+                continue
+            self.read_transactions += 1
+            for pin, value in zip(offsets, lines.get_values()):
+                if value:
+                    word |= 1 << pin
+        return word
+
+    def _read_register_pair(self, start_register: int) -> int:
+        """输入寄存器从 line 读取并按极性影子反相；其余寄存器由内核缓存，直接返回影子。"""
+        self._ensure_open()
+        if start_register == TCA9555_REG_INPUT_PORT0:
+            try:
+                return self._read_pins() ^ self.polarity_state
+            except Exception:
+                logger.exception("Failed to read %s line values", self.chip_path)
+                raise
+        return self._shadow(start_register)
+
+    def _read_byte(self, register: int) -> int:
+        """读取寄存器对中的一个字节。"""
+        word = self._read_register_pair(register & ~1)
+        return (word >> (8 * (register & 1))) & 0xFF
+
+    def _write_register_pair(self, start_register: int, value: int) -> None:
+        """输出寄存器对写成一次 `set_values()`；方向寄存器重新申请 line；极性只保留在影子里。"""
+        self._ensure_open()
+        value &= 0xFFFF
+        try:
+            if start_register == TCA9555_REG_OUTPUT_PORT0:
+                if self._output_lines is not None:
+                    self.write_transactions += 1
+                    self._output_lines.set_values([(value >> pin) & 1 for pin in self._output_offsets])
+            elif start_register == TCA9555_REG_CONFIG_PORT0:
+                self.write_transactions += 1
+                self.config_state = value
+                self._request_lines()
+        except Exception:
+            logger.exception("Failed to write %s register pair 0x%02X = 0x%04X", self.chip_path, start_register, value)
+            raise
+
+    def _write_byte(self, register: int, value: int) -> None:
+        """与影子中的另一半拼成完整的寄存器对后写入；内核侧没有单字节写入的区别。"""
+        base_register = register & ~1
+        current = self._shadow(base_register)
+        if register & 1:
+            word = (current & 0x00FF) | ((value & 0xFF) << 8)
+        else:
+            word = (current & 0xFF00) | (value & 0xFF)
+        self._write_register_pair(base_register, word)
+
+    def _queue_register(self, batch, register: int, new_value: int) -> None:
+        """gpiochip 不在 I2C 批量事务里，写入直接提交，批次中不追加消息。"""
+        self._commit_register(register, new_value)
+
+    def scrub(self) -> int:
+        """内核驱动自己缓存寄存器，这里不做回读修复。"""
+        return 0
+
+    def start_scrub(self, interval_s: float = TCA9555_SCRUB_DEFAULT_INTERVAL_S) -> None:
+        """内核后端不需要后台校验线程，调用被忽略。"""
+        logger.debug("KernelTCA9555 on %s ignores start_scrub()", self.chip_path)
+
+    def close(self) -> None:
+        """释放全部 line 并关闭 gpiochip，重复调用安全。"""
+        if self._closed:
+            return
+
+        try:
+            self._release_lines()
+            self.bus.close()
+        except Exception:
+            logger.exception("Failed to close %s", self.chip_path)
+            raise
+        finally:
+            self.bus = None
+            self._closed = True
+
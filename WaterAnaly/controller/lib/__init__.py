@@ -3,8 +3,22 @@
 from .ADS1115 import ADS1115
 from .MAX31865 import MAX31865
 from .SoftSPI import SoftSPI
-from .TCA9555 import TCA9555
-from .pins import Pin, GpiodPin, Tca9555Pin
+from .TCA9555 import OutputFrame, TCA9555, TcaInputWatcher
+from .TCA9555Kernel import KernelTCA9555, find_pca953x_chip
+from .device_lock import DeviceLock, LockOrderError, enable_lock_order_check, lock_contention_report, reset_lock_stats
+from .i2c_bus import (
+    BusOwner,
+    I2cBatch,
+    I2cBusRegistry,
+    OwnedBus,
+    PacedBus,
+    SharedBus,
+    bus_priority,
+    gpio_scl_recovery,
+    open_shared_bus,
+)
+from .i2c_raw import RawI2cBus
+from .pins import EdgeSource, GpiodEdgeSource, GpiodPin, Pin, Tca9555Pin
 from .pump import Pump
 from .stepper import Stepper
 
@@ -13,9 +27,30 @@ __all__ = [
     "MAX31865",
     "SoftSPI",
     "TCA9555",
+    "OutputFrame",
+    "TcaInputWatcher",
+    "KernelTCA9555",
+    "find_pca953x_chip",
+    "DeviceLock",
+    "LockOrderError",
+    "enable_lock_order_check",
+    "lock_contention_report",
+    "reset_lock_stats",
+    "PacedBus",
+    "I2cBusRegistry",
+    "SharedBus",
+    "open_shared_bus",
+    "BusOwner",
+    "OwnedBus",
+    "I2cBatch",
+    "RawI2cBus",
+    "bus_priority",
+    "gpio_scl_recovery",
     "Pin",
     "GpiodPin",
     "Tca9555Pin",
+    "EdgeSource",
+    "GpiodEdgeSource",
     "Stepper",
     "Pump",
 ]
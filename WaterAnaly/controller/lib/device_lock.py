@@ -0,0 +1,177 @@
+"""设备级可重入锁，附带等待时间统计和调试用的加锁顺序检查。"""
+
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Dict, List, Set
+
+
+class LockOrderError(RuntimeError):
+    """两把设备锁出现了相反的加锁顺序，继续执行可能死锁。"""
+
+
+@dataclass
+class LockStats:
+    """单把设备锁的获取与等待统计。"""
+
+    name: str
+    acquisitions: int = 0
+    contended: int = 0
+    total_wait_s: float = 0.0
+    max_wait_s: float = 0.0
+
+    @property
+    def mean_wait_s(self) -> float:
+        """发生等待的那些获取的平均等待时间（秒）。"""
+        if self.contended == 0:
+            return 0.0
+        return self.total_wait_s / self.contended
+
+    def reset(self) -> None:
+        """清零统计。"""
+        self.acquisitions = 0
+        self.contended = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+
+
+# 全部存活的设备锁，供 lock_contention_report() 汇总。
+_locks: "weakref.WeakSet[DeviceLock]" = weakref.WeakSet()
+# 每个线程当前持有的设备锁（按获取顺序，可重入时重复出现）。
+_held_local = threading.local()
+# 已观察到的加锁顺序：_order_edges[a] 包含 b 表示曾在持有 a 时获取 b。
+_order_edges: Dict[int, Set[int]] = {}
+_order_lock = threading.Lock()
+_order_check = False
+
+
+def enable_lock_order_check(enabled: bool = True) -> None:
+    """开启或关闭加锁顺序检查。开启后每次在持有其它设备锁时获取新锁都要查一次顺序图，只建议调试时使用。"""
+    global _order_check
+    _order_check = enabled
+    if not enabled:
+        with _order_lock:
+            _order_edges.clear()
+
+
+def _held() -> List["DeviceLock"]:
+    """当前线程持有的设备锁列表。"""
+    held = getattr(_held_local, "locks", None)
+    if held is None:
+        held = _held_local.locks = []
+    return held
+
+
+def _reaches(start: int, target: int) -> bool:
+    """顺序图中能否从 start 走到 target。调用方需持有 _order_lock。"""
+    stack = [start]
+    seen = set()
+    while stack:
+        node = stack.pop()
+        if node == target:
+            return True
+        if node in seen:
+            continue
+        seen.add(node)
+        stack.extend(_order_edges.get(node, ()))
+    return False
+
+
+def _check_order(held: List["DeviceLock"], lock: "DeviceLock") -> None:
+    """记录“持有 held 时获取 lock”的顺序；与已记录的顺序相反时抛出 LockOrderError。"""
+    key = id(lock)
+    with _order_lock:
+        for other in held:
+            other_key = id(other)
+            if other_key == key or key in _order_edges.get(other_key, ()):
+                continue
+            if _reaches(key, other_key):
+                raise LockOrderError(
+                    "lock order inversion: acquiring %s while holding %s, but %s was previously taken before %s"
+                    % (lock.name, other.name, lock.name, other.name)
+                )
+            _order_edges.setdefault(other_key, set()).add(key)
+
+
+class DeviceLock:
+    """一个物理设备的可重入锁，多线程共用同一驱动对象时保证多事务操作不被打断。
+
+    与 `threading.RLock` 用法相同；另外记录获取次数、发生等待的次数和等待时间，
+    开启 `enable_lock_order_check()` 后还会检查不同设备锁之间的加锁顺序是否一致。
+
+    用法:
+        lock = DeviceLock("ADS1115 1-0x48")
+        with lock:
+            ...
+        print(lock.stats.total_wait_s)
+    """
+
+    def __init__(self, name: str) -> None:
+        """参数:
+            name: 设备名称，用于统计报告和顺序错误信息
+        """
+        if not isinstance(name, str) or not name:
+            raise ValueError("name must be a non-empty string")
+        self.name = name
+        self.stats = LockStats(name)
+        self._lock = threading.RLock()
+        _locks.add(self)
+
+    def __repr__(self) -> str:
+        return "DeviceLock(%r)" % self.name
+
+    def __enter__(self) -> "DeviceLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        """获取锁，参数含义同 `threading.RLock.acquire()`；需要等待时计入等待统计。"""
+        held = _held()
+        if _order_check and held and self not in held:
+            _check_order(held, self)
+
+        waited_s = None
+        if not self._lock.acquire(blocking=False):
+            if not blocking:
+                return False
+            started = time.perf_counter()
+            if not self._lock.acquire(timeout=timeout):
+                return False
+            waited_s = time.perf_counter() - started
+
+        # 以下统计在持锁状态下更新，不需要额外加锁。
+        stats = self.stats
+        stats.acquisitions += 1
+        if waited_s is not None:
+            stats.contended += 1
+            stats.total_wait_s += waited_s
+            if waited_s > stats.max_wait_s:
+                stats.max_wait_s = waited_s
+        held.append(self)
+        return True
+
+    def release(self) -> None:
+        """释放一次锁。"""
+        held = _held()
+        for index in range(len(held) - 1, -1, -1):
+            if held[index] is self:
+                del held[index]
+                break
+        self._lock.release()
+
+
+def lock_contention_report() -> List[LockStats]:
+    """返回全部存活设备锁的统计，按等待总时间从大到小排列。"""
+    return sorted((lock.stats for lock in list(_locks)), key=lambda stats: stats.total_wait_s, reverse=True)
+
+
+def reset_lock_stats() -> None:
+    """清零全部设备锁的统计。"""
+    for lock in list(_locks):
+        lock.stats.reset()
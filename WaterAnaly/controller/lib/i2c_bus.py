@@ -0,0 +1,857 @@
+"""带节流、重试和总线恢复的 I2C 总线包装，以及按优先级串行执行事务的总线属主线程。"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import smbus2 as smbus
+except ImportError:  # pragma: no cover
+    import smbus  # type: ignore[no-redef]
+
+from lib.i2c_raw import RawI2cBus
+
+
+logger = logging.getLogger(__name__)
+
+
+I2C_DEFAULT_RETRIES = 3
+I2C_DEFAULT_BACKOFF_S = 0.001
+I2C_DEFAULT_BACKOFF_MAX_S = 0.05
+I2C_RECOVERY_CLOCKS = 9
+I2C_RECOVERY_HALF_PERIOD_S = 0.000005
+
+# 总线属主线程的请求优先级，数值越小越先执行。
+I2C_PRIORITY_SAFETY = 0  # 安全动作与阀门写入
+I2C_PRIORITY_LEVEL = 1  # 液位判定读数
+I2C_PRIORITY_TELEMETRY = 2  # 打印、监控类读数
+I2C_PRIORITIES = (I2C_PRIORITY_SAFETY, I2C_PRIORITY_LEVEL, I2C_PRIORITY_TELEMETRY)
+
+# 相邻的同一寄存器写入只保留最后一次（仅限 allow_write_coalescing() 登记过的寄存器）；相邻的相同读取只执行一次。
+_COALESCE_WRITES = frozenset(("write_byte_data", "write_i2c_block_data"))
+_COALESCE_READS = frozenset(("read_byte_data", "read_i2c_block_data"))
+
+# 每个线程通过 bus_priority() 临时指定的优先级。
+_priority_local = threading.local()
+
+# 内核 I2C_RDWR 单次调用允许的最大消息数（I2C_RDWR_IOCTL_MAX_MSGS）。
+I2C_RDWR_MAX_MSGS = 42
+
+# PacedBus 可选的底层传输。
+I2C_TRANSPORTS = ("smbus2", "raw")
+
+
+class TokenBucket:
+    """按设备限速的令牌桶：平均每秒 `rate_hz` 次事务，最多连续 `burst` 次不等待。"""
+
+    def __init__(self, rate_hz: float, burst: int = 1) -> None:
+        if not isinstance(rate_hz, (int, float)) or rate_hz <= 0:
+            raise ValueError("rate_hz must be > 0")
+        if not isinstance(burst, int) or burst < 1:
+            raise ValueError("burst must be a positive integer")
+        self.rate_hz = float(rate_hz)
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate_hz)
+        self._updated = now
+
+    def delay(self, now: float) -> float:
+        """返回拿到下一个令牌还需等待的秒数，令牌充足时为 0。"""
+        self._refill(now)
+        if self._tokens >= 1.0:
+            return 0.0
+        return (1.0 - self._tokens) / self.rate_hz
+
+    def consume(self, now: float) -> None:
+        """消耗一个令牌。"""
+        self._refill(now)
+        self._tokens -= 1.0
+
+
+@dataclass
+class BusStats:
+    """总线事务统计。"""
+
+    transactions: int = 0
+    retries: int = 0
+    failures: int = 0
+    recoveries: int = 0
+    paced: int = 0
+    paced_s: float = 0.0
+    total_latency_s: float = 0.0
+    max_latency_s: float = 0.0
+
+    @property
+    def mean_latency_s(self) -> float:
+        """成功事务的平均耗时（秒）。"""
+        if self.transactions == 0:
+            return 0.0
+        return self.total_latency_s / self.transactions
+
+    def reset(self) -> None:
+        """清零全部统计。"""
+        self.transactions = 0
+        self.retries = 0
+        self.failures = 0
+        self.recoveries = 0
+        self.paced = 0
+        self.paced_s = 0.0
+        self.total_latency_s = 0.0
+        self.max_latency_s = 0.0
+
+
+class PacedBus:
+    """SMBus 兼容的 I2C 总线包装，可直接注入 `ADS1115` / `TCA9555`。
+
+    每次事务前按需等待：距上一次事务结束不少于 `min_gap_s`，且目标地址的令牌桶有令牌；
+    不需要等待时直接发出，不再固定延时。事务抛出 `OSError`（NAK、超时等）时按指数退避重试，
+    第二次失败起先调用恢复钩子（例如 `gpio_scl_recovery()` 返回的函数）再重试，
+    超过 `retries` 次仍失败才把异常抛给调用方。同一总线上的事务由内部锁串行化。
+    """
+
+    def __init__(
+        self,
+        i2c_bus: int,
+        *,
+        min_gap_s: float = 0.0,
+        rates: Optional[Dict[int, Tuple[float, int]]] = None,
+        retries: int = I2C_DEFAULT_RETRIES,
+        backoff_s: float = I2C_DEFAULT_BACKOFF_S,
+        backoff_max_s: float = I2C_DEFAULT_BACKOFF_MAX_S,
+        recovery: Optional[Callable[[], None]] = None,
+        transport: str = "smbus2",
+    ) -> None:
+        """打开 I2C 总线。
+
+        参数:
+            i2c_bus: I2C 总线号
+            min_gap_s: 相邻两次事务之间的最小间隔（秒）
+            rates: `{地址: (每秒事务数, 突发数)}`，未列出的地址不限速
+            retries: 单次事务失败后的最大重试次数
+            backoff_s: 首次重试前的等待时间，之后每次翻倍
+            backoff_max_s: 单次退避的上限
+            recovery: 总线恢复钩子，连续失败时调用
+            transport: 底层传输，`"smbus2"` 使用 smbus2，`"raw"` 使用直接操作文件描述符的 `RawI2cBus`
+        """
+        if not isinstance(i2c_bus, int) or i2c_bus < 0:
+            raise ValueError("i2c_bus must be a non-negative integer")
+        if min_gap_s < 0:
+            raise ValueError("min_gap_s must be >= 0")
+        if not isinstance(retries, int) or retries < 0:
+            raise ValueError("retries must be a non-negative integer")
+        if backoff_s < 0 or backoff_max_s < 0:
+            raise ValueError("backoff must be >= 0")
+        if transport not in I2C_TRANSPORTS:
+            raise ValueError("transport must be 'smbus2' or 'raw'")
+
+        self.i2c_bus_num = i2c_bus
+        self.min_gap_s = float(min_gap_s)
+        self.retries = retries
+        self.backoff_s = float(backoff_s)
+        self.backoff_max_s = float(backoff_max_s)
+        self.recovery = recovery
+        self.stats = BusStats()
+        self._buckets: Dict[int, TokenBucket] = {}
+        for addr, (rate_hz, burst) in (rates or {}).items():
+            self.set_rate(addr, rate_hz, burst)
+        self._lock = threading.RLock()
+        self._last_end = 0.0
+        self.transport = transport
+        self._bus = RawI2cBus(i2c_bus) if transport == "raw" else smbus.SMBus(i2c_bus)
+        self._closed = False
+
+    def __enter__(self) -> "PacedBus":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def set_rate(self, addr: int, rate_hz: float, burst: int = 1) -> None:
+        """设置某个地址的令牌桶限速。"""
+        self._buckets[addr] = TokenBucket(rate_hz, burst)
+
+    def _pace(self, addrs: Tuple[int, ...]) -> None:
+        """按最小间隔和令牌桶等待到允许发出事务；涉及多个地址时等到每个地址都有令牌，再各扣一个。"""
+        now = time.monotonic()
+        wait_s = self._last_end + self.min_gap_s - now
+        buckets = [self._buckets[addr] for addr in addrs if addr in self._buckets]
+        for bucket in buckets:
+            wait_s = max(wait_s, bucket.delay(now))
+        if wait_s > 0:
+            time.sleep(wait_s)
+            self.stats.paced += 1
+            self.stats.paced_s += wait_s
+        now = time.monotonic()
+        for bucket in buckets:
+            bucket.consume(now)
+
+    def _transact(
+        self,
+        addr: int,
+        operation: Callable[..., Any],
+        *args: Any,
+        paced_addrs: Optional[Tuple[int, ...]] = None,
+    ) -> Any:
+        """执行一次带节流和重试的事务；`paced_addrs` 为需要扣令牌的地址，默认只有 `addr`。"""
+        if paced_addrs is None:
+            paced_addrs = (addr,)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("I2C bus is closed")
+            attempt = 0
+            while True:
+                self._pace(paced_addrs)
+                started = time.monotonic()
+                try:
+                    result = operation(*args)
+                except OSError as exc:
+                    self._last_end = time.monotonic()
+                    if attempt >= self.retries:
+                        self.stats.failures += 1
+                        logger.error(
+                            "I2C transaction to 0x%02X on bus %s failed after %s retries: %s",
+                            addr,
+                            self.i2c_bus_num,
+                            attempt,
+                            exc,
+                        )
+                        raise
+                    attempt += 1
+                    self.stats.retries += 1
+                    logger.warning(
+                        "I2C transaction to 0x%02X on bus %s failed (%s), retry %s/%s",
+                        addr,
+                        self.i2c_bus_num,
+                        exc,
+                        attempt,
+                        self.retries,
+                    )
+                    if attempt >= 2:
+                        self.recover()
+                    time.sleep(min(self.backoff_s * (2 ** (attempt - 1)), self.backoff_max_s))
+                    continue
+
+                self._last_end = time.monotonic()
+                latency_s = self._last_end - started
+                self.stats.transactions += 1
+                self.stats.total_latency_s += latency_s
+                if latency_s > self.stats.max_latency_s:
+                    self.stats.max_latency_s = latency_s
+                return result
+
+    def recover(self) -> None:
+        """调用总线恢复钩子；没有配置钩子时什么也不做。钩子自身的异常只记录日志。"""
+        if self.recovery is None:
+            return
+        self.stats.recoveries += 1
+        try:
+            self.recovery()
+            logger.warning("I2C bus %s recovery sequence issued", self.i2c_bus_num)
+        except Exception:
+            logger.exception("I2C bus %s recovery failed", self.i2c_bus_num)
+
+    def read_byte(self, addr: int) -> int:
+        return self._transact(addr, self._bus.read_byte, addr)
+
+    def write_byte(self, addr: int, value: int) -> None:
+        self._transact(addr, self._bus.write_byte, addr, value)
+
+    def read_byte_data(self, addr: int, register: int) -> int:
+        return self._transact(addr, self._bus.read_byte_data, addr, register)
+
+    def write_byte_data(self, addr: int, register: int, value: int) -> None:
+        self._transact(addr, self._bus.write_byte_data, addr, register, value)
+
+    def read_i2c_block_data(self, addr: int, register: int, length: int) -> list:
+        return self._transact(addr, self._bus.read_i2c_block_data, addr, register, length)
+
+    def write_i2c_block_data(self, addr: int, register: int, data: list) -> None:
+        self._transact(addr, self._bus.write_i2c_block_data, addr, register, data)
+
+    def i2c_rdwr(self, *messages: Any) -> None:
+        """组合事务，消息涉及的每个地址都扣一个令牌后再发出。"""
+        if not messages:
+            raise ValueError("at least one i2c_msg is required")
+        addrs = tuple(dict.fromkeys(message.addr for message in messages))
+        self._transact(messages[0].addr, self._bus.i2c_rdwr, *messages, paced_addrs=addrs)
+
+    def close(self) -> None:
+        """关闭底层总线句柄，重复调用安全。"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            try:
+                self._bus.close()
+            finally:
+                self._bus = None
+
+
+# 共享句柄上直接绑定到底层总线的事务方法。
+_SHARED_BUS_METHODS = (
+    "read_byte",
+    "write_byte",
+    "read_byte_data",
+    "write_byte_data",
+    "read_i2c_block_data",
+    "write_i2c_block_data",
+    "i2c_rdwr",
+)
+
+
+class SharedBus:
+    """`I2cBusRegistry` 发出的共享总线句柄，SMBus 兼容，可直接注入设备。
+
+    事务方法直接绑定到同一总线号唯一的底层总线对象，调用不经过转发；其余属性（`stats`、`set_rate()` 等）
+    透传给底层总线。`close()` 只释放本句柄持有的一次引用，最后一个句柄关闭时才关闭底层总线。
+    """
+
+    def __init__(self, registry: "I2cBusRegistry", i2c_bus: int, bus: Any) -> None:
+        self._registry = registry
+        self.i2c_bus_num = i2c_bus
+        self.bus = bus
+        self._closed = False
+        for name in _SHARED_BUS_METHODS:
+            method = getattr(bus, name, None)
+            if method is not None:
+                setattr(self, name, method)
+
+    def __getattr__(self, name: str) -> Any:
+        bus = self.__dict__.get("bus")
+        if bus is None:
+            raise AttributeError(name)
+        return getattr(bus, name)
+
+    def __enter__(self) -> "SharedBus":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """释放本句柄的引用，重复调用安全。"""
+        if self._closed:
+            return
+        self._closed = True
+        self._registry._release(self.i2c_bus_num)
+
+
+@dataclass
+class _SharedEntry:
+    """注册表中一条总线的底层对象、引用数和首次打开时的参数。"""
+
+    bus: Any
+    refs: int
+    options: Dict[str, Any]
+
+
+class I2cBusRegistry:
+    """按总线号共享 I2C 总线：同一总线号只打开一个底层总线对象（默认 `PacedBus`），按引用计数关闭。
+
+    同一总线上的设备因此共用一个文件描述符和一把事务锁，节流、重试、统计等总线级功能也只挂在这一个对象上。
+    """
+
+    def __init__(self, factory: Callable[..., Any] = PacedBus) -> None:
+        """参数:
+            factory: `factory(i2c_bus, **options)` 创建底层总线对象，默认 `PacedBus`
+        """
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._entries: Dict[int, _SharedEntry] = {}
+
+    def open(self, i2c_bus: int, **options: Any) -> SharedBus:
+        """取得总线句柄，引用数加一；总线尚未打开时用 `options` 创建。
+
+        总线已打开时沿用首次打开的参数，`options` 与之不同只记录警告。
+        """
+        with self._lock:
+            entry = self._entries.get(i2c_bus)
+            if entry is None:
+                entry = _SharedEntry(self._factory(i2c_bus, **options), 0, dict(options))
+                self._entries[i2c_bus] = entry
+                logger.debug("I2C bus %s opened for sharing", i2c_bus)
+            elif options and options != entry.options:
+                logger.warning("I2C bus %s is already open, ignoring options %s", i2c_bus, options)
+            entry.refs += 1
+            return SharedBus(self, i2c_bus, entry.bus)
+
+    def refcount(self, i2c_bus: int) -> int:
+        """当前持有该总线的句柄数，未打开时为 0。"""
+        with self._lock:
+            entry = self._entries.get(i2c_bus)
+            return 0 if entry is None else entry.refs
+
+    def _release(self, i2c_bus: int) -> None:
+        """引用数减一，归零时从注册表移除并关闭底层总线。"""
+        with self._lock:
+            entry = self._entries.get(i2c_bus)
+            if entry is None:
+                return
+            entry.refs -= 1
+            if entry.refs > 0:
+                return
+            del self._entries[i2c_bus]
+        entry.bus.close()
+        logger.debug("I2C bus %s closed, no handles left", i2c_bus)
+
+
+# 进程内默认的总线注册表，驱动未注入 `bus=` 时从这里取句柄。
+I2C_BUS_REGISTRY = I2cBusRegistry()
+
+
+def open_shared_bus(i2c_bus: int, **options: Any) -> SharedBus:
+    """从默认注册表取得共享总线句柄，参数见 `I2cBusRegistry.open()`。"""
+    return I2C_BUS_REGISTRY.open(i2c_bus, **options)
+
+
+def gpio_scl_recovery(
+    scl: Tuple[str, int],
+    sda: Optional[Tuple[str, int]] = None,
+    *,
+    clocks: int = I2C_RECOVERY_CLOCKS,
+    half_period_s: float = I2C_RECOVERY_HALF_PERIOD_S,
+    consumer: str = "i2c_recovery",
+) -> Callable[[], None]:
+    """生成标准 I2C 总线恢复钩子：在 SCL 上打出 9 个时钟让卡住的从机释放 SDA，再补一个 STOP。
+
+    SCL/SDA 必须能以 GPIO 方式申请（例如 i2c-gpio 总线，或引脚复用允许 GPIO 访问）；
+    申请失败时钩子抛出异常，由 `PacedBus.recover()` 记录日志后继续重试。
+
+    参数:
+        scl: SCL 引脚 `(chip, line)`
+        sda: SDA 引脚 `(chip, line)`，提供时在时钟之后生成 STOP 条件
+        clocks: 时钟个数
+        half_period_s: 时钟半周期（秒）
+        consumer: libgpiod consumer 名称
+    """
+    from lib.pins import GpiodPin
+
+    def recover() -> None:
+        scl_pin = GpiodPin(scl, consumer=consumer, default_value=True)
+        sda_pin = GpiodPin(sda, consumer=consumer, mode="input") if sda is not None else None
+        try:
+            for _ in range(clocks):
+                scl_pin.write(False)
+                time.sleep(half_period_s)
+                scl_pin.write(True)
+                time.sleep(half_period_s)
+            if sda_pin is not None:
+                # STOP：SCL 为高时 SDA 由低变高。
+                sda_pin.set_mode("output", default_value=False)
+                scl_pin.write(False)
+                time.sleep(half_period_s)
+                scl_pin.write(True)
+                time.sleep(half_period_s)
+                sda_pin.write(True)
+                time.sleep(half_period_s)
+        finally:
+            scl_pin.close()
+            if sda_pin is not None:
+                sda_pin.close()
+
+    return recover
+
+
+class BatchRead:
+    """批量事务中的一次寄存器读取，`execute()` 成功后可取 `data`。"""
+
+    __slots__ = ("addr", "register", "length", "data")
+
+    def __init__(self, addr: int, register: int, length: int) -> None:
+        self.addr = addr
+        self.register = register
+        self.length = length
+        self.data: Optional[List[int]] = None
+
+
+class I2cBatch:
+    """跨设备的批量 I2C 事务：收集多片芯片的寄存器写入和读取，用一次 `i2c_rdwr` 发出。
+
+    每个写入是一条 `[寄存器, 数据...]` 消息，每个读取是一条寄存器指针写入加一条读消息，
+    消息之间是重复起始条件，整批只产生一次内核调用（超过 `I2C_RDWR_MAX_MSGS` 条时分成多次）。
+    驱动的影子状态通过 `on_done()` 登记的回调在对应写入发出后更新；驱动入批时用 `hold()` 拿住自己的设备锁，
+    一直持有到执行结束：入批时按影子算出的写入值在发出前不会被其它线程改动，后台校验线程也不会在
+    “硬件已写、影子未更新”的间隙里回读。入批和执行必须在同一线程；不执行的批次用 `discard()` 或 `with` 释放锁。
+    需要 `smbus2`。
+
+    用法:
+        with I2cBatch() as batch:
+            batch.write(0x20, 0x02, [0x01, 0x00])
+            conversion = batch.read(0x48, 0x00, 2)
+            batch.execute(bus)
+        print(conversion.data)
+    """
+
+    def __init__(self) -> None:
+        self._operations: List[Tuple[int, int, Optional[List[int]], Optional[BatchRead]]] = []
+        # (登记时的操作数, 回调)：前这么多个操作全部发出后才执行。
+        self._callbacks: List[Tuple[int, Callable[[], None]]] = []
+        # 已获取的设备锁，按获取顺序记录，执行结束或丢弃时逆序释放。
+        self._locks: Dict[int, Any] = {}
+        # 驱动按自己的键记录已入批、尚未生效的寄存器值，同一批里多次修改同一寄存器时据此计算差异。
+        self._pending: Dict[Any, int] = {}
+        self.calls = 0
+
+    def __enter__(self) -> "I2cBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.discard()
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    @property
+    def message_count(self) -> int:
+        """整批的 I2C 消息数。"""
+        return sum(1 if read is None else 2 for _, _, _, read in self._operations)
+
+    def write(self, addr: int, register: int, data: List[int]) -> None:
+        """追加一次寄存器写入。"""
+        self._operations.append((addr, register, [value & 0xFF for value in data], None))
+
+    def read(self, addr: int, register: int, length: int) -> BatchRead:
+        """追加一次寄存器读取，返回结果占位对象。"""
+        if not isinstance(length, int) or length <= 0:
+            raise ValueError("length must be a positive integer")
+        read = BatchRead(addr, register, length)
+        self._operations.append((addr, register, None, read))
+        return read
+
+    def pending(self, key: Any, default: int) -> int:
+        """取本批中某个寄存器已入批的值，没有时返回 `default`（通常是驱动的影子值）。"""
+        return self._pending.get(key, default)
+
+    def set_pending(self, key: Any, value: int) -> None:
+        """记录本批中某个寄存器已入批的值。"""
+        self._pending[key] = value
+
+    def hold(self, lock: Any) -> None:
+        """立即获取设备锁并持有到 `execute()` 或 `discard()` 结束，同一把锁只获取一次。
+
+        多片芯片的锁按入批顺序获取，调用方应按地址从小到大入批，与其它同时持有多把锁的代码保持一致。
+        """
+        if id(lock) in self._locks:
+            return
+        lock.acquire()
+        self._locks[id(lock)] = lock
+
+    def _release_locks(self) -> None:
+        """逆序释放本批获取的设备锁。"""
+        locks = list(self._locks.values())
+        self._locks = {}
+        for lock in reversed(locks):
+            lock.release()
+
+    def discard(self) -> None:
+        """丢弃尚未执行的操作和回调，释放已获取的设备锁；重复调用安全。"""
+        self._operations = []
+        self._callbacks = []
+        self._pending = {}
+        self._release_locks()
+
+    def on_done(self, callback: Callable[[], None]) -> None:
+        """登记回调，覆盖此前追加的全部操作：这些操作所在的调用都成功后执行，按登记顺序执行。"""
+        self._callbacks.append((len(self._operations), callback))
+
+    def execute(self, bus: Any) -> None:
+        """通过 `bus.i2c_rdwr` 发出整批事务；空批次只执行回调。执行后批次清空，可继续复用。
+
+        分成多次调用时某次调用失败，已成功发出的操作对应的回调照常执行（影子与硬件一致），其余回调丢弃，
+        然后重新抛出异常。
+        """
+        from smbus2 import i2c_msg
+
+        messages = []
+        reads = []
+        # message_ops[i]：前 i 条消息发出后，已完整发出的操作数。
+        message_ops = [0]
+        for count, (addr, register, data, read) in enumerate(self._operations, 1):
+            if read is None:
+                messages.append(i2c_msg.write(addr, [register] + data))
+            else:
+                messages.append(i2c_msg.write(addr, [register]))
+                message_ops.append(count - 1)
+                message = i2c_msg.read(addr, read.length)
+                messages.append(message)
+                reads.append((read, message))
+            message_ops.append(count)
+
+        callbacks = self._callbacks
+        self._operations = []
+        self._callbacks = []
+        self._pending = {}
+
+        sent = 0
+        try:
+            start = 0
+            while start < len(messages):
+                end = min(len(messages), start + I2C_RDWR_MAX_MSGS)
+                # 读取的指针写入和读消息必须在同一次调用里。
+                if end < len(messages) and messages[end - 1].flags == 0 and messages[end].flags != 0:
+                    end -= 1
+                bus.i2c_rdwr(*messages[start:end])
+                self.calls += 1
+                sent = message_ops[end]
+                start = end
+            for read, message in reads:
+                read.data = list(message)
+        finally:
+            try:
+                for covered, callback in callbacks:
+                    if covered <= sent:
+                        callback()
+            finally:
+                self._release_locks()
+
+
+@contextmanager
+def bus_priority(priority: int) -> Iterator[None]:
+    """在当前线程内临时指定 I2C 请求优先级，覆盖 `OwnedBus` 的默认优先级，可嵌套。
+
+    用法:
+        with bus_priority(I2C_PRIORITY_TELEMETRY):
+            optics.read_upper_mv()
+    """
+    if priority not in I2C_PRIORITIES:
+        raise ValueError("priority must be one of %s" % (I2C_PRIORITIES,))
+    previous = getattr(_priority_local, "priority", None)
+    _priority_local.priority = priority
+    try:
+        yield
+    finally:
+        _priority_local.priority = previous
+
+
+@dataclass
+class PriorityStats:
+    """某个优先级的排队统计。"""
+
+    requests: int = 0
+    coalesced: int = 0
+    total_wait_s: float = 0.0
+    max_wait_s: float = 0.0
+
+    @property
+    def mean_wait_s(self) -> float:
+        """平均排队时间（秒）。"""
+        if self.requests == 0:
+            return 0.0
+        return self.total_wait_s / self.requests
+
+
+class _BusRequest:
+    """一次排队中的总线事务。"""
+
+    __slots__ = ("priority", "seq", "addr", "method", "args", "future", "enqueued", "thread")
+
+    def __init__(self, priority: int, seq: int, addr: int, method: str, args: Tuple[Any, ...]) -> None:
+        self.priority = priority
+        self.seq = seq
+        self.addr = addr
+        self.method = method
+        self.args = args
+        self.future: Future = Future()
+        self.enqueued = time.monotonic()
+        self.thread = threading.get_ident()
+
+    def coalesce_key(self) -> Optional[Tuple[Any, ...]]:
+        """可合并请求的比较键：写入按 (方法, 地址, 寄存器, 长度)，读取按完整参数；其余请求返回 None。"""
+        if self.method in _COALESCE_WRITES:
+            length = len(self.args[2]) if self.method == "write_i2c_block_data" else 1
+            return ("w", self.method, self.args[0], self.args[1], length)
+        if self.method in _COALESCE_READS:
+            return ("r", self.method) + tuple(self.args)
+        return None
+
+
+class BusOwner:
+    """总线属主：同一条 I2C 总线上的全部事务由一个后台线程按优先级串行执行。
+
+    各线程通过 `client()` 得到的 `OwnedBus` 提交请求并等待 `Future`；队列按优先级、再按提交顺序出队，
+    出队时把同一优先级下排队的同一设备请求一并取出连续执行，相邻的相同读取只执行一次并共享结果。
+    写入默认逐条执行：很多寄存器写入本身就是动作（例如 ADS1115 写 OS=1 的配置即启动转换）。
+    只有 `allow_write_coalescing()` 登记过的纯状态寄存器，相邻且来自不同线程的同一寄存器写入才只保留最后一次；
+    同一线程的连续写入（例如先断后通的中间字）总是全部执行。属主线程只在空闲时退出，`close()` 会先执行完已排队的请求。
+    """
+
+    def __init__(self, bus: Any, *, name: str = "i2c-owner") -> None:
+        """启动属主线程。
+
+        参数:
+            bus: 实际执行事务的 SMBus 兼容对象（通常为 `PacedBus`），属主不负责关闭它
+            name: 线程名
+        """
+        if bus is None:
+            raise ValueError("bus is required")
+        self._bus = bus
+        self._queue: List[Tuple[int, int, _BusRequest]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._coalesce_writes: Set[Tuple[int, int]] = set()
+        self.stats: Dict[int, PriorityStats] = {priority: PriorityStats() for priority in I2C_PRIORITIES}
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def allow_write_coalescing(self, addr: int, registers: Iterable[int]) -> None:
+        """允许合并对 `addr` 上这些寄存器的相邻写入；只应登记写入没有副作用、后写完全覆盖前写的寄存器。"""
+        for register in registers:
+            self._coalesce_writes.add((addr, register))
+
+    def _superseded(self, request: _BusRequest, following: Optional[_BusRequest]) -> bool:
+        """request 是否会被紧随其后、来自其它线程的同一寄存器写入完全覆盖。"""
+        if following is None or request.method not in _COALESCE_WRITES:
+            return False
+        if (request.args[0], request.args[1]) not in self._coalesce_writes:
+            return False
+        return following.thread != request.thread and following.coalesce_key() == request.coalesce_key()
+
+    def client(self, priority: int = I2C_PRIORITY_LEVEL) -> "OwnedBus":
+        """返回以 `priority` 为默认优先级的 SMBus 兼容代理。"""
+        return OwnedBus(self, priority)
+
+    def submit(self, priority: int, addr: int, method: str, *args: Any) -> Future:
+        """提交一次事务，返回 `Future`；在属主线程内调用时直接执行（例如恢复钩子里再访问总线）。"""
+        if priority not in I2C_PRIORITIES:
+            raise ValueError("priority must be one of %s" % (I2C_PRIORITIES,))
+        request = _BusRequest(priority, next(self._seq), addr, method, args)
+        if threading.current_thread() is self._thread:
+            self._execute([request])
+            return request.future
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("I2C bus owner is closed")
+            heapq.heappush(self._queue, (priority, request.seq, request))
+            self._cond.notify()
+        return request.future
+
+    def _take_batch(self) -> List[_BusRequest]:
+        """取出队首请求，以及同一优先级下排队的同一设备请求（保持提交顺序）。"""
+        _, _, first = heapq.heappop(self._queue)
+        batch = [first]
+        remaining = []
+        for entry in self._queue:
+            request = entry[2]
+            if request.addr == first.addr and request.priority == first.priority:
+                batch.append(request)
+            else:
+                remaining.append(entry)
+        if len(batch) > 1:
+            heapq.heapify(remaining)
+            self._queue = remaining
+            batch[1:] = sorted(batch[1:], key=lambda request: request.seq)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                batch = self._take_batch()
+            self._execute(batch)
+
+    def _execute(self, batch: List[_BusRequest]) -> None:
+        """连续执行一批同设备请求，合并相邻的重复写入和重复读取。"""
+        started = time.monotonic()
+        shared: Optional[Tuple[Tuple[Any, ...], Any]] = None
+        for index, request in enumerate(batch):
+            stats = self.stats[request.priority]
+            wait_s = started - request.enqueued
+            stats.requests += 1
+            stats.total_wait_s += wait_s
+            if wait_s > stats.max_wait_s:
+                stats.max_wait_s = wait_s
+
+            key = request.coalesce_key()
+            following = batch[index + 1] if index + 1 < len(batch) else None
+            if self._superseded(request, following):
+                # 紧跟着其它线程对同一状态寄存器的写入，这一次的值会被覆盖，直接跳过。
+                stats.coalesced += 1
+                request.future.set_result(None)
+                shared = None
+                continue
+            if key is not None and shared is not None and shared[0] == key:
+                stats.coalesced += 1
+                request.future.set_result(list(shared[1]) if isinstance(shared[1], list) else shared[1])
+                continue
+
+            try:
+                result = getattr(self._bus, request.method)(*request.args)
+            except BaseException as exc:
+                request.future.set_exception(exc)
+                shared = None
+                continue
+            request.future.set_result(result)
+            shared = (key, result) if key is not None and key[0] == "r" else None
+
+    def close(self) -> None:
+        """执行完已排队的请求后停止属主线程，重复调用安全；不关闭底层总线。"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+
+class OwnedBus:
+    """`BusOwner` 的 SMBus 兼容代理，可通过 `bus=` 注入 `ADS1115` / `TCA9555`。
+
+    每次调用提交到属主线程并阻塞等待结果；优先级取当前线程 `bus_priority()` 指定的值，
+    没有指定时取构造时的默认优先级。`close()` 不做任何事，属主和底层总线由创建者关闭。
+    """
+
+    def __init__(self, owner: BusOwner, priority: int = I2C_PRIORITY_LEVEL) -> None:
+        if priority not in I2C_PRIORITIES:
+            raise ValueError("priority must be one of %s" % (I2C_PRIORITIES,))
+        self._owner = owner
+        self.priority = priority
+
+    def _priority(self) -> int:
+        priority = getattr(_priority_local, "priority", None)
+        return self.priority if priority is None else priority
+
+    def _call(self, addr: int, method: str, *args: Any) -> Any:
+        return self._owner.submit(self._priority(), addr, method, addr, *args).result()
+
+    def read_byte(self, addr: int) -> int:
+        return self._call(addr, "read_byte")
+
+    def write_byte(self, addr: int, value: int) -> None:
+        self._call(addr, "write_byte", value)
+
+    def read_byte_data(self, addr: int, register: int) -> int:
+        return self._call(addr, "read_byte_data", register)
+
+    def write_byte_data(self, addr: int, register: int, value: int) -> None:
+        self._call(addr, "write_byte_data", register, value)
+
+    def read_i2c_block_data(self, addr: int, register: int, length: int) -> list:
+        return self._call(addr, "read_i2c_block_data", register, length)
+
+    def write_i2c_block_data(self, addr: int, register: int, data: list) -> None:
+        self._call(addr, "write_i2c_block_data", register, list(data))
+
+    def i2c_rdwr(self, *messages: Any) -> None:
+        """组合事务，按第一条消息的地址排队。"""
+        if not messages:
+            raise ValueError("at least one i2c_msg is required")
+        self._owner.submit(self._priority(), messages[0].addr, "i2c_rdwr", *messages).result()
+
+    def close(self) -> None:
+        """代理不持有总线资源。"""
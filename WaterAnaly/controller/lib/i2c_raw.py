@@ -0,0 +1,241 @@
+"""直接操作 /dev/i2c-N 文件描述符的轻量 I2C 传输层。"""
+
+from __future__ import annotations
+
+import ctypes
+import fcntl
+import io
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+# linux/i2c-dev.h、linux/i2c.h 中的常量。
+I2C_SLAVE = 0x0703
+I2C_FUNCS = 0x0705
+I2C_RDWR = 0x0707
+I2C_SMBUS = 0x0720
+I2C_FUNC_I2C = 0x00000001
+I2C_M_RD = 0x0001
+I2C_SMBUS_WRITE = 0
+I2C_SMBUS_READ = 1
+I2C_SMBUS_BYTE = 1
+I2C_SMBUS_BYTE_DATA = 2
+I2C_SMBUS_I2C_BLOCK_DATA = 8
+I2C_SMBUS_BLOCK_MAX = 32
+
+
+class _I2cMsg(ctypes.Structure):
+    """struct i2c_msg。"""
+
+    _fields_ = [
+        ("addr", ctypes.c_uint16),
+        ("flags", ctypes.c_uint16),
+        ("len", ctypes.c_uint16),
+        ("buf", ctypes.POINTER(ctypes.c_uint8)),
+    ]
+
+
+class _I2cRdwrData(ctypes.Structure):
+    """struct i2c_rdwr_ioctl_data。"""
+
+    _fields_ = [
+        ("msgs", ctypes.POINTER(_I2cMsg)),
+        ("nmsgs", ctypes.c_uint32),
+    ]
+
+
+class _I2cSmbusData(ctypes.Structure):
+    """struct i2c_smbus_ioctl_data。"""
+
+    _fields_ = [
+        ("read_write", ctypes.c_uint8),
+        ("command", ctypes.c_uint8),
+        ("size", ctypes.c_uint32),
+        ("data", ctypes.POINTER(ctypes.c_uint8)),
+    ]
+
+
+class _RegisterRead:
+    """一次“写寄存器指针 + 重复起始读取”的预构建 I2C_RDWR 请求，按 (地址, 长度) 复用。"""
+
+    __slots__ = ("pointer", "buffer", "msgs", "request")
+
+    def __init__(self, addr: int, length: int) -> None:
+        self.pointer = (ctypes.c_uint8 * 1)()
+        self.buffer = (ctypes.c_uint8 * length)()
+        self.msgs = (_I2cMsg * 2)(
+            _I2cMsg(addr, 0, 1, ctypes.cast(self.pointer, ctypes.POINTER(ctypes.c_uint8))),
+            _I2cMsg(addr, I2C_M_RD, length, ctypes.cast(self.buffer, ctypes.POINTER(ctypes.c_uint8))),
+        )
+        self.request = _I2cRdwrData(self.msgs, 2)
+
+
+class RawI2cBus:
+    """SMBus 兼容的 I2C 总线对象，直接持有 `/dev/i2c-N` 的文件描述符，可注入 `ADS1115` / `TCA9555` 或 `PacedBus`。
+
+    与 smbus2 相比省掉每次调用的 ctypes 结构构造和参数校验：
+    - 从机地址用 `I2C_SLAVE` 设置一次，目标地址不变时不再重复设置
+    - 寄存器写入是对预分配 `bytearray` 的一次 `write()`
+    - 寄存器读取是一次预构建的 `I2C_RDWR`（写指针后重复起始读取），请求结构按地址和长度缓存复用
+
+    适配器不支持纯 I2C 传输（例如 `i2c-stub` 环回总线）时，自动改用预构建的 `I2C_SMBUS` 请求，
+    每次访问仍是一次系统调用。`i2c_rdwr()` 接收 smbus2 的 `i2c_msg`，需要 `smbus2`。
+    """
+
+    def __init__(self, i2c_bus: int) -> None:
+        """打开 `/dev/i2c-<i2c_bus>` 并查询适配器能力。
+
+        参数:
+            i2c_bus: I2C 总线号，必须为非负整数
+        """
+        if not isinstance(i2c_bus, int) or i2c_bus < 0:
+            raise ValueError("i2c_bus must be a non-negative integer")
+
+        self.i2c_bus_num = i2c_bus
+        self.path = "/dev/i2c-%d" % i2c_bus
+        self.fd = os.open(self.path, os.O_RDWR)
+        # 不带缓冲的文件对象，write()/readinto() 各对应一次系统调用。
+        self._file = io.FileIO(self.fd, "r+b", closefd=False)
+        self._lock = threading.RLock()
+        self._addr: Optional[int] = None
+        self._closed = False
+
+        funcs = ctypes.c_ulong()
+        fcntl.ioctl(self.fd, I2C_FUNCS, funcs)
+        self.funcs = funcs.value
+        self.plain_i2c = bool(self.funcs & I2C_FUNC_I2C)
+
+        self._write_buffers: Dict[int, bytearray] = {}
+        self._reads: Dict[Tuple[int, int], _RegisterRead] = {}
+        self._byte = bytearray(1)
+        self._smbus_block = (ctypes.c_uint8 * (I2C_SMBUS_BLOCK_MAX + 2))()
+        self._smbus_request = _I2cSmbusData(
+            0, 0, 0, ctypes.cast(self._smbus_block, ctypes.POINTER(ctypes.c_uint8))
+        )
+
+        logger.debug("RawI2cBus opened %s funcs=0x%08X plain_i2c=%s", self.path, self.funcs, self.plain_i2c)
+
+    def __enter__(self) -> "RawI2cBus":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _ensure_open(self) -> None:
+        """确保文件描述符仍然可用。"""
+        if self._closed:
+            raise RuntimeError("I2C bus is closed")
+
+    def _select(self, addr: int) -> None:
+        """设置后续 read()/write() 的从机地址，地址未变时不发 ioctl。"""
+        if addr != self._addr:
+            fcntl.ioctl(self.fd, I2C_SLAVE, addr)
+            self._addr = addr
+
+    def _write(self, addr: int, data: Any) -> None:
+        """一次 write() 发出整段数据。"""
+        self._select(addr)
+        written = self._file.write(data)
+        if written != len(data):
+            raise OSError("short I2C write to 0x%02X: %s/%s bytes" % (addr, written, len(data)))
+
+    def _smbus(self, addr: int, read_write: int, command: int, size: int) -> None:
+        """用预构建的请求发出一次 I2C_SMBUS ioctl，数据在 `_smbus_block` 中。"""
+        self._select(addr)
+        request = self._smbus_request
+        request.read_write = read_write
+        request.command = command
+        request.size = size
+        fcntl.ioctl(self.fd, I2C_SMBUS, request)
+
+    def read_byte(self, addr: int) -> int:
+        with self._lock:
+            self._ensure_open()
+            if not self.plain_i2c:
+                self._smbus(addr, I2C_SMBUS_READ, 0, I2C_SMBUS_BYTE)
+                return self._smbus_block[0]
+            self._select(addr)
+            if self._file.readinto(self._byte) != 1:
+                raise OSError("short I2C read from 0x%02X" % addr)
+            return self._byte[0]
+
+    def write_byte(self, addr: int, value: int) -> None:
+        with self._lock:
+            self._ensure_open()
+            if not self.plain_i2c:
+                self._smbus(addr, I2C_SMBUS_WRITE, value & 0xFF, I2C_SMBUS_BYTE)
+                return
+            self._byte[0] = value & 0xFF
+            self._write(addr, self._byte)
+
+    def read_byte_data(self, addr: int, register: int) -> int:
+        return self.read_i2c_block_data(addr, register, 1)[0]
+
+    def write_byte_data(self, addr: int, register: int, value: int) -> None:
+        self.write_i2c_block_data(addr, register, [value])
+
+    def read_i2c_block_data(self, addr: int, register: int, length: int) -> List[int]:
+        """读取从 `register` 开始的 `length` 个字节。"""
+        if not isinstance(length, int) or length <= 0 or length > I2C_SMBUS_BLOCK_MAX:
+            raise ValueError("length must be in range 1~%d" % I2C_SMBUS_BLOCK_MAX)
+        with self._lock:
+            self._ensure_open()
+            if not self.plain_i2c:
+                self._smbus_block[0] = length
+                self._smbus(addr, I2C_SMBUS_READ, register & 0xFF, I2C_SMBUS_I2C_BLOCK_DATA)
+                return self._smbus_block[1 : length + 1]
+            read = self._reads.get((addr, length))
+            if read is None:
+                read = self._reads[(addr, length)] = _RegisterRead(addr, length)
+            read.pointer[0] = register & 0xFF
+            fcntl.ioctl(self.fd, I2C_RDWR, read.request)
+            return read.buffer[:]
+
+    def write_i2c_block_data(self, addr: int, register: int, data: List[int]) -> None:
+        """从 `register` 开始写入 `data`。"""
+        length = len(data)
+        if length > I2C_SMBUS_BLOCK_MAX:
+            raise ValueError("data length must be <= %d" % I2C_SMBUS_BLOCK_MAX)
+        with self._lock:
+            self._ensure_open()
+            if not self.plain_i2c:
+                block = self._smbus_block
+                if length == 1:
+                    block[0] = data[0] & 0xFF
+                    size = I2C_SMBUS_BYTE_DATA
+                else:
+                    block[0] = length
+                    for index, value in enumerate(data):
+                        block[index + 1] = value & 0xFF
+                    size = I2C_SMBUS_I2C_BLOCK_DATA
+                self._smbus(addr, I2C_SMBUS_WRITE, register & 0xFF, size)
+                return
+            buffer = self._write_buffers.get(length)
+            if buffer is None:
+                buffer = self._write_buffers[length] = bytearray(length + 1)
+            buffer[0] = register & 0xFF
+            for index, value in enumerate(data):
+                buffer[index + 1] = value & 0xFF
+            self._write(addr, buffer)
+
+    def i2c_rdwr(self, *messages: Any) -> None:
+        """一次 I2C_RDWR 发出多条 smbus2 `i2c_msg`，读消息的结果写回消息对象。"""
+        from smbus2.smbus2 import i2c_rdwr_ioctl_data
+
+        with self._lock:
+            self._ensure_open()
+            fcntl.ioctl(self.fd, I2C_RDWR, i2c_rdwr_ioctl_data.create(*messages))
+
+    def close(self) -> None:
+        """关闭文件描述符，重复调用安全。"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._file.close()
+            os.close(self.fd)
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Literal, Tuple
+from typing import TYPE_CHECKING, Literal, Optional, Tuple
 
 import gpiod
 
@@ -12,6 +12,7 @@ if TYPE_CHECKING:
 
 PinMode = Literal["input", "output"]
 PinSpec = Tuple[str, int]
+EdgeType = Literal["falling", "rising", "both"]
 
 
 class Pin(ABC):
@@ -183,6 +184,113 @@ class GpiodPin(Pin):
         self.close()
 
 
+class EdgeSource(ABC):
+    """边沿事件来源的最小接口。
+
+    驱动只依赖这组方法等待外部中断/就绪信号，既可以接 libgpiod 事件，也可以换成测试用的替身。
+    """
+
+    @abstractmethod
+    def wait_edge(self, timeout_s: float) -> Optional[int]:
+        """等待下一个边沿事件，返回事件时间戳（ns），超时返回 None。"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """丢弃已经排队但尚未读取的边沿事件。"""
+
+    @abstractmethod
+    def close(self) -> None:
+        """释放底层事件资源。"""
+
+
+class GpiodEdgeSource(EdgeSource):
+    """基于 libgpiod 事件请求的边沿来源。
+
+    时间戳来自内核记录的事件时间（CLOCK_MONOTONIC），不受用户态调度延迟影响。
+    """
+
+    def __init__(
+        self,
+        pin: PinSpec,
+        consumer: str = "motorlib",
+        edge: EdgeType = "falling",
+    ) -> None:
+        """申请一个边沿事件输入引脚。
+
+        参数:
+            pin: `(chip, line)` 形式的引脚描述
+            consumer: libgpiod consumer 名称
+            edge: `"falling"`、`"rising"` 或 `"both"`
+        """
+        self._pin = GpiodPin._normalize_pin_spec("pin", pin)
+        if not isinstance(consumer, str) or not consumer:
+            raise ValueError("consumer must be a non-empty string")
+        request_types = {
+            "falling": gpiod.LINE_REQ_EV_FALLING_EDGE,
+            "rising": gpiod.LINE_REQ_EV_RISING_EDGE,
+            "both": gpiod.LINE_REQ_EV_BOTH_EDGES,
+        }
+        if edge not in request_types:
+            raise ValueError("edge must be 'falling', 'rising' or 'both'")
+
+        self._closed = False
+        self._chip = gpiod.Chip(self._pin[0])
+        self._line = self._chip.get_line(self._pin[1])
+        self._line.request(consumer=consumer, type=request_types[edge])
+
+    def _ensure_open(self) -> None:
+        """确保事件引脚尚未被关闭。"""
+        if self._closed:
+            raise RuntimeError("GpiodEdgeSource is closed")
+
+    def wait_edge(self, timeout_s: float) -> Optional[int]:
+        """阻塞等待下一个边沿，返回内核时间戳（ns）。"""
+        self._ensure_open()
+        timeout_s = max(0.0, float(timeout_s))
+        sec = int(timeout_s)
+        nsec = int((timeout_s - sec) * 1_000_000_000)
+        if not self._line.event_wait(sec=sec, nsec=nsec):
+            return None
+        event = self._line.event_read()
+        return event.sec * 1_000_000_000 + event.nsec
+
+    def clear(self) -> None:
+        """读空事件队列。"""
+        self._ensure_open()
+        while self._line.event_wait(sec=0, nsec=0):
+            self._line.event_read()
+
+    def read(self) -> bool:
+        """读取引脚当前物理电平。"""
+        self._ensure_open()
+        return bool(self._line.get_value())
+
+    def close(self) -> None:
+        """释放 line 与 chip 资源。"""
+        if self._closed:
+            return
+
+        try:
+            if self._line is not None:
+                self._line.release()
+        finally:
+            self._line = None
+            try:
+                if self._chip is not None:
+                    self._chip.close()
+            finally:
+                self._chip = None
+                self._closed = True
+
+    def __enter__(self) -> "GpiodEdgeSource":
+        """支持 with 上下文管理。"""
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """退出上下文时自动释放引脚。"""
+        self.close()
+
+
 class Tca9555Pin(Pin):
     """对 TCA9555 单个 IO 的引脚封装。
 
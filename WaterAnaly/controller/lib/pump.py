@@ -127,6 +127,10 @@ class Pump:
         """持续吸液，直到外部调用停止。"""
         self._driver.run_continuous(direction=self._aspirate_direction)
 
+    def arm(self) -> None:
+        """预先清除停止请求，见 `Stepper.arm()`；在后台线程启动连续泵送前调用。"""
+        self._driver.arm()
+
     def stop(self) -> None:
         """停止运动。"""
         self._driver.stop()
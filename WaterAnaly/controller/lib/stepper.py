@@ -54,6 +54,8 @@ class Stepper:
         self.forward = True
 
         self._stop = False
+        # arm() 之后的下一次运动不在入口清除停止请求，保留在它启动前到达的 stop()。
+        self._armed = False
 
     def _check_pos_number(self, value, name: str) -> float:
         """校验正数参数。"""
@@ -101,6 +103,22 @@ class Stepper:
         """判断当前是否收到停止请求。"""
         return self._stop
 
+    def _begin_run(self) -> None:
+        """运动开始：未 arm() 时清除旧的停止请求，已 arm() 时保留其后到达的停止请求。"""
+        if self._armed:
+            self._armed = False
+        else:
+            self._stop = False
+
+    def arm(self) -> None:
+        """在调用方线程里预先清除停止请求，供随后在另一线程启动的运动使用。
+
+        运动方法在入口会清除停止请求；在后台线程启动运动时，线程真正开始前调用的 `stop()` 会因此丢失。
+        先 `arm()` 再启动线程，下一次运动不再清除停止请求，此后任何时刻的 `stop()` 都会生效。
+        """
+        self._stop = False
+        self._armed = True
+
     def set_direction(self, forward: bool) -> None:
         """设置运动方向。"""
         if not isinstance(forward, bool):
@@ -145,7 +163,7 @@ class Stepper:
         if direction is not None and not isinstance(direction, bool):
             raise TypeError("direction must be bool or None")
 
-        self._stop = False
+        self._begin_run()
         if direction is not None:
             self.set_direction(direction)
 
@@ -168,7 +186,7 @@ class Stepper:
         if direction is not None and not isinstance(direction, bool):
             raise TypeError("direction must be bool or None")
 
-        self._stop = False
+        self._begin_run()
         if direction is not None:
             self.set_direction(direction)
 
@@ -190,7 +208,7 @@ class Stepper:
         if direction is not None and not isinstance(direction, bool):
             raise TypeError("direction must be bool or None")
 
-        self._stop = False
+        self._begin_run()
         if direction is not None:
             self.set_direction(direction)
 
@@ -11,7 +11,12 @@ PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
 if PROJECT_ROOT not in sys.path:
     sys.path.append(PROJECT_ROOT)
 
-from lib.ADS1115 import ADS1115_REG_CONFIG_PGA_4_096V, ADS1115_REG_CONFIG_PGA_6_144V
+from lib.ADS1115 import (
+    ADS1115_REG_CONFIG_DR_128SPS,
+    ADS1115_REG_CONFIG_DR_860SPS,
+    ADS1115_REG_CONFIG_PGA_4_096V,
+    ADS1115_REG_CONFIG_PGA_6_144V,
+)
 
 
 
@@ -19,7 +24,9 @@ from lib.ADS1115 import ADS1115_REG_CONFIG_PGA_4_096V, ADS1115_REG_CONFIG_PGA_6_
 class TimingConfig:
     stable_sample_period_ms: int = 20  # 稳定判定时，两次采样之间的间隔
     stable_sample_count: int = 10  # 判定“稳定成立”所需的连续采样次数
-    valve_settle_ms: int = 50  # 阀门切换后等待液路稳定的时间
+    valve_settle_ms: int = 50  # 阀门切换后等待液路稳定的时间，路由没有变化时不等待；标定文件里没有的阀门按此值
+    valve_settle_profile: str | None = "valve_settle.json"  # 逐阀稳定时间标定文件（相对 controller 目录），不存在时全部按 valve_settle_ms
+    valve_settle_margin: float = 1.5  # 标定时实测稳定时间的放大系数，留出余量
     take_large_timeout_ms: int = 15_000  # 大体积吸液到位超时时间
     take_small_timeout_ms: int = 15_000  # 小体积吸液到位超时时间
     dispense_timeout_ms: int = 10_000  # 排液到空超时时间
@@ -32,6 +39,8 @@ class TimingConfig:
     stir_duration_ms: int = 15_000  # 通气搅拌动作持续时间
     optics_warmup_ms: int = 500  # 光路切换后等待信号稳定的时间
     clean_pause_ms: int = 20_000  # 清洗阶段每轮之间的额外停顿
+    cancel_poll_ms: int = 50  # 可取消流程中，无法直接唤醒的等待（硬件比较器）每次最多阻塞的时间
+    cancel_safe_budget_ms: int = 100  # 从取消到进入安全状态（停泵、关加热、关阀）的目标上限，超出时告警
 
 
 @dataclass(frozen=True)
@@ -42,16 +51,36 @@ class ThresholdConfig:
 @dataclass(frozen=True)
 class AdsConfig:
     bus: int = 1  # ADS1115 所在 I2C 总线号
-    addr: int = 0x48  # ADS1115 的 I2C 地址
+    chips: dict[str, int] = field(
+        default_factory=lambda: {
+            "meter": 0x48,  # 计量单元光电所在芯片
+            "digest": 0x48,  # 消解光学所在芯片
+        }
+    )  # 逻辑芯片名称到 ADS1115 I2C 地址（0x48~0x4B）的映射，相同地址共用一片芯片；分开后两片芯片可经 adc_group 并行读取
     gain: int = ADS1115_REG_CONFIG_PGA_6_144V  # ADS1115 满量程增益配置
+    data_rate: int = ADS1115_REG_CONFIG_DR_128SPS  # 单次转换数据率，决定每次读取的等待时间
+    alert_pin: tuple[str, int] | None = None  # meter 芯片 ALERT/RDY 接入的本地 GPIO，None 表示轮询 OS 位判断转换完成
+    scan_discard: int = 1  # 多通道扫描时 MUX 切换后丢弃的转换次数
+    pipelined_reads: bool = False  # 光路成对读数改用流水线扫描（启动下一次与读取上一次合并为一次 I2C_RDWR），此时不丢弃转换
+    comparator_data_rate: int = ADS1115_REG_CONFIG_DR_860SPS  # 硬件窗口比较器判满时的连续转换数据率
+    comparator_consecutive: int = 4  # 比较器触发所需的连续超限转换次数（1、2、4），滤掉单次噪声；触发后仍按 stable_truth 复核液位
+    meter_profile: str | None = "level-fast"  # 计量单元两路液位通道绑定的采集配置（ADS1115_PROFILES 名称），None 表示沿用 gain/data_rate
+    digest_profile: str | None = None  # 消解光学两路通道（差分模式下还有差分通道）绑定的采集配置，精密读数可设为 "digest-precise"
+    block_samples: int = 16  # 基准和消解读数每路连续转换的采样个数
+    block_reducer: str = "trimmed"  # 块采样归约方式：mean / median / trimmed / mad
     meter_upper_channel: int = 0  # 计量单元上液位检测通道
     meter_lower_channel: int = 1  # 计量单元下液位检测通道
     digest_measure_channel: int = 2  # 消解光学测量通道
     digest_reference_channel: int = 3  # 消解光学参比通道
+    digest_differential: bool = False  # 消解光学差分模式：参比单端读数 + 测量减参比差分读数（需要两通道是芯片支持的差分输入对）
+    meter_autorange: bool = False  # 计量液位通道自动量程；硬件比较器判满按布防时的增益换算阈值，默认关闭保持固定量程
+    meter_streaming: bool = False  # 计量液位两路由后台线程连续采样，液位读数取调用之后的新采样；要求 meter 独占一片芯片，开启后判满改为轮询
+    digest_autorange: bool = True  # 消解光学通道自动量程（差分模式下差分通道单独调整），按信号大小选最窄不削顶的增益
 
 
 @dataclass(frozen=True)
 class TcaConfig:
+    backend: str = "smbus"  # "smbus" 由 Python 直接写寄存器；"kernel" 经内核 gpio-pca953x 驱动和 libgpiod 批量 line 访问
     bus: int = 1  # TCA9555 所在 I2C 总线号
     valve_addr: int = 0x20  # 液路阀板扩展 IO 地址
     control_addr: int = 0x21  # 控制板扩展 IO 地址
@@ -83,6 +112,26 @@ class TcaConfig:
             "max31865_cs": 0o10,     # MAX31865 片选
         }
     )  # 控制类执行器到 TCA9555 引脚号的映射
+    scrub_interval_s: float | None = None  # 后台回读输出/配置寄存器并修复偏差的周期（秒），None 表示不启动校验线程；两片扩展 IO 每个周期共 4 次 I2C 读取，按需开启
+    valve_int_pin: tuple[str, int] | None = None  # 阀板 TCA9555 INT 接入的本地 GPIO，配置后输入变化改为中断通知
+    control_int_pin: tuple[str, int] | None = None  # 控制板 TCA9555 INT 接入的本地 GPIO，None 表示不监视输入
+    make_before_break_routes: tuple[str, ...] = ()  # 按“先开新阀再关旧阀”切换的路由名（阀名或 "digestor"），其余路由先关后开
+    valve_gpiochip: str | None = None  # kernel 后端下阀板对应的 gpiochip，None 表示按总线号和地址自动查找
+    control_gpiochip: str | None = None  # kernel 后端下控制板对应的 gpiochip，None 表示自动查找
+
+
+@dataclass(frozen=True)
+class I2cConfig:
+    transport: str = "smbus2"  # 底层传输："smbus2" 或 "raw"（直接操作 /dev/i2c-N 文件描述符，每次访问开销更小）
+    min_gap_us: int = 0  # 相邻两次 I2C 事务之间的最小间隔（微秒），0 表示不强制间隔
+    tca_rate_hz: float = 200.0  # 每片 TCA9555 的平均事务速率上限，取代原来每次写阀后固定 5 ms 的等待
+    tca_burst: int = 4  # TCA9555 令牌桶容量，突发范围内的写入不等待
+    retries: int = 3  # 单次事务失败（NAK/超时）后的最大重试次数
+    backoff_ms: float = 1.0  # 首次重试前的退避时间，之后每次翻倍
+    owner_thread: bool = True  # 每条总线的全部事务交给一个属主线程按优先级串行执行（阀门/安全 > 液位 > 监控）
+    batch_transfers: bool = True  # 阀门切换、光源开关和 ADC 启动合成一次 I2C_RDWR；仅 smbus 后端且 TCA 与 ADS 同一总线时生效
+    scl_recovery_pin: tuple[str, int] | None = None  # 总线卡死时打 9 个时钟恢复用的 SCL GPIO，None 表示不做 GPIO 恢复
+    sda_recovery_pin: tuple[str, int] | None = None  # 恢复后生成 STOP 条件用的 SDA GPIO
 
 
 @dataclass(frozen=True)
@@ -112,6 +161,7 @@ class LoggingConfig:
     """统一日志配置，只通过参数控制，不区分 main/test 逻辑分支。"""
 
     DEBUG: bool = False  # 是否强制开启调试级别日志
+    lock_order_check: bool = False  # 调试用：检查设备锁的加锁顺序，出现相反顺序时抛出 LockOrderError
     log_format: str = "[%(asctime)s] %(levelname)s %(name)s: %(message)s"  # 日志输出格式
     date_format: str = "%H:%M:%S"  # 时间字段显示格式
 
@@ -143,6 +193,7 @@ class AppConfig:
     thresholds: ThresholdConfig = field(default_factory=ThresholdConfig)  # 液位判定阈值集合
     ads: AdsConfig = field(default_factory=AdsConfig)  # ADC 采集配置
     tca: TcaConfig = field(default_factory=TcaConfig)  # IO 扩展与阀门映射配置
+    i2c: I2cConfig = field(default_factory=I2cConfig)  # I2C 总线节流、重试与恢复配置
     pump: PumpConfig = field(default_factory=PumpConfig)  # 泵与步进驱动配置
     temperature: TemperatureConfig = field(default_factory=TemperatureConfig)  # 温度采集与加热控制配置
     logging: LoggingConfig = field(default_factory=LoggingConfig)  # 日志配置
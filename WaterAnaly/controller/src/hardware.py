@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import json
 import os
 import sys
 import time
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from array import array
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable
 
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -14,11 +16,23 @@ if PROJECT_ROOT not in sys.path:
     sys.path.append(PROJECT_ROOT)
 
 from config import AppConfig, DEFAULT_CONFIG
-from lib.ADS1115 import ADS1115
+from lib.ADS1115 import ADS1115, ADS1115_BLOCK_REDUCERS, ADS1115Group, AdsFrame, differential_channel
 from lib.MAX31865 import MAX31865
 from lib.SoftSPI import SoftSPI
-from lib.TCA9555 import TCA9555
-from lib.pins import GpiodPin, Tca9555Pin
+from lib.TCA9555Kernel import KernelTCA9555
+from lib.device_lock import enable_lock_order_check
+from lib.i2c_bus import (
+    I2C_PRIORITY_LEVEL,
+    I2C_PRIORITY_SAFETY,
+    BusOwner,
+    I2cBatch,
+    OwnedBus,
+    SharedBus,
+    gpio_scl_recovery,
+    open_shared_bus,
+)
+from lib.TCA9555 import TCA9555_COALESCE_REGISTERS, OutputFrame, TCA9555, TcaInputWatcher
+from lib.pins import GpiodEdgeSource, GpiodPin, Tca9555Pin
 from lib.pump import Pump
 from lib.stepper import Stepper
 
@@ -27,6 +41,69 @@ if TYPE_CHECKING:
 
 
 VALVE_PIN_ORDER = list(DEFAULT_CONFIG.tca.valve_pins.items())
+DIGESTOR_ROUTE = "digestor"  # 消解器三阀同时打开的路由名
+
+
+@dataclass(frozen=True)
+class ValveRoute:
+    """预先算好的一条液路：打开 `valves`、关闭其余阀门时的 16 位输出字。"""
+
+    name: str
+    valves: tuple[str, ...]
+    word: int
+    make_before_break: bool = False  # True 先开新阀再关旧阀，False 先关旧阀再开新阀
+
+
+class ValveSettleModel:
+    """逐阀、逐方向（打开 / 关闭）的阀门稳定时间模型，没有标定值的阀门按 default_ms。"""
+
+    DIRECTIONS = ("open", "close")
+
+    def __init__(self, default_ms: float, settle_ms: dict[str, dict[str, float]] | None = None) -> None:
+        self.default_ms = float(default_ms)
+        self._settle_ms: dict[str, dict[str, float]] = {}
+        for valve, directions in (settle_ms or {}).items():
+            for direction, value in directions.items():
+                self.set(valve, direction, value)
+
+    def set(self, valve: str, direction: str, settle_ms: float) -> None:
+        if direction not in self.DIRECTIONS:
+            raise ValueError("direction must be 'open' or 'close'")
+        if settle_ms < 0:
+            raise ValueError("settle_ms must be >= 0")
+        self._settle_ms.setdefault(valve, {})[direction] = float(settle_ms)
+
+    def reset(self, valve: str, direction: str) -> None:
+        # 去掉标定值，该阀该方向回到 default_ms。
+        self._settle_ms.get(valve, {}).pop(direction, None)
+        if valve in self._settle_ms and not self._settle_ms[valve]:
+            del self._settle_ms[valve]
+
+    def settle_ms(self, valve: str, direction: str) -> float:
+        return self._settle_ms.get(valve, {}).get(direction, self.default_ms)
+
+    def transition_ms(self, opened: list[str], closed: list[str]) -> float:
+        # 一次切换里各阀同时动作，等待时间取其中最慢的一个。
+        waits = [self.settle_ms(name, "open") for name in opened]
+        waits += [self.settle_ms(name, "close") for name in closed]
+        return max(waits, default=0.0)
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        return {valve: dict(directions) for valve, directions in self._settle_ms.items()}
+
+    @classmethod
+    def load(cls, path: str | None, default_ms: float) -> "ValveSettleModel":
+        """读取标定文件；没有配置路径或文件不存在时返回全部按 default_ms 的模型。"""
+
+        if path is None or not os.path.exists(path):
+            return cls(default_ms)
+        with open(path, "r", encoding="utf-8") as fp:
+            data = json.load(fp)
+        return cls(default_ms, data.get("valves", {}))
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as fp:
+            json.dump({"valves": self.as_dict()}, fp, ensure_ascii=False, indent=2, sort_keys=True)
 
 
 class ValveBank:
@@ -36,11 +113,30 @@ class ValveBank:
         self,
         tca: "TCA9555",
         pin_map: dict[str, int],
-        i2c_settle_ms: int = 5,
+        make_before_break: tuple[str, ...] = (),
+        settle_model: ValveSettleModel | None = None,
     ) -> None:
+        # 写入节流由 PacedBus 的令牌桶负责，只在写入过密时才等待，这里不再固定延时。
         self._tca = tca
         self._pin_map = pin_map
-        self._i2c_settle_ms = i2c_settle_ms
+        self._make_before_break = set(make_before_break)
+        self.settle_model = (
+            settle_model if settle_model is not None else ValveSettleModel(DEFAULT_CONFIG.timing.valve_settle_ms)
+        )
+        # 稳定等待统计：按模型需要等待的总时长，以及相比原先每次路由调用“关全部阀 + 等待 + 开阀 + 等待”
+        # （2 × default_ms，路由没变也照等）节省的时长。
+        self.settle_ms_total = 0.0
+        self.settle_ms_saved = 0.0
+        self.route_calls = 0
+        self._masks = {name: 1 << pin_no for name, pin_no in pin_map.items()}
+        self._routes: dict[str, ValveRoute] = {}
+        self._routes_by_word: dict[int, ValveRoute] = {}
+        # 路由切换统计：实际切换次数、输出字写入次数。
+        self.transitions = 0
+        self.transition_writes = 0
+        # 每个阀门单独打开就是一条路由（液源 -> 计量单元、计量单元 -> 目标端都只开一个阀）。
+        for name in pin_map:
+            self.define_route(name, [name])
 
         self._pin_to_port: dict[str, int] = {}
         self._pin_to_bit: dict[str, int] = {}
@@ -51,7 +147,8 @@ class ValveBank:
             self._pin_to_bit[name] = bit
 
     def _get_current_output(self) -> int:
-        return self._tca.read_word(source="output")
+        # 以驱动的影子输出寄存器为准（输出帧中取暂存值），开阀只产生一次写入、不回读硬件；硬件偏差由后台校验线程修复。
+        return self._tca.output_word()
 
     def _calculate_port_values(self, pin_names: list[str], value: bool) -> tuple[int | None, int | None]:
         port0_value = None
@@ -77,7 +174,131 @@ class ValveBank:
 
     def close_all(self) -> None:
         self._tca.write_word(0)
-        time.sleep(self._i2c_settle_ms / 1000.0)
+
+    def _word_for(self, names: list[str] | tuple[str, ...]) -> int:
+        word = 0
+        for name in names:
+            if name not in self._masks:
+                raise KeyError(f"unknown valve: {name}")
+            word |= self._masks[name]
+        return word
+
+    def define_route(
+        self,
+        name: str,
+        valves: list[str] | tuple[str, ...],
+        make_before_break: bool | None = None,
+    ) -> ValveRoute:
+        """登记一条命名路由，输出字在这里一次算好，切换时只做比较；切换规则缺省取构造时的先通后断路由名单。"""
+
+        if make_before_break is None:
+            make_before_break = name in self._make_before_break
+        route = ValveRoute(name, tuple(valves), self._word_for(valves), make_before_break)
+        self._routes[name] = route
+        self._routes_by_word[route.word] = route
+        return route
+
+    def route(self, name: str) -> ValveRoute:
+        return self._routes[name]
+
+    def apply_route(self, name: str, wait_ms: Callable[[float], None] | None = None) -> float:
+        """切换到命名路由，返回这次切换之后还需要等待的稳定时间（ms），没有阀门动作时为 0。
+
+        需要分两步切换时，中间字在这里按稳定时间模型保持，`wait_ms(ms)` 负责这段等待（流程层传入可取消的等待），
+        不传时用 time.sleep。
+        """
+
+        route = self._routes[name]
+        return self._transition(route.word, route.make_before_break, wait_ms=wait_ms)
+
+    def apply_valves(
+        self,
+        names: list[str] | tuple[str, ...],
+        wait_ms: Callable[[float], None] | None = None,
+    ) -> float:
+        """切换到“只开 names、其余全关”的状态；与已登记路由的输出字相同时沿用该路由的切换规则。"""
+
+        word = self._word_for(names)
+        route = self._routes_by_word.get(word)
+        return self._transition(word, route.make_before_break if route is not None else False, wait_ms=wait_ms)
+
+    def queue_route(self, batch: I2cBatch, name: str, wait_ms: Callable[[float], None] | None = None) -> float:
+        """同 `apply_route()`，但最终输出字追加到批量事务里，由调用方和其它芯片的读写一起执行。
+
+        需要分两步切换时第一步仍立即写入并保持到位；同一批次里只应排一次阀门切换。
+        """
+
+        route = self._routes[name]
+        return self._transition(route.word, route.make_before_break, batch, wait_ms)
+
+    def queue_valves(
+        self,
+        batch: I2cBatch,
+        names: list[str] | tuple[str, ...],
+        wait_ms: Callable[[float], None] | None = None,
+    ) -> float:
+        word = self._word_for(names)
+        route = self._routes_by_word.get(word)
+        return self._transition(word, route.make_before_break if route is not None else False, batch, wait_ms)
+
+    def _names_for(self, word: int) -> list[str]:
+        return [name for name, mask in self._masks.items() if word & mask]
+
+    def reset_stats(self) -> None:
+        self.transitions = 0
+        self.transition_writes = 0
+        self.settle_ms_total = 0.0
+        self.settle_ms_saved = 0.0
+        self.route_calls = 0
+
+    def _transition(
+        self,
+        target: int,
+        make_before_break: bool,
+        batch: I2cBatch | None = None,
+        wait_ms: Callable[[float], None] | None = None,
+    ) -> float:
+        # 与当前输出字做差：保持打开的阀不动，只有同时存在要关和要开的阀时才分两步写入。
+        current = self._get_current_output()
+        baseline_ms = 2 * self.settle_model.default_ms
+        self.route_calls += 1
+        if current == target:
+            self.settle_ms_saved += baseline_ms
+            return 0.0
+
+        closing = self._names_for(current & ~target)
+        opening = self._names_for(target & ~current)
+        writes = 0
+        held_ms = 0.0
+        if closing and opening:
+            # 先断后通：旧通路的阀按模型完全关断后再开新通路，避免两条液路短暂连通；
+            # 先通后断：新通路的阀完全打开后再关旧通路，泵不会憋压。中间字保持的时间计入本次稳定等待。
+            if make_before_break:
+                self._tca.write_word(current | target)
+                held_ms = self.settle_model.transition_ms(opening, [])
+                opening = []
+            else:
+                self._tca.write_word(current & target)
+                held_ms = self.settle_model.transition_ms([], closing)
+                closing = []
+            writes += 1
+            if wait_ms is None:
+                time.sleep(held_ms / 1000.0)
+            else:
+                wait_ms(held_ms)
+        if batch is None:
+            self._tca.write_word(target)
+        else:
+            with OutputFrame(batch=batch):
+                self._tca.write_word(target)
+        writes += 1
+
+        self.transitions += 1
+        self.transition_writes += writes
+        settle_ms = self.settle_model.transition_ms(opening, closing)
+        self.settle_ms_total += held_ms + settle_ms
+        self.settle_ms_saved += baseline_ms - held_ms - settle_ms
+        return settle_ms
 
     def open(self, names: list[str] | tuple[str, ...]) -> None:
         names = list(names)
@@ -91,8 +312,6 @@ class ValveBank:
         elif port1_value is not None:
             self._tca.write_port(1, port1_value)
 
-        time.sleep(self._i2c_settle_ms / 1000.0)
-
 
 class MeterOptics:
     """计量单元液位光电读取封装。"""
@@ -104,26 +323,111 @@ class MeterOptics:
         lower_channel: int,
         upper_control_pin: Tca9555Pin,
         lower_control_pin: Tca9555Pin,
+        scan_discard: int = 1,
+        pipelined: bool = False,
+        block_samples: int = 16,
+        block_reducer: str = "trimmed",
+        streaming: bool = False,
     ) -> None:
         self._ads = ads
         self._upper_channel = upper_channel
         self._lower_channel = lower_channel
         self._upper_pin = upper_control_pin
         self._lower_pin = lower_control_pin
+        self._scan_discard = scan_discard
+        self._pipelined = pipelined
+        self._block_reducer = block_reducer
+        # 连续采样由 init_hardware 启动，此时芯片归采样线程独占，读数都从环形缓冲区取。
+        self._streaming = streaming
+        # 块读取缓冲区只分配一次，之后每次平均读数都复用。
+        self._block = array("h", [0]) * block_samples
 
     def read_upper_mv(self) -> float:
+        if self._streaming:
+            return self._ads.read_fresh_voltages(self._upper_channel, 1)[0]
         return float(self._ads.read_voltage(self._upper_channel))
 
     def read_lower_mv(self) -> float:
+        if self._streaming:
+            return self._ads.read_fresh_voltages(self._lower_channel, 1)[0]
         return float(self._ads.read_voltage(self._lower_channel))
 
+    def read_upper_average_mv(self) -> float:
+        # 连续转换一块采样后做稳健平均，用作判满/判空基准。
+        if self._streaming:
+            return self._stream_average_mv(self._upper_channel)
+        return self._ads.read_average_mv(self._upper_channel, len(self._block), method=self._block_reducer, out=self._block)
+
+    def read_lower_average_mv(self) -> float:
+        if self._streaming:
+            return self._stream_average_mv(self._lower_channel)
+        return self._ads.read_average_mv(self._lower_channel, len(self._block), method=self._block_reducer, out=self._block)
+
+    def _stream_average_mv(self, channel: int) -> float:
+        values = self._ads.read_fresh_voltages(channel, len(self._block))
+        return float(ADS1115_BLOCK_REDUCERS[self._block_reducer](values, 1.0))
+
+    def read_pair_mv(self) -> tuple[float, float]:
+        if self._streaming:
+            return self.read_upper_mv(), self.read_lower_mv()
+        # 上下液位作为同一帧连续转换，两次采样只相隔一个转换周期。
+        frame = self._read_frame()
+        return float(frame.voltage_mv(self._upper_channel)), float(frame.voltage_mv(self._lower_channel))
+
+    def _read_frame(self) -> AdsFrame:
+        if self._pipelined:
+            return next(self._ads.sweep(self.channels, frames=1))
+        return self._ads.read_frame(self.channels, discard=self._scan_discard)
+
+    @property
+    def channels(self) -> tuple[int, int]:
+        return self._upper_channel, self._lower_channel
+
+    # 以下 latest_*/recent_* 需开启 AdsConfig.meter_streaming，直接取环形缓冲区，不等待转换。
+    def latest_upper_mv(self) -> float | None:
+        value = self._ads.read_latest_voltage(self._upper_channel)
+        return None if value is None else float(value)
+
+    def latest_lower_mv(self) -> float | None:
+        value = self._ads.read_latest_voltage(self._lower_channel)
+        return None if value is None else float(value)
+
+    def recent_upper_mv(self, n: int) -> list[float]:
+        return [float(mv) for mv in self._ads.read_recent_voltages(self._upper_channel, n)]
+
+    def recent_lower_mv(self, n: int) -> list[float]:
+        return [float(mv) for mv in self._ads.read_recent_voltages(self._lower_channel, n)]
+
     def light_on(self) -> None:
-        self._upper_pin.write(True)
-        self._lower_pin.write(True)
+        # 两路控制脚合并成一帧提交，同一端口只写一次。
+        with OutputFrame():
+            self._upper_pin.write(True)
+            self._lower_pin.write(True)
 
     def light_off(self) -> None:
-        self._upper_pin.write(False)
-        self._lower_pin.write(False)
+        with OutputFrame():
+            self._upper_pin.write(False)
+            self._lower_pin.write(False)
+
+    # 以下 queue_* 只把写入追加到批量事务，执行由调用方负责，可与阀门切换、其它芯片合成一次 I2C_RDWR。
+    def queue_light_on(self, batch: I2cBatch) -> None:
+        with OutputFrame(batch=batch):
+            self.light_on()
+
+    def queue_light_off(self, batch: I2cBatch) -> None:
+        with OutputFrame(batch=batch):
+            self.light_off()
+
+    def queue_start_upper(self, batch: I2cBatch) -> bool:
+        # 上液位通道提前进入连续转换，紧随其后的 read_upper_average_mv() 不再写配置；连续采样时无需预启动。
+        if self._streaming:
+            return False
+        return self._ads.queue_start(batch, self._upper_channel)
+
+    def queue_start_lower(self, batch: I2cBatch) -> bool:
+        if self._streaming:
+            return False
+        return self._ads.queue_start(batch, self._lower_channel)
 
 
 class DigestOptics:
@@ -137,6 +441,11 @@ class DigestOptics:
         light_pin: Tca9555Pin,
         ref_amp_pin: Tca9555Pin,
         main_amp_pin: Tca9555Pin,
+        scan_discard: int = 1,
+        pipelined: bool = False,
+        block_samples: int = 16,
+        block_reducer: str = "trimmed",
+        differential: bool = False,
     ) -> None:
         self._ads = ads
         self._measure_channel = measure_channel
@@ -144,6 +453,20 @@ class DigestOptics:
         self._light_pin = light_pin
         self._ref_amp_pin = ref_amp_pin
         self._main_amp_pin = main_amp_pin
+        self._scan_discard = scan_discard
+        self._pipelined = pipelined
+        self._block_reducer = block_reducer
+        # 测量、参比两块缓冲区只分配一次，之后每次平均读数都复用。
+        self._blocks = (array("h", [0]) * block_samples, array("h", [0]) * block_samples)
+        # 差分模式：参比走单端，测量减参比走差分 MUX，测量值由两者相加得到。
+        self._differential = differential
+        self._diff_channel, self._diff_sign = (
+            differential_channel(measure_channel, reference_channel) if differential else (0, 1)
+        )
+
+    @property
+    def differential(self) -> bool:
+        return self._differential
 
     def read_measure_mv(self) -> float:
         return float(self._ads.read_voltage(self._measure_channel))
@@ -151,6 +474,65 @@ class DigestOptics:
     def read_reference_mv(self) -> float:
         return float(self._ads.read_voltage(self._reference_channel))
 
+    def read_diff_mv(self) -> float:
+        # 测量减参比；差分模式下是一次差分转换，两路共同的漂移在同一次转换里抵消。
+        if self._differential:
+            return self._diff_sign * float(self._ads.read_differential_voltage(self._diff_channel))
+        measure_mv, reference_mv = self.read_pair_mv()
+        return measure_mv - reference_mv
+
+    def read_triplet_mv(self) -> tuple[float, float, float]:
+        # 返回 (测量, 参比, 测量-参比)；两种模式都是两次转换，差分模式下差值直接来自一次差分转换，按它自己的量程读取。
+        if self._differential:
+            reference_mv = self.read_reference_mv()
+            diff_mv = self.read_diff_mv()
+            return reference_mv + diff_mv, reference_mv, diff_mv
+        measure_mv, reference_mv = self.read_pair_mv()
+        return measure_mv, reference_mv, measure_mv - reference_mv
+
+    def read_triplet_average_mv(self) -> tuple[float, float, float]:
+        # 两路交替转换一块采样，各自做稳健平均：两路读数落在同一个采样时间窗内，同时降低噪声。
+        n = len(self._blocks[0])
+        if self._differential:
+            reference_mv, diff_mv = self._ads.read_interleaved_average_mv(
+                ((self._reference_channel, False), (self._diff_channel, True)),
+                n,
+                method=self._block_reducer,
+                discard=self._scan_discard,
+                out=self._blocks,
+            )
+            diff_mv *= self._diff_sign
+            return reference_mv + diff_mv, reference_mv, diff_mv
+        measure_mv, reference_mv = self._ads.read_interleaved_average_mv(
+            ((self._measure_channel, False), (self._reference_channel, False)),
+            n,
+            method=self._block_reducer,
+            discard=self._scan_discard,
+            out=self._blocks,
+        )
+        return measure_mv, reference_mv, measure_mv - reference_mv
+
+    def read_pair_average_mv(self) -> tuple[float, float]:
+        measure_mv, reference_mv, _ = self.read_triplet_average_mv()
+        return measure_mv, reference_mv
+
+    def read_pair_mv(self) -> tuple[float, float]:
+        if self._differential:
+            measure_mv, reference_mv, _ = self.read_triplet_mv()
+            return measure_mv, reference_mv
+        # 测量与参比作为同一帧连续转换，避免两路采样相隔数百毫秒。
+        frame = self._read_frame()
+        return float(frame.voltage_mv(self._measure_channel)), float(frame.voltage_mv(self._reference_channel))
+
+    def _read_frame(self) -> AdsFrame:
+        if self._pipelined:
+            return next(self._ads.sweep(self.channels, frames=1))
+        return self._ads.read_frame(self.channels, discard=self._scan_discard)
+
+    @property
+    def channels(self) -> tuple[int, int]:
+        return self._measure_channel, self._reference_channel
+
     def light_on(self) -> None:
         self._light_pin.write(True)
 
@@ -159,13 +541,31 @@ class DigestOptics:
 
     def connect_paths(self) -> None:
         # 低电平闭合模拟通道，接入测量链路。
-        self._ref_amp_pin.write(False)
-        self._main_amp_pin.write(False)
+        with OutputFrame():
+            self._ref_amp_pin.write(False)
+            self._main_amp_pin.write(False)
 
     def disconnect_paths(self) -> None:
         # 高电平断开模拟通道，读取偏置本底。
-        self._ref_amp_pin.write(True)
-        self._main_amp_pin.write(True)
+        with OutputFrame():
+            self._ref_amp_pin.write(True)
+            self._main_amp_pin.write(True)
+
+    def queue_light_on(self, batch: I2cBatch) -> None:
+        with OutputFrame(batch=batch):
+            self.light_on()
+
+    def queue_light_off(self, batch: I2cBatch) -> None:
+        with OutputFrame(batch=batch):
+            self.light_off()
+
+    def queue_connect_paths(self, batch: I2cBatch) -> None:
+        with OutputFrame(batch=batch):
+            self.connect_paths()
+
+    def queue_disconnect_paths(self, batch: I2cBatch) -> None:
+        with OutputFrame(batch=batch):
+            self.disconnect_paths()
 
 
 class HeaterControl:
@@ -197,6 +597,7 @@ class HardwareContext:
 
     valve_io: TCA9555
     control_io: TCA9555
+    adc_group: ADS1115Group
     ads1115: ADS1115
     valves: dict[str, Tca9555Pin]
     optics_controls: dict[str, Tca9555Pin]
@@ -209,25 +610,153 @@ class HardwareContext:
     digest_optics: DigestOptics
     heater: HeaterControl
     temp_sensor: TemperatureSensor
+    valve_inputs: TcaInputWatcher | None = None
+    control_inputs: TcaInputWatcher | None = None
+    i2c_buses: dict[int, SharedBus] = field(default_factory=dict)
+    i2c_owners: dict[int, BusOwner] = field(default_factory=dict)
+    # 跨芯片批量事务使用的总线，None 表示不能批量（内核后端或 TCA/ADS 不在同一总线），流程层退回逐个写入。
+    i2c_batch_bus: SharedBus | OwnedBus | None = None
 
 
 def _build_tca_pins(io: TCA9555, pin_map: dict[str, int]) -> dict[str, Tca9555Pin]:
     """按名称批量创建 TCA9555 引脚对象。"""
 
+    # 各引脚的方向和初始电平合并成一帧：输出寄存器、配置寄存器各写一次。
     pins: dict[str, Tca9555Pin] = {}
-    for name, pin_no in pin_map.items():
-        pins[name] = Tca9555Pin(io, pin_no, initial_value=False)
+    with OutputFrame():
+        for name, pin_no in pin_map.items():
+            pins[name] = Tca9555Pin(io, pin_no, initial_value=False)
     return pins
 
 
+def valve_settle_profile_path(config: AppConfig) -> str | None:
+    """阀门稳定时间标定文件的绝对路径，相对路径按 controller 目录解析。"""
+
+    if config.timing.valve_settle_profile is None:
+        return None
+    return os.path.join(PROJECT_ROOT, config.timing.valve_settle_profile)
+
+
+def _build_i2c_buses(config: AppConfig) -> dict[int, SharedBus]:
+    """按总线号从共享注册表取得 PacedBus 句柄，TCA9555 地址按令牌桶限速。"""
+
+    recovery = None
+    if config.i2c.scl_recovery_pin is not None:
+        recovery = gpio_scl_recovery(config.i2c.scl_recovery_pin, config.i2c.sda_recovery_pin)
+
+    buses: dict[int, SharedBus] = {}
+    for bus_num in sorted({config.tca.bus, config.ads.bus}):
+        buses[bus_num] = open_shared_bus(
+            bus_num,
+            min_gap_s=config.i2c.min_gap_us / 1_000_000.0,
+            retries=config.i2c.retries,
+            backoff_s=config.i2c.backoff_ms / 1000.0,
+            recovery=recovery,
+            transport=config.i2c.transport,
+        )
+    for addr in (config.tca.valve_addr, config.tca.control_addr):
+        buses[config.tca.bus].set_rate(addr, config.i2c.tca_rate_hz, config.i2c.tca_burst)
+    return buses
+
+
+def _device_bus(
+    i2c_buses: dict[int, SharedBus],
+    i2c_owners: dict[int, BusOwner],
+    bus_num: int,
+    priority: int,
+) -> SharedBus | OwnedBus:
+    """设备使用的总线对象：启用属主线程时为按 priority 排队的代理，否则直接共用总线句柄。"""
+
+    owner = i2c_owners.get(bus_num)
+    if owner is None:
+        return i2c_buses[bus_num]
+    return owner.client(priority)
+
+
+def _open_tca(config: AppConfig, addr: int, chip: str | None, bus: SharedBus | OwnedBus) -> TCA9555:
+    """按 TcaConfig.backend 打开一片扩展 IO。"""
+
+    if config.tca.backend == "kernel":
+        return KernelTCA9555(i2c_bus=config.tca.bus, addr=addr, chip=chip)
+    if config.tca.backend == "smbus":
+        return TCA9555(i2c_bus=config.tca.bus, addr=addr, bus=bus)
+    raise ValueError("tca backend must be 'smbus' or 'kernel'")
+
+
+def _batch_bus(
+    config: AppConfig,
+    i2c_buses: dict[int, SharedBus],
+    i2c_owners: dict[int, BusOwner],
+) -> SharedBus | OwnedBus | None:
+    """跨芯片批量事务的总线：两片扩展 IO 和 ADC 都直接挂在同一条 I2C 总线上时才可用。"""
+
+    if not config.i2c.batch_transfers or config.tca.backend != "smbus" or config.tca.bus != config.ads.bus:
+        return None
+    # 批次里有阀门写入，按安全优先级排队。
+    return _device_bus(i2c_buses, i2c_owners, config.ads.bus, I2C_PRIORITY_SAFETY)
+
+
+def _build_input_watcher(
+    io: TCA9555,
+    int_pin: tuple[str, int] | None,
+    consumer: str,
+) -> TcaInputWatcher | None:
+    """为配置了 INT 引脚的扩展板创建并启动输入监视器。"""
+
+    if int_pin is None:
+        return None
+    watcher = TcaInputWatcher(io, GpiodEdgeSource(int_pin, consumer=consumer, edge="falling"))
+    watcher.start()
+    return watcher
+
+
 def init_hardware(config: AppConfig = DEFAULT_CONFIG) -> HardwareContext:
     """完成底层驱动、引脚对象和上层硬件封装的整套初始化。"""
 
-    # 1. 初始化 I2C 设备。
-    valve_io = TCA9555(i2c_bus=config.tca.bus, addr=config.tca.valve_addr)
-    control_io = TCA9555(i2c_bus=config.tca.bus, addr=config.tca.control_addr)
-    ads1115 = ADS1115(i2c_bus=config.ads.bus, addr=config.ads.addr)
-    ads1115.set_gain(config.ads.gain)
+    if config.logging.lock_order_check:
+        enable_lock_order_check()
+
+    # 1. 初始化 I2C 总线与设备，同一总线上的设备共用一个带节流和重试的总线对象。
+    # 启用属主线程时阀门/控制 IO 按安全优先级排队，ADC 读数按液位判定优先级排队。
+    i2c_buses = _build_i2c_buses(config)
+    i2c_owners: dict[int, BusOwner] = {}
+    if config.i2c.owner_thread:
+        i2c_owners = {bus_num: BusOwner(bus, name=f"i2c-{bus_num}-owner") for bus_num, bus in i2c_buses.items()}
+        # 只有扩展 IO 的状态寄存器允许合并相邻写入，ADC 配置写入本身就会启动转换。
+        if config.tca.bus in i2c_owners:
+            for addr in (config.tca.valve_addr, config.tca.control_addr):
+                i2c_owners[config.tca.bus].allow_write_coalescing(addr, TCA9555_COALESCE_REGISTERS)
+    if config.ads.meter_streaming and config.ads.chips["meter"] == config.ads.chips["digest"]:
+        # 连续采样期间芯片由采样线程独占，消解读数不能再用同一片芯片。
+        raise ValueError("meter_streaming requires the meter optics on its own ADS1115 chip")
+    tca_bus = _device_bus(i2c_buses, i2c_owners, config.tca.bus, I2C_PRIORITY_SAFETY)
+    valve_io = _open_tca(config, config.tca.valve_addr, config.tca.valve_gpiochip, tca_bus)
+    control_io = _open_tca(config, config.tca.control_addr, config.tca.control_gpiochip, tca_bus)
+    adc_group = ADS1115Group.open(
+        config.ads.bus,
+        config.ads.chips,
+        bus=_device_bus(i2c_buses, i2c_owners, config.ads.bus, I2C_PRIORITY_LEVEL),
+    )
+    for chip in adc_group.devices:
+        chip.set_gain(config.ads.gain)
+        chip.set_data_rate(config.ads.data_rate)
+    for channel in (config.ads.meter_upper_channel, config.ads.meter_lower_channel):
+        adc_group.chip("meter").set_channel_profile(channel, config.ads.meter_profile)
+        adc_group.chip("meter").set_autorange(channel, config.ads.meter_autorange)
+    for channel in (config.ads.digest_measure_channel, config.ads.digest_reference_channel):
+        adc_group.chip("digest").set_channel_profile(channel, config.ads.digest_profile)
+        adc_group.chip("digest").set_autorange(channel, config.ads.digest_autorange)
+    if config.ads.digest_differential:
+        # 测量减参比的差分信号远小于单端读数，单独绑定配置和自动量程，不沿用实例的宽量程增益。
+        diff_channel, _ = differential_channel(config.ads.digest_measure_channel, config.ads.digest_reference_channel)
+        adc_group.chip("digest").set_channel_profile(diff_channel, config.ads.digest_profile, differential=True)
+        adc_group.chip("digest").set_autorange(diff_channel, config.ads.digest_autorange, differential=True)
+    ads1115 = adc_group.chip("meter")
+    if config.ads.alert_pin is not None:
+        # ALERT/RDY 接到本地 GPIO 时，用内核边沿事件代替 I2C 轮询等待转换完成。
+        ads1115.enable_ready_pin(
+            GpiodEdgeSource(config.ads.alert_pin, consumer="recipe_ads1115_rdy", edge="falling")
+        )
 
     # 2. 构建阀门与控制脚抽象。
     valves = _build_tca_pins(valve_io, config.tca.valve_pins)
@@ -298,29 +827,54 @@ def init_hardware(config: AppConfig = DEFAULT_CONFIG) -> HardwareContext:
     )
 
     # 5. 构建流程层实际使用的高层硬件对象。
-    valve = ValveBank(valve_io, config.tca.valve_pins)
+    valve = ValveBank(
+        valve_io,
+        config.tca.valve_pins,
+        make_before_break=config.tca.make_before_break_routes,
+        settle_model=ValveSettleModel.load(valve_settle_profile_path(config), config.timing.valve_settle_ms),
+    )
+    valve.define_route(DIGESTOR_ROUTE, config.recipe.digestor_valves)
+    if config.tca.scrub_interval_s is not None and config.tca.backend == "smbus":
+        valve_io.start_scrub(config.tca.scrub_interval_s)
+        control_io.start_scrub(config.tca.scrub_interval_s)
     meter_optics = MeterOptics(
-        ads1115,
+        adc_group.chip("meter"),
         upper_channel=config.ads.meter_upper_channel,
         lower_channel=config.ads.meter_lower_channel,
         upper_control_pin=optics_controls["meter_up"],
         lower_control_pin=optics_controls["meter_down"],
+        scan_discard=config.ads.scan_discard,
+        pipelined=config.ads.pipelined_reads,
+        block_samples=config.ads.block_samples,
+        block_reducer=config.ads.block_reducer,
+        streaming=config.ads.meter_streaming,
     )
     digest_optics = DigestOptics(
-        ads1115,
+        adc_group.chip("digest"),
         measure_channel=config.ads.digest_measure_channel,
         reference_channel=config.ads.digest_reference_channel,
         light_pin=optics_controls["digest_light"],
         ref_amp_pin=optics_controls["digest_ref_amp"],
         main_amp_pin=optics_controls["digest_main_amp"],
+        scan_discard=config.ads.scan_discard,
+        pipelined=config.ads.pipelined_reads,
+        block_samples=config.ads.block_samples,
+        block_reducer=config.ads.block_reducer,
+        differential=config.ads.digest_differential,
     )
     heater = HeaterControl(optics_controls["digest_heat"])
     temp_sensor = TemperatureSensor(max31865)
+    if config.ads.meter_streaming:
+        ads1115.start_streaming(meter_optics.channels)
+    # 配置了 INT 引脚的扩展板用中断通知输入变化，调用方通过 watch() 登记回调，空闲时不轮询 I2C。
+    valve_inputs = _build_input_watcher(valve_io, config.tca.valve_int_pin, "recipe_tca_valve_int")
+    control_inputs = _build_input_watcher(control_io, config.tca.control_int_pin, "recipe_tca_control_int")
 
     # 6. 汇总成统一上下文，便于主流程传递。
     return HardwareContext(
         valve_io=valve_io,
         control_io=control_io,
+        adc_group=adc_group,
         ads1115=ads1115,
         valves=valves,
         optics_controls=optics_controls,
@@ -333,6 +887,11 @@ def init_hardware(config: AppConfig = DEFAULT_CONFIG) -> HardwareContext:
         digest_optics=digest_optics,
         heater=heater,
         temp_sensor=temp_sensor,
+        valve_inputs=valve_inputs,
+        control_inputs=control_inputs,
+        i2c_buses=i2c_buses,
+        i2c_owners=i2c_owners,
+        i2c_batch_bus=_batch_bus(config, i2c_buses, i2c_owners),
     )
 
 
@@ -368,7 +927,7 @@ def cleanup_hardware(ctx: HardwareContext | None) -> None:
             pass
 
     try:
-        ctx.ads1115.close()
+        ctx.adc_group.close()
     except Exception:
         pass
 
@@ -382,6 +941,14 @@ def cleanup_hardware(ctx: HardwareContext | None) -> None:
     except Exception:
         pass
 
+    for watcher in (ctx.valve_inputs, ctx.control_inputs):
+        if watcher is None:
+            continue
+        try:
+            watcher.close()
+        except Exception:
+            pass
+
     try:
         ctx.valve_io.close()
     except Exception:
@@ -392,6 +959,19 @@ def cleanup_hardware(ctx: HardwareContext | None) -> None:
     except Exception:
         pass
 
+    # 设备都释放后先停属主线程（已排队的请求会先执行完），再关闭共用的总线句柄。
+    for owner in ctx.i2c_owners.values():
+        try:
+            owner.close()
+        except Exception:
+            pass
+
+    for bus in ctx.i2c_buses.values():
+        try:
+            bus.close()
+        except Exception:
+            pass
+
 
 def safe_shutdown(ctx: HardwareContext | None) -> None:
     """对外暴露的安全关机入口。"""
@@ -2,15 +2,21 @@ from __future__ import annotations
 
 import logging
 import math
+import signal
+import threading
 
 from config import DEFAULT_CONFIG, configure_logging
 from hardware import init_hardware, safe_shutdown
+from lib.device_lock import lock_contention_report, reset_lock_stats
 from primitives import (
+    CancelToken,
     DigestSignal,
+    RunCancelled,
     add_to_digestor,
     aerate_digestor,
     close_all_valves,
     empty_digestor,
+    enter_safe_state,
     flush_pipeline,
     heat_and_hold,
     read_digest_signal,
@@ -42,22 +48,47 @@ def compute_concentration(signal: DigestSignal, a: float = 1.0, b: float = 1.0)
     return (absorbance - a) / b
 
 
-def clean_system(ctx) -> None:
+def clean_system(ctx, cancel: CancelToken | None = None) -> None:
     """执行一轮系统清洗。"""
 
     recipe = DEFAULT_CONFIG.recipe
     timing = DEFAULT_CONFIG.timing
 
     logger.info("开始系统清洗")
-    add_to_digestor(ctx, recipe.clean_source, "large")
-    sleep_ms(timing.clean_pause_ms)
-    empty_digestor(ctx, recipe.waste_valve)
-    flush_pipeline(ctx, recipe.clean_source, recipe.waste_valve, times=3, volume="large")
+    add_to_digestor(ctx, recipe.clean_source, "large", cancel)
+    sleep_ms(timing.clean_pause_ms, cancel)
+    empty_digestor(ctx, recipe.waste_valve, cancel)
+    flush_pipeline(ctx, recipe.clean_source, recipe.waste_valve, times=3, volume="large", cancel=cancel)
     logger.info("系统清洗完成")
 
 
-def run_water_analysis(ctx, a: float | None = None, b: float | None = None) -> dict[str, float]:
-    """执行完整的水质分析流程。"""
+def run_water_analysis(
+    ctx,
+    a: float | None = None,
+    b: float | None = None,
+    cancel: CancelToken | None = None,
+) -> dict[str, float]:
+    """执行完整的水质分析流程。
+
+    传入 cancel 时流程中的每段等待都可被取消：取消后进入安全状态，记录从取消到安全状态的耗时，
+    再抛出 RunCancelled。
+    """
+
+    try:
+        return _run_water_analysis(ctx, a, b, cancel)
+    except RunCancelled:
+        enter_safe_state(ctx)
+        safe_ms = cancel.elapsed_ms()
+        budget_ms = DEFAULT_CONFIG.timing.cancel_safe_budget_ms
+        if safe_ms > budget_ms:
+            logger.warning("流程已取消（%s），从取消到安全状态 %.1f ms，超过 %s ms", cancel.reason, safe_ms, budget_ms)
+        else:
+            logger.info("流程已取消（%s），从取消到安全状态 %.1f ms", cancel.reason, safe_ms)
+        raise
+
+
+def _run_water_analysis(ctx, a: float | None, b: float | None, cancel: CancelToken | None) -> dict[str, float]:
+    """run_water_analysis() 的流程主体。"""
 
     recipe = DEFAULT_CONFIG.recipe
     timing = DEFAULT_CONFIG.timing
@@ -67,41 +98,43 @@ def run_water_analysis(ctx, a: float | None = None, b: float | None = None) -> d
 
     logger.info("开始执行水质分析流程")
     close_all_valves(ctx)
+    ctx.valve.reset_stats()
+    reset_lock_stats()
 
     # 1. 流程开始前先清洗一次系统。
-    clean_system(ctx)
+    clean_system(ctx, cancel)
 
     # 2. 依次加入样品和标准液。
-    rinse_to_waste(ctx, recipe.sample_source, recipe.waste_valve)
-    add_to_digestor(ctx, recipe.sample_source, "large")
-    rinse_to_waste(ctx, recipe.standard_source, recipe.waste_valve)
-    add_to_digestor(ctx, recipe.standard_source, "large")
+    rinse_to_waste(ctx, recipe.sample_source, recipe.waste_valve, cancel)
+    add_to_digestor(ctx, recipe.sample_source, "large", cancel)
+    rinse_to_waste(ctx, recipe.standard_source, recipe.waste_valve, cancel)
+    add_to_digestor(ctx, recipe.standard_source, "large", cancel)
 
     # 3. 加入试剂 A，并冲洗主通路。
-    rinse_to_waste(ctx, recipe.reagent_a_source, recipe.waste_valve)
-    add_to_digestor(ctx, recipe.reagent_a_source, "large")
-    flush_pipeline(ctx, recipe.flush_source, recipe.waste_valve, times=2, volume="large")
+    rinse_to_waste(ctx, recipe.reagent_a_source, recipe.waste_valve, cancel)
+    add_to_digestor(ctx, recipe.reagent_a_source, "large", cancel)
+    flush_pipeline(ctx, recipe.flush_source, recipe.waste_valve, times=2, volume="large", cancel=cancel)
 
     # 4. 进入加热消解阶段。
-    heat_and_hold(ctx, target_temp_c=recipe.digest_target_temp_c, hold_ms=timing.heat_hold_ms)
+    heat_and_hold(ctx, target_temp_c=recipe.digest_target_temp_c, hold_ms=timing.heat_hold_ms, cancel=cancel)
 
     # 5. 加入试剂 B。
-    rinse_to_waste(ctx, recipe.reagent_b_source, recipe.waste_valve)
-    add_to_digestor(ctx, recipe.reagent_b_source, "large")
-    flush_pipeline(ctx, recipe.flush_source, recipe.waste_valve, times=1, volume="large")
+    rinse_to_waste(ctx, recipe.reagent_b_source, recipe.waste_valve, cancel)
+    add_to_digestor(ctx, recipe.reagent_b_source, "large", cancel)
+    flush_pipeline(ctx, recipe.flush_source, recipe.waste_valve, times=1, volume="large", cancel=cancel)
 
     # 6. 静置反应，中途通气搅拌一次。
-    sleep_ms(timing.digest_settle_total_ms / 2)
-    aerate_digestor(ctx, timing.stir_duration_ms)
-    sleep_ms(timing.digest_settle_total_ms / 2)
+    sleep_ms(timing.digest_settle_total_ms / 2, cancel)
+    aerate_digestor(ctx, timing.stir_duration_ms, cancel)
+    sleep_ms(timing.digest_settle_total_ms / 2, cancel)
 
     # 7. 加入试剂 C，准备最终读数。
-    rinse_to_waste(ctx, recipe.reagent_c_source, recipe.waste_valve)
-    add_to_digestor(ctx, recipe.reagent_c_source, "large")
-    flush_pipeline(ctx, recipe.flush_source, recipe.waste_valve, times=2, volume="large")
+    rinse_to_waste(ctx, recipe.reagent_c_source, recipe.waste_valve, cancel)
+    add_to_digestor(ctx, recipe.reagent_c_source, "large", cancel)
+    flush_pipeline(ctx, recipe.flush_source, recipe.waste_valve, times=2, volume="large", cancel=cancel)
 
     # 8. 读取 6 个电压并计算结果。
-    signal = read_digest_signal(ctx)
+    signal = read_digest_signal(ctx, cancel)
     logger.info(
         "消解读数完成: vbias_m=%.6f vbias_r=%.6f vm_0=%.6f vr_0=%.6f vm_s=%.6f vr_s=%.6f",
         signal.vbias_m,
@@ -115,11 +148,20 @@ def run_water_analysis(ctx, a: float | None = None, b: float | None = None) -> d
     concentration = compute_concentration(signal, a=a, b=b)
 
     # 9. 排空并再次清洗，恢复安全状态。
-    empty_digestor(ctx, recipe.waste_valve)
-    clean_system(ctx)
+    empty_digestor(ctx, recipe.waste_valve, cancel)
+    clean_system(ctx, cancel)
     close_all_valves(ctx)
 
     logger.info("水质分析流程结束: absorbance=%.6f concentration=%.6f", absorbance, concentration)
+    logger.info(
+        "本轮阀门稳定等待 %.0f ms（%s 次路由调用，%s 次实际切换），比每次关阀、开阀各等 %s ms 节省 %.0f ms",
+        ctx.valve.settle_ms_total,
+        ctx.valve.route_calls,
+        ctx.valve.transitions,
+        timing.valve_settle_ms,
+        ctx.valve.settle_ms_saved,
+    )
+    log_lock_contention()
     return {
         "vbias_m": signal.vbias_m,
         "vbias_r": signal.vbias_r,
@@ -132,20 +174,60 @@ def run_water_analysis(ctx, a: float | None = None, b: float | None = None) -> d
     }
 
 
+def log_lock_contention() -> None:
+    """按累计等待时间列出发生过争用的设备锁。"""
+
+    contended = [stats for stats in lock_contention_report() if stats.contended]
+    if not contended:
+        logger.info("设备锁无争用")
+        return
+    for stats in contended:
+        logger.info(
+            "设备锁 %s: 获取 %s 次，其中等待 %s 次，累计 %.1f ms，平均 %.2f ms，最长 %.1f ms",
+            stats.name,
+            stats.acquisitions,
+            stats.contended,
+            stats.total_wait_s * 1000.0,
+            stats.mean_wait_s * 1000.0,
+            stats.max_wait_s * 1000.0,
+        )
+
+
+def install_cancel_signals(cancel: CancelToken) -> None:
+    """SIGINT / SIGTERM 改为取消流程。
+
+    信号处理函数运行在主线程、可能打断正持有设备锁的硬件操作，因此只起一个线程调用 `cancel()`，
+    停止回调在那个线程里按正常顺序等锁执行。
+    """
+
+    def handler(signum, frame) -> None:
+        reason = "signal %s" % signal.Signals(signum).name
+        threading.Thread(target=cancel.cancel, args=(reason,), daemon=True).start()
+
+    signal.signal(signal.SIGINT, handler)
+    signal.signal(signal.SIGTERM, handler)
+
+
 def main() -> None:
     """程序主入口。"""
 
     ctx = None
     configure_logging(DEFAULT_CONFIG)
+    cancel = CancelToken()
+    install_cancel_signals(cancel)
     try:
         ctx = init_hardware(DEFAULT_CONFIG)
         result = run_water_analysis(
             ctx,
             a=DEFAULT_CONFIG.analysis.calibration_a,
             b=DEFAULT_CONFIG.analysis.calibration_b,
+            cancel=cancel,
         )
         logger.info("最终结果 absorbance=%.6f", result["absorbance"])
         logger.info("最终结果 concentration=%.6f", result["concentration"])
+    except RunCancelled:
+        logger.warning("主流程已取消")
+        raise SystemExit(1)
     except Exception:
         logger.exception("主流程执行失败")
         raise
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import logging
 import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass
 
 from config import AppConfig, DEFAULT_CONFIG
-from hardware import HardwareContext
+from hardware import DIGESTOR_ROUTE, HardwareContext, ValveSettleModel
+from lib.i2c_bus import I2cBatch
+
+
+logger = logging.getLogger(__name__)
 
 
 # ==================== 异常与数据结构层 ====================
@@ -14,6 +20,8 @@ from hardware import HardwareContext
 # 不负责硬件操作，也不负责流程编排，作用是给后续动作提供统一表达。
 # 包含：
 # - RecipeError：流程执行中的业务异常。
+# - RunCancelled：流程被取消令牌中止。
+# - CancelToken：协作式取消令牌，贯穿全部等待。
 # - DigestSignal：一次光学读数得到的 6 个关键电压数据。
 class RecipeError(RuntimeError):
     """流程执行期间的业务异常。"""
@@ -21,6 +29,83 @@ class RecipeError(RuntimeError):
     pass
 
 
+class RunCancelled(RuntimeError):
+    """流程被 CancelToken 取消；抛出时所在元语已经停泵、关加热、关阀。"""
+
+    pass
+
+
+class CancelToken:
+    """协作式取消令牌。
+
+    元语里的每一段等待都通过令牌进行，`cancel()` 后正在进行的等待立即返回并抛出 `RunCancelled`，
+    沿途的 finally 负责停泵、关加热、关阀。泵、加热这类需要立即停下的输出另外用 `on_cancel()` 登记停止回调，
+    回调在调用 `cancel()` 的线程里执行，不必等流程线程走到下一次等待。
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+        self.reason = ""
+        self.cancelled_at: float | None = None  # time.monotonic() 时间戳
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """请求取消并执行已登记的停止回调，重复调用只生效一次。"""
+
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self.cancelled_at = time.monotonic()
+            callbacks = list(self._callbacks)
+            self._event.set()
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                logger.exception("cancel callback %r failed", callback)
+
+    def wait(self, seconds: float) -> bool:
+        """最多等待 seconds 秒，期间被取消时立即返回 True。"""
+
+        return self._event.wait(max(0.0, seconds))
+
+    def check(self) -> None:
+        """已取消时抛出 RunCancelled。"""
+
+        if self._event.is_set():
+            raise RunCancelled(self.reason)
+
+    def elapsed_ms(self) -> float:
+        """从 cancel() 到现在经过的毫秒数，未取消时为 0。"""
+
+        if self.cancelled_at is None:
+            return 0.0
+        return (time.monotonic() - self.cancelled_at) * 1000.0
+
+    @contextmanager
+    def on_cancel(self, callback: Callable[[], None]) -> Iterator[None]:
+        """在 with 块内登记停止回调；进入时已经取消则立即执行一次。"""
+
+        with self._lock:
+            fired = self._event.is_set()
+            if not fired:
+                self._callbacks.append(callback)
+        if fired:
+            callback()
+        try:
+            yield
+        finally:
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+
+
 @dataclass(frozen=True)
 class DigestSignal:
     """一次完整读数过程中采集到的 6 个关键电压。"""
@@ -37,41 +122,66 @@ class DigestSignal:
 # 这一层提供最基础的“时间”和“条件”能力，例如延时、轮询、稳定判定。
 # 它不关心具体是在判液位、温度还是别的状态，只负责抽象出可复用的等待机制。
 # 包含：
-# - sleep_ms()：毫秒级延时。
+# - sleep_ms()：毫秒级延时，传入取消令牌时可被中断。
 # - wait_until()：在超时前循环检查条件是否成立。
 # - stable_truth()：要求条件连续多次成立，过滤瞬时抖动。
-def sleep_ms(ms: int | float) -> None:
-    """毫秒级等待封装。"""
-
-    time.sleep(float(ms) / 1000.0)
-
-
-def wait_until(cond_fn: Callable[[], bool], timeout_ms: int, poll_ms: int = 50) -> bool:
+# - _cancel_hook()：在一段动作期间登记取消时的停止回调。
+# 下面所有元语都接受可选的 cancel 参数，不传时行为与原来一致。
+def sleep_ms(ms: int | float, cancel: CancelToken | None = None) -> None:
+    """毫秒级等待封装；传入 cancel 时等待期间被取消立即抛出 RunCancelled。"""
+
+    if cancel is None:
+        time.sleep(float(ms) / 1000.0)
+        return
+    if cancel.wait(float(ms) / 1000.0):
+        raise RunCancelled(cancel.reason)
+
+
+def wait_until(
+    cond_fn: Callable[[], bool],
+    timeout_ms: int,
+    poll_ms: int = 50,
+    cancel: CancelToken | None = None,
+) -> bool:
     """在超时前持续轮询某个条件是否成立。"""
 
     deadline = time.monotonic() + timeout_ms / 1000.0
     while time.monotonic() < deadline:
         if cond_fn():
             return True
-        sleep_ms(poll_ms)
+        sleep_ms(poll_ms, cancel)
     return cond_fn()
 
 
-def stable_truth(cond_fn: Callable[[], bool], config: AppConfig = DEFAULT_CONFIG) -> bool:
+def stable_truth(
+    cond_fn: Callable[[], bool],
+    config: AppConfig = DEFAULT_CONFIG,
+    cancel: CancelToken | None = None,
+) -> bool:
     """要求条件连续多次成立，降低传感器抖动带来的误判。"""
 
     for _ in range(config.timing.stable_sample_count):
         if not cond_fn():
             return False
-        sleep_ms(config.timing.stable_sample_period_ms)
+        sleep_ms(config.timing.stable_sample_period_ms, cancel)
     return True
 
 
+def _cancel_hook(cancel: CancelToken | None, callback: Callable[[], None]):
+    """cancel 为 None 时不登记任何回调。"""
+
+    if cancel is None:
+        return nullcontext()
+    return cancel.on_cancel(callback)
+
+
 # ==================== 液路状态判定层 ====================
 # 这一层把底层传感器读数转换成流程可用的状态语义。
 # 例如“计量单元已满”“计量单元已空”，上层动作只依赖这些判断，不直接碰阈值细节。
 # 包含：
 # - close_all_valves()：统一关闭全部液路阀门。
+# - enter_safe_state()：停泵、关加热、关阀，取消或异常后恢复安全状态。
+# - meter_full_target_mv()：由基准电压算出判满目标电压。
 # - is_meter_full()：判断计量单元是否达到大/小体积目标液位。
 # - is_meter_empty()：判断计量单元是否已经排空。
 def close_all_valves(ctx: HardwareContext) -> None:
@@ -80,33 +190,54 @@ def close_all_valves(ctx: HardwareContext) -> None:
     ctx.valve.close_all()
 
 
-def is_meter_full(ctx: HardwareContext, volume: str, baseline_mv: float | None = None) -> bool:
+def enter_safe_state(ctx: HardwareContext) -> None:
+    """停泵、关加热并关闭全部液路阀门。"""
+
+    ctx.pump.stop()
+    ctx.heater.off()
+    close_all_valves(ctx)
+
+
+def meter_full_target_mv(baseline_mv: float) -> float:
+    """判满目标电压：基准电压上升 voltage_change_percent 即视为到位。"""
+
+    change_pct = DEFAULT_CONFIG.thresholds.voltage_change_percent / 100.0  # 转换为小数
+    return baseline_mv * (1 + change_pct)
+
+
+def is_meter_full(
+    ctx: HardwareContext,
+    volume: str,
+    baseline_mv: float | None = None,
+    cancel: CancelToken | None = None,
+) -> bool:
     """判断计量单元是否达到目标液位。
     
     baseline_mv 为吸液前读取的固定基准电压，若不传则实时读取。
     当电压上升百分比超过阈值时判定到位。
     """
-    thresholds = DEFAULT_CONFIG.thresholds
-    change_pct = thresholds.voltage_change_percent / 100.0  # 转换为小数
-    
     if volume == "large":
-        baseline = baseline_mv if baseline_mv is not None else ctx.meter_optics.read_upper_mv()
+        baseline = baseline_mv if baseline_mv is not None else ctx.meter_optics.read_upper_average_mv()
         if baseline == 0:
             return False  # 避免除零
-        target_mv = baseline * (1 + change_pct)  # 电压上升到该值视为到位
-        return stable_truth(lambda: ctx.meter_optics.read_upper_mv() >= target_mv)
+        target_mv = meter_full_target_mv(baseline)  # 电压上升到该值视为到位
+        return stable_truth(lambda: ctx.meter_optics.read_upper_mv() >= target_mv, cancel=cancel)
     
     if volume == "small":
-        baseline = baseline_mv if baseline_mv is not None else ctx.meter_optics.read_lower_mv()
+        baseline = baseline_mv if baseline_mv is not None else ctx.meter_optics.read_lower_average_mv()
         if baseline == 0:
             return False  # 避免除零
-        target_mv = baseline * (1 + change_pct)  # 电压上升到该值视为到位
-        return stable_truth(lambda: ctx.meter_optics.read_lower_mv() >= target_mv)
+        target_mv = meter_full_target_mv(baseline)  # 电压上升到该值视为到位
+        return stable_truth(lambda: ctx.meter_optics.read_lower_mv() >= target_mv, cancel=cancel)
     
     raise ValueError(f"unsupported volume: {volume}")
 
 
-def is_meter_empty(ctx: HardwareContext, baseline_mv: float | None = None) -> bool:
+def is_meter_empty(
+    ctx: HardwareContext,
+    baseline_mv: float | None = None,
+    cancel: CancelToken | None = None,
+) -> bool:
     """判断计量单元是否已经排空。
     
     baseline_mv 为排液前读取的固定基准电压（有液状态），若不传则实时读取。
@@ -115,45 +246,46 @@ def is_meter_empty(ctx: HardwareContext, baseline_mv: float | None = None) -> bo
     thresholds = DEFAULT_CONFIG.thresholds
     change_pct = thresholds.voltage_change_percent / 100.0  # 转换为小数
     
-    baseline = baseline_mv if baseline_mv is not None else ctx.meter_optics.read_upper_mv()
+    baseline = baseline_mv if baseline_mv is not None else ctx.meter_optics.read_upper_average_mv()
     if baseline == 0:
         return False  # 避免除零
     target_mv = baseline * (1 - change_pct)  # 电压下降到该值视为排空
-    return stable_truth(lambda: ctx.meter_optics.read_upper_mv() <= target_mv)
+    return stable_truth(lambda: ctx.meter_optics.read_upper_mv() <= target_mv, cancel=cancel)
 
 
 # ==================== 液路路由元语层 ====================
 # 这一层只负责把液路切到指定方向，也就是决定哪些阀门该开、哪些该关。
 # 它只做通路建立，不做吸液、排液，不等待液位结果，是更纯粹的“路由原语”。
+# 路由输出字由 ValveBank 预先算好，切换时只与当前状态比较：已经是目标通路时不写入也不等待，
+# 否则按路由规则（先断后通 / 先通后断）切换，再按稳定时间模型等待这次动作的阀门中最慢的一个；
+# 需要两步切换时，中间字按先动作那批阀门的稳定时间保持，这段等待同样可被取消。
 # 包含：
+# - _valve_wait()：把取消令牌包装成 ValveBank 中间字保持用的等待函数。
 # - route_source_to_meter()：建立“液源 -> 计量单元”通路。
 # - route_meter_to_targets()：建立“计量单元 -> 目标端”通路。
 # - route_digestor_to_meter()：建立“消解器 -> 计量单元”通路。
-def route_source_to_meter(ctx: HardwareContext, source_name: str) -> None:
+def _valve_wait(cancel: CancelToken | None) -> Callable[[float], None]:
+    """ValveBank 两步切换时中间字的保持等待，走 sleep_ms() 以便取消。"""
+
+    return lambda ms: sleep_ms(ms, cancel)
+
+
+def route_source_to_meter(ctx: HardwareContext, source_name: str, cancel: CancelToken | None = None) -> None:
     """切换液路到"液源 -> 计量单元"方向。"""
 
-    close_all_valves(ctx)
-    sleep_ms(DEFAULT_CONFIG.timing.valve_settle_ms)
-    ctx.valve.open([source_name])
-    sleep_ms(DEFAULT_CONFIG.timing.valve_settle_ms)
+    sleep_ms(ctx.valve.apply_route(source_name, _valve_wait(cancel)), cancel)
 
 
-def route_meter_to_targets(ctx: HardwareContext, targets: list[str]) -> None:
+def route_meter_to_targets(ctx: HardwareContext, targets: list[str], cancel: CancelToken | None = None) -> None:
     """切换液路到"计量单元 -> 目标端"方向。"""
 
-    close_all_valves(ctx)
-    sleep_ms(DEFAULT_CONFIG.timing.valve_settle_ms)
-    ctx.valve.open(targets)
-    sleep_ms(DEFAULT_CONFIG.timing.valve_settle_ms)
+    sleep_ms(ctx.valve.apply_valves(targets, _valve_wait(cancel)), cancel)
 
 
-def route_digestor_to_meter(ctx: HardwareContext) -> None:
+def route_digestor_to_meter(ctx: HardwareContext, cancel: CancelToken | None = None) -> None:
     """切换液路到"消解器 -> 计量单元"方向。"""
 
-    close_all_valves(ctx)
-    sleep_ms(DEFAULT_CONFIG.timing.valve_settle_ms)
-    ctx.valve.open(list(DEFAULT_CONFIG.recipe.digestor_valves))
-    sleep_ms(DEFAULT_CONFIG.timing.valve_settle_ms)
+    sleep_ms(ctx.valve.apply_route(DIGESTOR_ROUTE, _valve_wait(cancel)), cancel)
 
 
 # ==================== 执行动作元语层 ====================
@@ -161,6 +293,7 @@ def route_digestor_to_meter(ctx: HardwareContext) -> None:
 # 比如吸液、排液、加样、冲洗都在这里实现，但仍然不承载完整实验流程编排。
 # 包含：
 # - start_pump_in_background()：在后台线程启动连续泵动作。
+# - pump_until_meter_trip()：连续泵送，由 ADS1115 硬件窗口比较器触发停泵。
 # - aspirate()：从指定液源吸液到计量单元。
 # - dispense()：把计量单元中的液体排到目标端。
 # - add_to_digestor()：把指定液体经计量单元加入消解器。
@@ -174,7 +307,109 @@ def start_pump_in_background(pump_action: Callable[[], None]) -> threading.Threa
     return worker
 
 
-def aspirate(ctx: HardwareContext, source_name: str, volume: str) -> None:
+def _start_pump(
+    ctx: HardwareContext,
+    pump_action: Callable[[], None],
+    cancel: CancelToken | None,
+) -> threading.Thread:
+    """先 arm() 再检查取消，最后在后台启动泵：此后无论取消回调还是 finally 里的 stop() 先到，泵都会停下。"""
+
+    ctx.pump.arm()
+    if cancel is not None:
+        cancel.check()
+    return start_pump_in_background(pump_action)
+
+
+def pump_until_meter_trip(
+    ctx: HardwareContext,
+    pump_action: Callable[[], None],
+    volume: str,
+    baseline_mv: float,
+    timeout_ms: int,
+    cancel: CancelToken | None = None,
+) -> bool:
+    """连续泵送，直到 ADS1115 窗口比较器在计量通道上触发并复核到位。
+
+    阈值与 is_meter_full() 相同（baseline × (1 + voltage_change_percent)），
+    由芯片在连续转换中自行比较，连续 comparator_consecutive 次超限 ALERT 才拉低，边沿一到立即停泵，
+    不再依赖 Python 轮询。停泵后再用 stable_truth() 读取比较器通道复核液位，与轮询判满同样要求连续多次成立；
+    复核不通过（气泡、光源闪烁）时重新启动泵继续等待。要求 ADS1115 已启用 ALERT/RDY 边沿来源。
+    传入 cancel 时边沿等待按 cancel_poll_ms 分段，每段之间检查取消。
+    """
+
+    if volume == "large":
+        channel = DEFAULT_CONFIG.ads.meter_upper_channel
+    elif volume == "small":
+        channel = DEFAULT_CONFIG.ads.meter_lower_channel
+    else:
+        raise ValueError(f"unsupported volume: {volume}")
+    if baseline_mv <= 0:
+        return False  # 与 is_meter_full 一致，基准无效时不判满
+
+    ads = ctx.ads1115
+    target_raw = ads.voltage_to_raw(meter_full_target_mv(baseline_mv), channel)
+    poll_s = DEFAULT_CONFIG.timing.cancel_poll_ms / 1000.0
+    deadline = time.monotonic() + timeout_ms / 1000.0
+    ads.arm_comparator(
+        channel,
+        high_raw=target_raw,
+        data_rate=DEFAULT_CONFIG.ads.comparator_data_rate,
+        consecutive=DEFAULT_CONFIG.ads.comparator_consecutive,
+    )
+    try:
+        with _cancel_hook(cancel, ctx.pump.stop):
+            while True:
+                worker = _start_pump(ctx, pump_action, cancel)
+                try:
+                    tripped = False
+                    while not tripped:
+                        remaining_s = deadline - time.monotonic()
+                        if remaining_s <= 0:
+                            break
+                        if cancel is not None:
+                            cancel.check()
+                            remaining_s = min(remaining_s, poll_s)
+                        tripped = ads.wait_comparator(remaining_s) is not None
+                finally:
+                    ctx.pump.stop()
+                    worker.join(timeout=2.0)
+                if not tripped:
+                    return False
+                # 读取转换寄存器同时清除锁存，液位仍在阈值之上时比较器会再次触发，不影响复核。
+                if stable_truth(lambda: ads.read_comparator_raw() >= target_raw, cancel=cancel):
+                    return True
+                logger.warning("计量通道 %s 比较器触发后复核未到位，继续泵送", channel)
+                if time.monotonic() >= deadline:
+                    return False
+    finally:
+        ads.disarm_comparator()
+
+
+def _pump_until_meter_full(
+    ctx: HardwareContext,
+    pump_action: Callable[[], None],
+    volume: str,
+    baseline_mv: float,
+    timeout_ms: int,
+    cancel: CancelToken | None = None,
+) -> bool:
+    """连续泵送直到计量单元到位：接了 ALERT/RDY 且未在连续采样时走硬件比较器，否则轮询判满。"""
+
+    if ctx.ads1115.ready_pin_enabled and not ctx.ads1115.is_streaming:
+        return pump_until_meter_trip(ctx, pump_action, volume, baseline_mv, timeout_ms, cancel)
+
+    with _cancel_hook(cancel, ctx.pump.stop):
+        worker = _start_pump(ctx, pump_action, cancel)
+        try:
+            return wait_until(
+                lambda: is_meter_full(ctx, volume, baseline_mv, cancel), timeout_ms, poll_ms=50, cancel=cancel
+            )
+        finally:
+            ctx.pump.stop()
+            worker.join(timeout=2.0)
+
+
+def aspirate(ctx: HardwareContext, source_name: str, volume: str, cancel: CancelToken | None = None) -> None:
     """从指定液源吸液到计量单元。
 
     流程：
@@ -182,8 +417,8 @@ def aspirate(ctx: HardwareContext, source_name: str, volume: str) -> None:
     2. 开灯并等待光路稳定
     3. 读取当前空管基准电压
     4. 后台启动连续吸液
-    5. 轮询液位是否到达目标位置
-    6. 无论成功或失败，都停泵并关闭阀门
+    5. 等待液位到达目标位置（硬件比较器触发或轮询判满）
+    6. 无论成功、失败或取消，都停泵并关闭阀门
     """
 
     timeout_ms = (
@@ -192,62 +427,87 @@ def aspirate(ctx: HardwareContext, source_name: str, volume: str) -> None:
         else DEFAULT_CONFIG.timing.take_small_timeout_ms
     )
 
-    route_source_to_meter(ctx, source_name)
-    ctx.meter_optics.light_on()
-    sleep_ms(DEFAULT_CONFIG.timing.optics_warmup_ms)
-    if volume == "large":
-        baseline = ctx.meter_optics.read_upper_mv()
-    else:
-        baseline = ctx.meter_optics.read_lower_mv()
-    worker = start_pump_in_background(ctx.pump.aspirate_continuous)
     try:
-        ok = wait_until(lambda: is_meter_full(ctx, volume, baseline), timeout_ms, poll_ms=50)
+        if ctx.i2c_batch_bus is not None:
+            # 阀门切换、开灯和基准通道进入连续转换合成一次 I2C_RDWR，阀门稳定与光路预热同时等待。
+            # 入批的芯片锁一直持有到执行结束，中途出错时由 with 释放。
+            with I2cBatch() as batch:
+                settle_ms = ctx.valve.queue_route(batch, source_name, _valve_wait(cancel))
+                ctx.meter_optics.queue_light_on(batch)
+                if volume == "large":
+                    ctx.meter_optics.queue_start_upper(batch)
+                else:
+                    ctx.meter_optics.queue_start_lower(batch)
+                batch.execute(ctx.i2c_batch_bus)
+            sleep_ms(max(settle_ms, DEFAULT_CONFIG.timing.optics_warmup_ms), cancel)
+        else:
+            route_source_to_meter(ctx, source_name, cancel)
+            ctx.meter_optics.light_on()
+            sleep_ms(DEFAULT_CONFIG.timing.optics_warmup_ms, cancel)
+        if volume == "large":
+            baseline = ctx.meter_optics.read_upper_average_mv()
+        else:
+            baseline = ctx.meter_optics.read_lower_average_mv()
+        ok = _pump_until_meter_full(ctx, ctx.pump.aspirate_continuous, volume, baseline, timeout_ms, cancel)
     finally:
-        ctx.pump.stop()
-        worker.join(timeout=2.0)
         close_all_valves(ctx)
 
     if not ok:
         raise RecipeError(f"aspirate timeout: source={source_name}, volume={volume}")
 
 
-def dispense(ctx: HardwareContext, targets: list[str]) -> None:
+def dispense(ctx: HardwareContext, targets: list[str], cancel: CancelToken | None = None) -> None:
     """将计量单元中的液体排到目标端。"""
 
-    route_meter_to_targets(ctx, targets)
-    # 排液前读取固定基准电压（有液状态），避免轮询过程中基准漂移
-    baseline = ctx.meter_optics.read_upper_mv()
-    worker = start_pump_in_background(ctx.pump.dispense_continuous)
     try:
-        ok = wait_until(
-            lambda: is_meter_empty(ctx, baseline),
-            DEFAULT_CONFIG.timing.dispense_timeout_ms,
-            poll_ms=50,
-        )
+        if ctx.i2c_batch_bus is not None:
+            with I2cBatch() as batch:
+                settle_ms = ctx.valve.queue_valves(batch, targets, _valve_wait(cancel))
+                ctx.meter_optics.queue_start_upper(batch)
+                batch.execute(ctx.i2c_batch_bus)
+            sleep_ms(settle_ms, cancel)
+        else:
+            route_meter_to_targets(ctx, targets, cancel)
+        # 排液前读取固定基准电压（有液状态），避免轮询过程中基准漂移
+        baseline = ctx.meter_optics.read_upper_average_mv()
+        with _cancel_hook(cancel, ctx.pump.stop):
+            worker = _start_pump(ctx, ctx.pump.dispense_continuous, cancel)
+            try:
+                ok = wait_until(
+                    lambda: is_meter_empty(ctx, baseline, cancel),
+                    DEFAULT_CONFIG.timing.dispense_timeout_ms,
+                    poll_ms=50,
+                    cancel=cancel,
+                )
+            finally:
+                ctx.pump.stop()
+                worker.join(timeout=2.0)
+
+            if not ok:
+                raise RecipeError(f"dispense timeout: targets={targets}")
+
+            ctx.pump.arm()
+            if cancel is not None:
+                cancel.check()
+            ctx.pump.dispense_time(DEFAULT_CONFIG.timing.supplement_blow_ms / 1000.0)
+            if cancel is not None:
+                cancel.check()  # 补吹被取消回调提前停下时不算完成
     finally:
-        ctx.pump.stop()
-        worker.join(timeout=2.0)
-
-    if not ok:
         close_all_valves(ctx)
-        raise RecipeError(f"dispense timeout: targets={targets}")
-
-    ctx.pump.dispense_time(DEFAULT_CONFIG.timing.supplement_blow_ms / 1000.0)
-    close_all_valves(ctx)
 
 
-def add_to_digestor(ctx: HardwareContext, source_name: str, volume: str) -> None:
+def add_to_digestor(ctx: HardwareContext, source_name: str, volume: str, cancel: CancelToken | None = None) -> None:
     """将指定液体通过计量单元送入消解器。"""
 
-    aspirate(ctx, source_name, volume)
-    dispense(ctx, list(DEFAULT_CONFIG.recipe.digestor_valves))
+    aspirate(ctx, source_name, volume, cancel)
+    dispense(ctx, list(DEFAULT_CONFIG.recipe.digestor_valves), cancel)
 
 
-def rinse_to_waste(ctx: HardwareContext, source_name: str, waste_name: str) -> None:
+def rinse_to_waste(ctx: HardwareContext, source_name: str, waste_name: str, cancel: CancelToken | None = None) -> None:
     """用小体积液体润洗当前支路后排到废液。"""
 
-    aspirate(ctx, source_name, "small")
-    dispense(ctx, [waste_name])
+    aspirate(ctx, source_name, "small", cancel)
+    dispense(ctx, [waste_name], cancel)
 
 
 def flush_pipeline(
@@ -256,13 +516,14 @@ def flush_pipeline(
     waste_name: str,
     times: int,
     volume: str,
+    cancel: CancelToken | None = None,
 ) -> None:
     """重复执行吸液与排废，完成主通路冲洗。"""
 
     for _ in range(times):
-        aspirate(ctx, source_name, volume)
-        dispense(ctx, [waste_name])
-        sleep_ms(200)
+        aspirate(ctx, source_name, volume, cancel)
+        dispense(ctx, [waste_name], cancel)
+        sleep_ms(200, cancel)
 
 
 # ==================== 消解器操作元语层 ====================
@@ -272,43 +533,47 @@ def flush_pipeline(
 # - pull_digestor_to_meter()：把消解器中的液体回抽到计量单元。
 # - empty_digestor()：将消解器内容物排到指定废液端。
 # - aerate_digestor()：向消解器通气，用于搅拌或曝气。
-def pull_digestor_to_meter(ctx: HardwareContext) -> None:
+def pull_digestor_to_meter(ctx: HardwareContext, cancel: CancelToken | None = None) -> None:
     """将消解器中的液体回抽到计量单元。"""
 
-    route_digestor_to_meter(ctx)
-    # 回抽前读取固定基准电压（空管状态）
-    baseline = ctx.meter_optics.read_upper_mv()
-    worker = start_pump_in_background(ctx.pump.aspirate_continuous)
     try:
-        ok = wait_until(
-            lambda: is_meter_full(ctx, "large", baseline),
+        route_digestor_to_meter(ctx, cancel)
+        # 回抽前读取固定基准电压（空管状态）
+        baseline = ctx.meter_optics.read_upper_average_mv()
+        ok = _pump_until_meter_full(
+            ctx,
+            ctx.pump.aspirate_continuous,
+            "large",
+            baseline,
             DEFAULT_CONFIG.timing.pull_digestor_timeout_ms,
-            poll_ms=50,
+            cancel,
         )
     finally:
-        ctx.pump.stop()
-        worker.join(timeout=2.0)
         close_all_valves(ctx)
 
     if not ok:
         raise RecipeError("pull digestor timeout")
 
 
-def empty_digestor(ctx: HardwareContext, waste_name: str) -> None:
+def empty_digestor(ctx: HardwareContext, waste_name: str, cancel: CancelToken | None = None) -> None:
     """排空消解器内容物。"""
 
-    pull_digestor_to_meter(ctx)
-    dispense(ctx, [waste_name])
+    pull_digestor_to_meter(ctx, cancel)
+    dispense(ctx, [waste_name], cancel)
 
 
-def aerate_digestor(ctx: HardwareContext, duration_ms: int) -> None:
+def aerate_digestor(ctx: HardwareContext, duration_ms: int, cancel: CancelToken | None = None) -> None:
     """向消解器通气搅拌一段时间。"""
 
-    close_all_valves(ctx)
-    ctx.valve.open(list(DEFAULT_CONFIG.recipe.digestor_valves))
-    sleep_ms(DEFAULT_CONFIG.timing.valve_settle_ms)
     try:
-        ctx.pump.dispense_time(duration_ms / 1000.0)
+        route_digestor_to_meter(ctx, cancel)
+        with _cancel_hook(cancel, ctx.pump.stop):
+            ctx.pump.arm()
+            if cancel is not None:
+                cancel.check()
+            ctx.pump.dispense_time(duration_ms / 1000.0)
+            if cancel is not None:
+                cancel.check()
     finally:
         close_all_valves(ctx)
 
@@ -333,31 +598,44 @@ def _set_heater_for_target(
         ctx.heater.off()
 
 
-def heat_and_hold(ctx: HardwareContext, target_temp_c: float, hold_ms: int) -> None:
-    """加热到目标温度后再保温指定时长。"""
+def heat_and_hold(
+    ctx: HardwareContext,
+    target_temp_c: float,
+    hold_ms: int,
+    cancel: CancelToken | None = None,
+) -> None:
+    """加热到目标温度后再保温指定时长。
+
+    传入 cancel 时取消回调直接关加热，不必等正在进行的温度转换结束。
+    """
 
     timing = DEFAULT_CONFIG.timing
     hysteresis_c = DEFAULT_CONFIG.temperature.heater_hysteresis_c
     poll_ms = timing.heat_poll_ms
     heat_deadline = time.monotonic() + timing.heat_up_timeout_ms / 1000.0
 
-    try:
-        while True:
-            current_temp_c = ctx.temp_sensor.read_temperature_c()
-            _set_heater_for_target(ctx, current_temp_c, target_temp_c, hysteresis_c)
-            if current_temp_c >= target_temp_c:
-                break
-            if time.monotonic() >= heat_deadline:
-                raise RecipeError(f"heat timeout: target_temp_c={target_temp_c}")
-            sleep_ms(poll_ms)
-
-        hold_deadline = time.monotonic() + hold_ms / 1000.0
-        while time.monotonic() < hold_deadline:
-            current_temp_c = ctx.temp_sensor.read_temperature_c()
-            _set_heater_for_target(ctx, current_temp_c, target_temp_c, hysteresis_c)
-            sleep_ms(poll_ms)
-    finally:
-        ctx.heater.off()
+    with _cancel_hook(cancel, ctx.heater.off):
+        try:
+            while True:
+                current_temp_c = ctx.temp_sensor.read_temperature_c()
+                if cancel is not None:
+                    cancel.check()  # 转换期间被取消时不再开加热
+                _set_heater_for_target(ctx, current_temp_c, target_temp_c, hysteresis_c)
+                if current_temp_c >= target_temp_c:
+                    break
+                if time.monotonic() >= heat_deadline:
+                    raise RecipeError(f"heat timeout: target_temp_c={target_temp_c}")
+                sleep_ms(poll_ms, cancel)
+
+            hold_deadline = time.monotonic() + hold_ms / 1000.0
+            while time.monotonic() < hold_deadline:
+                current_temp_c = ctx.temp_sensor.read_temperature_c()
+                if cancel is not None:
+                    cancel.check()
+                _set_heater_for_target(ctx, current_temp_c, target_temp_c, hysteresis_c)
+                sleep_ms(poll_ms, cancel)
+        finally:
+            ctx.heater.off()
 
 
 # ==================== 光学读数元语层 ====================
@@ -365,7 +643,7 @@ def heat_and_hold(ctx: HardwareContext, target_temp_c: float, hold_ms: int) -> N
 # 它输出的是浓度计算所需的原始电压，不直接承担吸光度或浓度公式计算。
 # 包含：
 # - read_digest_signal()：按固定顺序采集 Vbias、空白和样品三组电压。
-def read_digest_signal(ctx: HardwareContext) -> DigestSignal:
+def read_digest_signal(ctx: HardwareContext, cancel: CancelToken | None = None) -> DigestSignal:
     """按约定流程读取浓度计算所需的 6 个电压。"""
 
     optics = ctx.digest_optics
@@ -373,24 +651,25 @@ def read_digest_signal(ctx: HardwareContext) -> DigestSignal:
     # 1. 断开放大通道，测量两路 Vbias。
     optics.light_off()
     optics.disconnect_paths()
-    sleep_ms(DEFAULT_CONFIG.timing.optics_warmup_ms)
-    vbias_m = optics.read_measure_mv()
-    vbias_r = optics.read_reference_mv()
+    sleep_ms(DEFAULT_CONFIG.timing.optics_warmup_ms, cancel)
+    # 每组读数两路交替转换一块采样再各自稳健平均，两路采样落在同一时间窗内；
+    # 差分模式下两路为参比单端和测量减参比差分，测量值由两者相加得到。
+    vbias_m, vbias_r = optics.read_pair_average_mv()
 
     # 2. 闭合通道并关闭光源，读取暗电流/空白电压。
     optics.connect_paths()
     optics.light_off()
-    sleep_ms(DEFAULT_CONFIG.timing.optics_warmup_ms)
-    vm_0 = optics.read_measure_mv()
-    vr_0 = optics.read_reference_mv()
+    sleep_ms(DEFAULT_CONFIG.timing.optics_warmup_ms, cancel)
+    vm_0, vr_0 = optics.read_pair_average_mv()
 
     # 3. 闭合通道并打开光源，读取样品电压。
     optics.connect_paths()
     optics.light_on()
-    sleep_ms(DEFAULT_CONFIG.timing.optics_warmup_ms)
-    vm_s = optics.read_measure_mv()
-    vr_s = optics.read_reference_mv()
-    optics.light_off()
+    try:
+        sleep_ms(DEFAULT_CONFIG.timing.optics_warmup_ms, cancel)
+        vm_s, vr_s = optics.read_pair_average_mv()
+    finally:
+        optics.light_off()
 
     return DigestSignal(
         vbias_m=vbias_m,
@@ -400,3 +679,104 @@ def read_digest_signal(ctx: HardwareContext) -> DigestSignal:
         vm_s=vm_s,
         vr_s=vr_s,
     )
+
+
+# ==================== 阀门稳定时间标定层 ====================
+# 这一层用计量单元光路读数标定每个阀门打开 / 关闭后液面扰动平息所需的时间，
+# 结果写入 ValveSettleModel，路由元语据此只等待实际需要的时长。
+# 标定前计量单元里要有液体（例如先小体积吸液），阀门动作引起的液面扰动才会反映在光路读数上。
+# 包含：
+# - wait_meter_quiet()：等待阀门动作引起的读数扰动平息，返回平稳开始的时间；没有扰动时返回 None。
+# - calibrate_valve_settle()：逐阀、逐方向标定稳定时间。
+def wait_meter_quiet(
+    ctx: HardwareContext,
+    max_ms: float,
+    quiet_mv: float = 2.0,
+    quiet_samples: int = 5,
+    baseline_mv: float | None = None,
+    cancel: CancelToken | None = None,
+) -> float | None:
+    """轮询计量单元上液位电压，先等到读数偏离 baseline_mv 超过 quiet_mv（阀门动作确实扰动了液面），
+    再等连续 quiet_samples 次读数的极差不超过 quiet_mv 即视为平稳。
+
+    返回从调用时刻到平稳窗口第一个读数的毫秒数；扰动后 max_ms 内一直不平稳时返回 max_ms；
+    max_ms 内始终没有超过 quiet_mv 的扰动时返回 None。baseline_mv 不传时取第一个读数。
+    """
+
+    start = time.monotonic()
+    window: list[tuple[float, float]] = []
+    disturbed = False
+    while True:
+        if cancel is not None:
+            cancel.check()
+        elapsed_ms = (time.monotonic() - start) * 1000.0
+        value = ctx.meter_optics.read_upper_mv()
+        if baseline_mv is None:
+            baseline_mv = value
+        if not disturbed and abs(value - baseline_mv) > quiet_mv:
+            disturbed = True
+        if disturbed:
+            window.append((elapsed_ms, value))
+            window = window[-quiet_samples:]
+            if len(window) == quiet_samples:
+                values = [sample for _, sample in window]
+                if max(values) - min(values) <= quiet_mv:
+                    return window[0][0]
+        if elapsed_ms >= max_ms:
+            return max_ms if disturbed else None
+
+
+def calibrate_valve_settle(
+    ctx: HardwareContext,
+    valves: list[str] | None = None,
+    repeats: int = 3,
+    max_ms: float | None = None,
+    quiet_mv: float = 2.0,
+    min_ms: float = 5.0,
+    cancel: CancelToken | None = None,
+) -> ValveSettleModel:
+    """逐阀标定打开、关闭两个方向的稳定时间，写回 ctx.valve.settle_model 并返回。
+
+    每次先切到相反状态并等满 max_ms，读一次基准，再动作一次阀门并测量扰动平息的时间；
+    取 repeats 次中测到扰动的最大值乘 valve_settle_margin，且不低于 min_ms。
+    某个方向一次扰动都没测到时（阀门动作不影响光路读数）不采用标定值，该方向保持 valve_settle_ms 并记日志。
+    整个标定可能持续数分钟，传入 cancel 时每段等待和每次读数之间都可取消。
+    """
+
+    timing = DEFAULT_CONFIG.timing
+    max_ms = timing.valve_settle_ms * 4 if max_ms is None else max_ms
+    names = list(DEFAULT_CONFIG.tca.valve_pins) if valves is None else valves
+    model = ctx.valve.settle_model
+
+    close_all_valves(ctx)
+    ctx.meter_optics.light_on()
+    try:
+        sleep_ms(timing.optics_warmup_ms, cancel)
+        for name in names:
+            for direction in ValveSettleModel.DIRECTIONS:
+                before, after = ([], [name]) if direction == "open" else ([name], [])
+                measured = []
+                for _ in range(repeats):
+                    ctx.valve.apply_valves(before, _valve_wait(cancel))
+                    sleep_ms(max_ms, cancel)
+                    baseline_mv = ctx.meter_optics.read_upper_mv()
+                    ctx.valve.apply_valves(after, _valve_wait(cancel))
+                    settle_ms = wait_meter_quiet(ctx, max_ms, quiet_mv, baseline_mv=baseline_mv, cancel=cancel)
+                    if settle_ms is not None:
+                        measured.append(settle_ms)
+                if not measured:
+                    model.reset(name, direction)
+                    logger.warning(
+                        "阀门 %s %s 动作 %s 次都没有引起超过 %.1f mV 的读数扰动，保持默认稳定时间 %s ms",
+                        name,
+                        direction,
+                        repeats,
+                        quiet_mv,
+                        timing.valve_settle_ms,
+                    )
+                    continue
+                model.set(name, direction, max(min_ms, max(measured) * timing.valve_settle_margin))
+    finally:
+        close_all_valves(ctx)
+        ctx.meter_optics.light_off()
+    return model
@@ -10,6 +10,8 @@ import threading
 import time
 from dataclasses import replace
 
+import smbus2
+
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(CURRENT_DIR)
@@ -17,13 +19,20 @@ if PROJECT_ROOT not in sys.path:
     sys.path.append(PROJECT_ROOT)
 
 from config import DEFAULT_CONFIG, configure_logging
-from hardware import HardwareContext, VALVE_PIN_ORDER, init_hardware, cleanup_hardware
-from lib.ADS1115 import ADS1115_REG_CONFIG_PGA_6_144V
-from main import compute_absorbance, compute_concentration
+from hardware import HardwareContext, VALVE_PIN_ORDER, init_hardware, cleanup_hardware, valve_settle_profile_path
+from lib.ADS1115 import block_trimmed_mean_mv
+from lib.TCA9555 import TCA9555_REG_INPUT_PORT0, TCA9555_REG_POLARITY_PORT0
+from lib.i2c_bus import I2C_PRIORITY_TELEMETRY, bus_priority
+from lib.i2c_raw import RawI2cBus
+from lib.device_lock import reset_lock_stats
+from main import compute_absorbance, compute_concentration, log_lock_contention
 from primitives import (
+    CancelToken,
     RecipeError,
+    RunCancelled,
     add_to_digestor,
     aspirate,
+    calibrate_valve_settle,
     close_all_valves,
     dispense,
     empty_digestor,
@@ -87,18 +96,27 @@ TEST_ITEMS = [
     ("12", "meter_light_on", "计量-开灯"),
     ("13", "meter_aspirate_small", "计量-少量吸水"),
     ("14", "meter_aspirate_large", "计量-大量吸水"),
+    ("15", "ads_sweep", "ADS1115 流水线扫描"),
+    ("16", "tca_latency", "TCA9555 写入延迟"),
+    ("17", "valve_settle", "阀门稳定时间标定"),
+    ("18", "i2c_batch", "I2C 批量事务对比"),
+    ("19", "i2c_transport", "I2C 传输层对比"),
+    ("20", "lock_contention", "设备锁争用统计"),
     ("21", "digest_add", "消解-吸水"),
     ("22", "digest_pull", "消解-回抽"),
     ("23", "heat_short", "消解-加热30s"),
     ("24", "heat_to_target", "消解-加热50C"),
     ("25", "digest_read", "消解-读数"),
+    ("26", "cancel_latency", "取消到安全状态耗时"),
+    ("27", "ads_scan_threads", "ADS1115 双线程扫描归属"),
+    ("28", "ads_group", "ADS1115 多芯片并行读取"),
     ("31", "digest_valves", "消解-三阀共"),
     ("0", "quit", "退出"),
 ]
 TEST_MENU = {menu_no: (test_name, title) for menu_no, test_name, title in TEST_ITEMS}
 
 # 批量执行时跳过的交互项
-INTERACTIVE_TESTS = {"valve_high", "valve_low", "meter_aspirate_manual", "force_dispense"}
+INTERACTIVE_TESTS = {"valve_high", "valve_low", "meter_aspirate_manual", "force_dispense", "tca_latency", "valve_settle", "i2c_batch", "i2c_transport", "cancel_latency"}
 
 
 class AbortCurrentTest(Exception):
@@ -145,9 +163,7 @@ def read_meter_voltages(
 
     readings: list[tuple[float, float]] = []
     for index in range(samples):
-        upper_mv = ctx.meter_optics.read_upper_mv()
-        lower_mv = ctx.meter_optics.read_lower_mv()
-        readings.append((upper_mv, lower_mv))
+        readings.append(ctx.meter_optics.read_pair_mv())
         if index < samples - 1:
             time.sleep(sample_gap_s)
     return readings
@@ -156,10 +172,8 @@ def read_meter_voltages(
 def _trimmed_mean(values: list[float]) -> float:
     """去最大最小后求平均。"""
 
-    if len(values) <= 2:
-        return sum(values) / len(values)
-    sorted_vals = sorted(values)
-    return sum(sorted_vals[1:-1]) / (len(sorted_vals) - 2)
+    # 输入已经是毫伏，换算系数取 1。
+    return block_trimmed_mean_mv(values, 1.0)
 
 
 def capture_meter_voltages(title: str, ctx: HardwareContext) -> list[tuple[float, float]]:
@@ -188,11 +202,100 @@ def capture_meter_voltages(title: str, ctx: HardwareContext) -> list[tuple[float
 def test_ads1115(ctx: HardwareContext) -> None:
     """读取 4 路 ADC 电压，确认 ADS1115 工作正常。"""
 
-    ctx.ads1115.set_gain(ADS1115_REG_CONFIG_PGA_6_144V)
+    # 各通道的增益和数据率由 init_hardware 按 AdsConfig 绑定的采集配置决定，这里不再手动改增益。
     logger.info("=== ADS1115 测试 ===")
     for channel in range(4):
         voltage_mv = ctx.ads1115.read_voltage(channel)
-        logger.info("AIN%s = %s mV", channel, voltage_mv)
+        logger.info("AIN%s = %s mV (%s)", channel, voltage_mv, ctx.ads1115.get_channel_profile(channel))
+
+
+def test_ads_sweep(ctx: HardwareContext) -> None:
+    """对比逐帧扫描和流水线扫描的 4 路读数与耗时，确认流水线结果归属正确。"""
+
+    channels = [0, 1, 2, 3]
+    frames = 20
+    logger.info("=== ADS1115 流水线扫描 ===")
+
+    start = time.monotonic()
+    scan_frames = [ctx.ads1115.read_frame(channels) for _ in range(frames)]
+    scan_s = time.monotonic() - start
+
+    start = time.monotonic()
+    sweep_frames = list(ctx.ads1115.sweep(channels, frames=frames))
+    sweep_s = time.monotonic() - start
+
+    for channel in channels:
+        scan_mv = _trimmed_mean([float(frame.voltage_mv(channel)) for frame in scan_frames])
+        sweep_mv = _trimmed_mean([float(frame.voltage_mv(channel)) for frame in sweep_frames])
+        logger.info("AIN%s 逐帧 = %.1f mV, 流水线 = %.1f mV, 差 = %.1f mV", channel, scan_mv, sweep_mv, sweep_mv - scan_mv)
+    logger.info("逐帧扫描 %s 帧耗时 %.1f ms", frames, scan_s * 1000)
+    logger.info("流水线扫描 %s 帧耗时 %.1f ms", frames, sweep_s * 1000)
+
+
+def test_ads_scan_threads(ctx: HardwareContext) -> None:
+    """另一个线程不断读 AIN2/AIN3 时扫描 AIN0/AIN1，与单线程扫描对比，确认帧内读数没有串到别的通道。"""
+
+    channels = [0, 1]
+    frames = 50
+    logger.info("=== ADS1115 双线程扫描归属 ===")
+
+    quiet_frames = list(ctx.ads1115.scan(channels, frames=frames))
+
+    stop_event = threading.Event()
+
+    def other_channels() -> None:
+        while not stop_event.is_set():
+            ctx.ads1115.read_raw(2)
+            ctx.ads1115.read_raw(3)
+
+    worker = threading.Thread(target=other_channels)
+    worker.start()
+    try:
+        busy_frames = list(ctx.ads1115.scan(channels, frames=frames))
+    finally:
+        stop_event.set()
+        worker.join()
+
+    for channel in channels:
+        quiet_mv = _trimmed_mean([float(frame.voltage_mv(channel)) for frame in quiet_frames])
+        busy = [float(frame.voltage_mv(channel)) for frame in busy_frames]
+        worst_mv = max(abs(value - quiet_mv) for value in busy)
+        logger.info("AIN%s 单线程 = %.1f mV, 双线程最大偏差 = %.1f mV", channel, quiet_mv, worst_mv)
+
+
+def test_ads_group(ctx: HardwareContext) -> None:
+    """通过芯片组一次读取计量和消解四路通道，与逐路读取对比读数和耗时。
+
+    meter 和 digest 配在不同地址时组内两片芯片同时转换，只等一次转换时间；共用一片芯片时两者耗时接近。
+    """
+
+    channels = [
+        ("meter", DEFAULT_CONFIG.ads.meter_upper_channel),
+        ("meter", DEFAULT_CONFIG.ads.meter_lower_channel),
+        ("digest", DEFAULT_CONFIG.ads.digest_measure_channel),
+        ("digest", DEFAULT_CONFIG.ads.digest_reference_channel),
+    ]
+    rounds = 20
+    logger.info("=== ADS1115 多芯片并行读取 ===")
+    logger.info("芯片地址: %s", {name: "0x%02X" % addr for name, addr in DEFAULT_CONFIG.ads.chips.items()})
+    if ctx.ads1115.is_streaming:
+        logger.info("计量芯片正在连续采样，跳过")
+        return
+
+    start = time.monotonic()
+    single = [{(name, channel): ctx.adc_group.chip(name).read_voltage(channel) for name, channel in channels} for _ in range(rounds)]
+    single_s = time.monotonic() - start
+
+    start = time.monotonic()
+    grouped = [ctx.adc_group.read_voltages(channels) for _ in range(rounds)]
+    grouped_s = time.monotonic() - start
+
+    for name, channel in channels:
+        single_mv = _trimmed_mean([float(reading[(name, channel)]) for reading in single])
+        grouped_mv = _trimmed_mean([float(reading[(name, channel)]) for reading in grouped])
+        logger.info("%s AIN%s 逐路 = %.1f mV, 并行 = %.1f mV", name, channel, single_mv, grouped_mv)
+    logger.info("逐路读取 %s 轮耗时 %.1f ms", rounds, single_s * 1000)
+    logger.info("芯片组读取 %s 轮耗时 %.1f ms", rounds, grouped_s * 1000)
 
 
 def test_softspi(ctx: HardwareContext) -> None:
@@ -256,6 +359,211 @@ def test_tca9555_pins(ctx: HardwareContext) -> None:
         logger.info("已拉低 %s: %s", label, name)
 
 
+def test_tca_latency(ctx: HardwareContext) -> None:
+    """反复同时开关全部液路阀，统计单次多阀写入的耗时，用于对比 TcaConfig.backend 的两种后端。"""
+
+    cycles = 50
+    io = ctx.valve_io
+    mask = 0
+    for _, pin_number in VALVE_PIN_ORDER:
+        mask |= 1 << pin_number
+
+    logger.info("=== TCA9555 写入延迟（backend=%s）===", TEST_CONFIG.tca.backend)
+    wait_enter(f"将快速开关全部液路阀 {cycles} 次，请确认泵已停止。")
+    bus = ctx.i2c_buses.get(TEST_CONFIG.tca.bus)
+    paced_before = bus.stats.paced_s if bus is not None else 0.0
+    io.reset_counters()
+    latencies_ms: list[float] = []
+    try:
+        for _ in range(cycles):
+            for word in (mask, 0):
+                start = time.perf_counter()
+                io.write_word(word)
+                latencies_ms.append((time.perf_counter() - start) * 1000.0)
+    finally:
+        close_all_flow_valves(ctx)
+
+    latencies_ms.sort()
+    count = len(latencies_ms)
+    logger.info(
+        "%s 次多阀写入：平均 %.3f ms, 中位 %.3f ms, P99 %.3f ms, 最大 %.3f ms",
+        count,
+        sum(latencies_ms) / count,
+        latencies_ms[count // 2],
+        latencies_ms[min(count - 1, int(count * 0.99))],
+        latencies_ms[-1],
+    )
+    logger.info("每次写入事务数 = %.2f", io.write_transactions / count)
+    if TEST_CONFIG.tca.backend == "smbus" and bus is not None:
+        # smbus 后端的耗时包含 PacedBus 令牌桶等待，单独列出便于扣除。
+        logger.info("其中节流等待合计 %.1f ms", (bus.stats.paced_s - paced_before) * 1000.0)
+
+
+def test_valve_settle(ctx: HardwareContext) -> None:
+    """先小体积吸液，再逐阀标定打开/关闭后的稳定时间，确认后写入标定文件。"""
+
+    recipe = TEST_CONFIG.recipe
+    path = valve_settle_profile_path(TEST_CONFIG)
+    logger.info("=== 阀门稳定时间标定 ===")
+    wait_enter(f"将从 {recipe.flush_source} 小体积吸液后逐个开关全部液路阀。")
+    aspirate(ctx, recipe.flush_source, "small")
+    try:
+        model = calibrate_valve_settle(ctx)
+    finally:
+        dispense(ctx, [recipe.waste_valve])
+
+    for name, _ in VALVE_PIN_ORDER:
+        logger.info(
+            "%s (%s): 打开 %.1f ms, 关闭 %.1f ms",
+            VALVE_LABELS.get(name, name),
+            name,
+            model.settle_ms(name, "open"),
+            model.settle_ms(name, "close"),
+        )
+    if path is None:
+        logger.warning("未配置 valve_settle_profile，标定结果只在本次运行有效")
+        return
+    wait_enter(f"准备写入标定文件 {path}。")
+    model.save(path)
+    logger.info("已写入 %s", path)
+
+
+def test_i2c_batch(ctx: HardwareContext) -> None:
+    """分别以批量事务和逐个写入各做一次小体积吸液，对比每次 aspirate() 的 I2C 系统调用次数和耗时。"""
+
+    recipe = TEST_CONFIG.recipe
+    bus = ctx.i2c_buses.get(TEST_CONFIG.ads.bus)
+    logger.info("=== I2C 批量事务对比 ===")
+    if ctx.i2c_batch_bus is None or bus is None:
+        logger.warning("当前配置不能批量（需 smbus 后端、TCA 与 ADS 同一总线且 batch_transfers=True）")
+        return
+    wait_enter(f"将从 {recipe.flush_source} 小体积吸液两次，每次后排到废液。")
+
+    results = []
+    for label, run_ctx in (("批量", ctx), ("逐个", replace(ctx, i2c_batch_bus=None))):
+        before = bus.stats.transactions
+        start = time.perf_counter()
+        try:
+            aspirate(run_ctx, recipe.flush_source, "small")
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            calls = bus.stats.transactions - before
+            dispense(ctx, [recipe.waste_valve])
+        results.append((label, calls, elapsed_ms))
+
+    for label, calls, elapsed_ms in results:
+        # 每次 I2C 事务（含一次 I2C_RDWR）对应一次 ioctl；吸液轮询部分两种方式相同，差值来自切换阶段。
+        logger.info("%s: aspirate() I2C 系统调用 %s 次，耗时 %.1f ms", label, calls, elapsed_ms)
+    logger.info("批量比逐个少 %s 次系统调用", results[1][1] - results[0][1])
+
+
+def test_i2c_transport(ctx: HardwareContext) -> None:
+    """在指定总线上对控制 IO 反复读输入端口、原值回写极性寄存器，对比 smbus2 与 RawI2cBus 的事务速率和 CPU 时间。
+
+    极性按原值回写，不改变任何引脚。可用 `modprobe i2c-stub chip_addr=0x21` 建立环回总线代替实际总线。
+    """
+
+    cycles = 2000
+    addr = TEST_CONFIG.tca.control_addr
+    logger.info("=== I2C 传输层对比 ===")
+    text = prompt_optional(f"请输入 I2C 总线号（回车使用 {TEST_CONFIG.tca.bus}），输入 q 退出: ")
+    bus_num = int(text) if text else TEST_CONFIG.tca.bus
+
+    results = []
+    for name, opener in (("smbus2", smbus2.SMBus), ("raw", RawI2cBus)):
+        bus = opener(bus_num)
+        try:
+            polarity = bus.read_i2c_block_data(addr, TCA9555_REG_POLARITY_PORT0, 2)
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            for _ in range(cycles):
+                bus.read_i2c_block_data(addr, TCA9555_REG_INPUT_PORT0, 2)
+                bus.write_i2c_block_data(addr, TCA9555_REG_POLARITY_PORT0, polarity)
+            wall_s = time.perf_counter() - wall_start
+            cpu_s = time.process_time() - cpu_start
+        finally:
+            bus.close()
+        results.append((name, wall_s, cpu_s))
+
+    transactions = 2 * cycles
+    for name, wall_s, cpu_s in results:
+        logger.info(
+            "%s: %.0f 事务/秒，每事务 CPU %.1f us，墙钟 %.1f us",
+            name,
+            transactions / wall_s,
+            cpu_s / transactions * 1_000_000.0,
+            wall_s / transactions * 1_000_000.0,
+        )
+
+
+def test_lock_contention(ctx: HardwareContext) -> None:
+    """两个线程同时读计量单元上下液位，结束后列出各设备锁的等待统计。"""
+
+    duration_s = 3.0
+    logger.info("=== 设备锁争用统计 ===")
+    reset_lock_stats()
+    stop_event = threading.Event()
+    counts = [0, 0]
+
+    def reader(index: int, read) -> None:
+        while not stop_event.is_set():
+            read()
+            counts[index] += 1
+
+    threads = [
+        threading.Thread(target=reader, args=(0, ctx.meter_optics.read_upper_mv)),
+        threading.Thread(target=reader, args=(1, ctx.meter_optics.read_lower_mv)),
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        time.sleep(duration_s)
+    finally:
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+
+    logger.info("%.0f 秒内: 上液位读取 %s 次，下液位读取 %s 次", duration_s, counts[0], counts[1])
+    log_lock_contention()
+
+
+def test_cancel_latency(ctx: HardwareContext) -> None:
+    """吸液过程中按回车取消，测量从取消到停泵、关阀的耗时。"""
+
+    recipe = TEST_CONFIG.recipe
+    logger.info("=== 取消到安全状态耗时 ===")
+    logger.info("液源: %s (%s)", VALVE_LABELS.get(recipe.sample_source, recipe.sample_source), recipe.sample_source)
+
+    wait_enter("步骤 1：关闭所有液路阀。")
+    close_all_flow_valves(ctx)
+
+    prompt_optional("步骤 2：直接按回车开始吸液，输入 q 退出: ")
+    cancel = CancelToken()
+    outcome: list[str] = []
+
+    def run() -> None:
+        try:
+            aspirate(ctx, recipe.sample_source, "large", cancel)
+            outcome.append("吸液在取消前完成")
+        except RunCancelled:
+            outcome.append("已取消")
+        except RecipeError as exc:
+            outcome.append(f"吸液失败: {exc}")
+
+    worker = threading.Thread(target=run)
+    worker.start()
+    try:
+        input("按回车取消\n")
+    finally:
+        cancel.cancel("test")
+        worker.join()
+    safe_ms = cancel.elapsed_ms()
+    ctx.meter_optics.light_off()
+
+    result = outcome[0] if outcome else "吸液异常退出"
+    logger.info("%s，从取消到停泵、关阀 %.1f ms（目标 %s ms）", result, safe_ms, TEST_CONFIG.timing.cancel_safe_budget_ms)
+
+
 def test_control_pins(ctx: HardwareContext) -> None:
     """逐个切换控制类引脚，覆盖 optics_controls 里的全部控制引脚。"""
 
@@ -360,12 +668,10 @@ def test_set_all_low_except_pul(ctx: HardwareContext) -> None:
 # ==================== 手动泵测试 (8-9) ====================
 
 def _measure_baseline(ctx: HardwareContext) -> tuple[float, float]:
-    """开灯后延迟测量基准电压，去除最大最小取平均。"""
+    """开灯后延迟测量基准电压，块采样后做稳健平均。"""
 
     time.sleep(0.5)
-    upper_vals = [ctx.meter_optics.read_upper_mv() for _ in range(5)]
-    lower_vals = [ctx.meter_optics.read_lower_mv() for _ in range(5)]
-    return _trimmed_mean(upper_vals), _trimmed_mean(lower_vals)
+    return ctx.meter_optics.read_upper_average_mv(), ctx.meter_optics.read_lower_average_mv()
 
 
 def test_meter_aspirate_manual(ctx: HardwareContext) -> None:
@@ -393,15 +699,17 @@ def test_meter_aspirate_manual(ctx: HardwareContext) -> None:
     start_time = time.monotonic()
 
     def print_loop():
-        while not stop_event.is_set():
-            upper_mv = ctx.meter_optics.read_upper_mv()
-            lower_mv = ctx.meter_optics.read_lower_mv()
-            upper_pct = (upper_mv - baseline_upper) / baseline_upper * 100 if baseline_upper != 0 else 0
-            lower_pct = (lower_mv - baseline_lower) / baseline_lower * 100 if baseline_lower != 0 else 0
-            elapsed = int(time.monotonic() - start_time)
-            m, s = divmod(elapsed, 60)
-            meter_logger.info(f"{m:02d}:{s:02d}  上：{upper_mv:>7.1f}mv{upper_pct:>4.0f}%    下：{lower_mv:>7.1f}mv{lower_pct:>4.0f}%")
-            time.sleep(0.3)
+        # 打印线程的读数按监控优先级排队，不挡住阀门写入和液位判定。
+        with bus_priority(I2C_PRIORITY_TELEMETRY):
+            while not stop_event.is_set():
+                upper_mv = ctx.meter_optics.read_upper_mv()
+                lower_mv = ctx.meter_optics.read_lower_mv()
+                upper_pct = (upper_mv - baseline_upper) / baseline_upper * 100 if baseline_upper != 0 else 0
+                lower_pct = (lower_mv - baseline_lower) / baseline_lower * 100 if baseline_lower != 0 else 0
+                elapsed = int(time.monotonic() - start_time)
+                m, s = divmod(elapsed, 60)
+                meter_logger.info(f"{m:02d}:{s:02d}  上：{upper_mv:>7.1f}mv{upper_pct:>4.0f}%    下：{lower_mv:>7.1f}mv{lower_pct:>4.0f}%")
+                time.sleep(0.3)
 
     print_thread = threading.Thread(target=print_loop)
     print_thread.start()
@@ -445,15 +753,17 @@ def test_force_dispense(ctx: HardwareContext) -> None:
     start_time = time.monotonic()
 
     def print_loop():
-        while not stop_event.is_set():
-            upper_mv = ctx.meter_optics.read_upper_mv()
-            lower_mv = ctx.meter_optics.read_lower_mv()
-            upper_pct = (upper_mv - baseline_upper) / baseline_upper * 100 if baseline_upper != 0 else 0
-            lower_pct = (lower_mv - baseline_lower) / baseline_lower * 100 if baseline_lower != 0 else 0
-            elapsed = int(time.monotonic() - start_time)
-            m, s = divmod(elapsed, 60)
-            meter_logger.info(f"{m:02d}:{s:02d}  上：{upper_mv:>7.1f}mv{upper_pct:>4.0f}%    下：{lower_mv:>7.1f}mv{lower_pct:>4.0f}%")
-            time.sleep(0.3)
+        # 打印线程的读数按监控优先级排队，不挡住阀门写入和液位判定。
+        with bus_priority(I2C_PRIORITY_TELEMETRY):
+            while not stop_event.is_set():
+                upper_mv = ctx.meter_optics.read_upper_mv()
+                lower_mv = ctx.meter_optics.read_lower_mv()
+                upper_pct = (upper_mv - baseline_upper) / baseline_upper * 100 if baseline_upper != 0 else 0
+                lower_pct = (lower_mv - baseline_lower) / baseline_lower * 100 if baseline_lower != 0 else 0
+                elapsed = int(time.monotonic() - start_time)
+                m, s = divmod(elapsed, 60)
+                meter_logger.info(f"{m:02d}:{s:02d}  上：{upper_mv:>7.1f}mv{upper_pct:>4.0f}%    下：{lower_mv:>7.1f}mv{lower_pct:>4.0f}%")
+                time.sleep(0.3)
 
     print_thread = threading.Thread(target=print_loop)
     print_thread.start()
@@ -725,13 +1035,14 @@ def _temperature_printer(
 ) -> None:
     """后台定时打印温度，方便观察升温过程。"""
 
-    while not stop_event.is_set():
-        try:
-            temp_c = ctx.temp_sensor.read_temperature_c()
-            logger.info("当前温度 = %.2f C", temp_c)
-        except Exception as exc:
-            logger.warning("温度读取失败: %s", exc)
-        stop_event.wait(interval_s)
+    with bus_priority(I2C_PRIORITY_TELEMETRY):
+        while not stop_event.is_set():
+            try:
+                temp_c = ctx.temp_sensor.read_temperature_c()
+                logger.info("当前温度 = %.2f C", temp_c)
+            except Exception as exc:
+                logger.warning("温度读取失败: %s", exc)
+            stop_event.wait(interval_s)
 
 
 def test_heat_short(ctx: HardwareContext) -> None:
@@ -864,6 +1175,15 @@ def run_test_by_name(ctx: HardwareContext, test_name: str) -> None:
         "meter_light_on": test_meter_light_on,
         "meter_aspirate_small": test_meter_aspirate_small,
         "meter_aspirate_large": test_meter_aspirate_large,
+        "ads_sweep": test_ads_sweep,
+        "ads_scan_threads": test_ads_scan_threads,
+        "ads_group": test_ads_group,
+        "tca_latency": test_tca_latency,
+        "valve_settle": test_valve_settle,
+        "i2c_batch": test_i2c_batch,
+        "i2c_transport": test_i2c_transport,
+        "lock_contention": test_lock_contention,
+        "cancel_latency": test_cancel_latency,
         "digest_add": test_digest_add,
         "digest_pull": test_digest_pull,
         "heat_short": test_heat_short,